@@ -0,0 +1,128 @@
+"""Load test: blocking vs async database access inside ``async def`` handlers.
+
+Starts uvicorn (one worker) serving :mod:`benchmarks.blocking_app` – the real
+application plus replicas of two game routes that run a synchronous
+``Session`` query on the event loop, the way the routes used to – and fires
+*concurrency* overlapping requests at the blocking and the async version of
+each route.  A ``/ping`` probe runs alongside to show how long unrelated
+requests wait while the handlers are busy.
+
+Keep *concurrency* below the synchronous pool size (pool_size + max_overflow,
+15 by default): beyond it a blocking handler waits for a pooled connection
+*on the event loop*, so no other request can finish and release one – the
+server stalls until the pool timeout fires.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_async_load --scale 5 --concurrency 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .common import prepare
+
+PORT = 8765
+
+
+async def _load(client, paths: list[str], concurrency: int, requests: int) -> tuple[float, float]:
+    """Return (requests/sec, p95 /ping latency ms) for *paths*."""
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(paths[i % len(paths)])
+    ping_ms: list[float] = []
+    done = asyncio.Event()
+
+    async def _worker() -> None:
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            resp = await client.get(path)
+            resp.raise_for_status()
+
+    async def _probe() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/ping")
+            ping_ms.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.01)
+
+    probe = asyncio.create_task(_probe())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    finally:
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+    p95 = statistics.quantiles(ping_ms, n=20)[-1] if len(ping_ms) > 1 else 0.0
+    return requests / elapsed, p95
+
+
+async def _main(args: argparse.Namespace, game_ids: list[int]) -> None:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=120
+    ) as client:
+        for _ in range(100):
+            try:
+                await client.get("/ping")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+
+        print(f"\n{args.requests} requests per row, concurrency {args.concurrency}\n")
+        print(f"{'route':<14} {'handler':<9} {'req/sec':>9} {'ping p95 ms':>12}")
+        for route in ("events", "shot-density"):
+            for handler, prefix in (("blocking", "/blocking/games"), ("async", "/games")):
+                paths = [f"{prefix}/{gid}/{route}" for gid in game_ids]
+                rps, ping = await _load(client, paths, args.concurrency, args.requests)
+                print(f"{route:<14} {handler:<9} {rps:>9.1f} {ping:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    prepare(args.scale)
+    os.environ["SEED_MODE"] = "skip"
+
+    from sqlalchemy import select
+
+    from src.db.database import SessionLocal
+    from src.db.seed import reset_and_seed_db
+    from src.models import Game
+
+    reset_and_seed_db()
+    with SessionLocal() as db:
+        game_ids = list(db.execute(select(Game.id)).scalars())
+
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.blocking_app:app",
+            "--port", str(PORT), "--log-level", "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    try:
+        asyncio.run(_main(args, game_ids))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Edits/sec: one request per event vs ``POST /events/bulk``.
+
+Creates, patches and deletes *count* events first through the single-event
+endpoints (one transaction and commit per event) and then through one bulk
+request per op.  Requests go in-process through ``httpx.ASGITransport``, so
+the numbers measure server and database cost only.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_bulk_edits --count 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from .common import prepare
+
+EVENT = {
+    "game_date": "2018-02-11",
+    "home_team": "Olympic (Women) - Canada",
+    "away_team": "Olympic (Women) - Olympic Athletes from Russia",
+    "period": 2,
+    "clock": "12:34",
+    "home_team_skaters": 5,
+    "away_team_skaters": 5,
+    "home_team_goals": 0,
+    "away_team_goals": 0,
+    "team": "Olympic (Women) - Canada",
+    "player": "Bench Player",
+    "event": "Shot",
+    "x_coordinate": 150,
+    "y_coordinate": 40,
+}
+
+
+async def _single(client, count: int) -> dict[str, float]:
+    rates, ids = {}, []
+    started = time.perf_counter()
+    for i in range(count):
+        ids.append((await client.post("/events", json=EVENT | {"x_coordinate": i % 200})).json()["id"])
+    rates["create"] = count / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for event_id in ids:
+        (await client.put(f"/events/{event_id}", json=EVENT | {"event": "Goal"})).raise_for_status()
+    rates["update"] = count / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for event_id in ids:
+        (await client.delete(f"/events/{event_id}")).raise_for_status()
+    rates["delete"] = count / (time.perf_counter() - started)
+    return rates
+
+
+async def _bulk(client, count: int) -> dict[str, float]:
+    rates = {}
+    creates = [EVENT | {"x_coordinate": i % 200} for i in range(count)]
+    started = time.perf_counter()
+    resp = await client.post("/events/bulk", json={"create": creates})
+    rates["create"] = count / (time.perf_counter() - started)
+    ids = [item["id"] for item in resp.json()["items"]]
+
+    started = time.perf_counter()
+    patches = [{"id": event_id, "event": "Goal"} for event_id in ids]
+    (await client.post("/events/bulk", json={"update": patches})).raise_for_status()
+    rates["update"] = count / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    (await client.post("/events/bulk", json={"delete": ids})).raise_for_status()
+    rates["delete"] = count / (time.perf_counter() - started)
+    return rates
+
+
+async def _main(count: int) -> None:
+    import httpx
+
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'path':<10} {'create/s':>10} {'update/s':>10} {'delete/s':>10}")
+        for label, run in (("single", _single), ("bulk", _bulk)):
+            rates = await run(client, count)
+            print(
+                f"{label:<10} {rates['create']:>10,.0f}"
+                f" {rates['update']:>10,.0f} {rates['delete']:>10,.0f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    prepare(args.scale)
+    from src.db.seed import reset_and_seed_db
+
+    reset_and_seed_db()
+    asyncio.run(_main(args.count))
+
+
+if __name__ == "__main__":
+    main()
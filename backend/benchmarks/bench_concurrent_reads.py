@@ -0,0 +1,134 @@
+"""Read throughput under many parallel requests, per engine profile.
+
+Seeds a synthetic dataset once (with untuned settings), then for every
+profile runs *workers* threads that each check out a pooled connection and
+fetch the events of a random game for *seconds* seconds, next to one thread
+issuing small write transactions (disable with ``--no-writer``).  SQLite profiles
+run on separate copies of the database file because ``journal_mode=WAL``
+persists in the file.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_concurrent_reads --scale 20 --workers 32
+    python -m benchmarks.bench_concurrent_reads --database-url postgresql://…
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from .common import prepare
+
+
+def _run(
+    engine, game_ids: list[int], workers: int, seconds: float, with_writer: bool
+) -> tuple[int, int]:
+    from sqlalchemy import select, update
+
+    from src.models import Event
+
+    table = Event.__table__
+    deadline = time.perf_counter() + seconds
+    counts = [0] * workers
+    rows = [0] * workers
+
+    def _writer() -> None:
+        # Small write transactions, as produced by the tagging CRUD endpoints
+        rnd = random.Random(-1)
+        while time.perf_counter() < deadline:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(table)
+                    .where(table.c.id == rnd.randint(1, 1000))
+                    .values(clock=table.c.clock)
+                )
+            time.sleep(0.001)
+
+    def _worker(i: int) -> None:
+        rnd = random.Random(i)
+        while time.perf_counter() < deadline:
+            with engine.connect() as conn:
+                result = conn.execute(
+                    select(table).where(table.c.game_id == rnd.choice(game_ids))
+                ).all()
+            counts[i] += 1
+            rows[i] += len(result)
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(workers)]
+    if with_writer:
+        threads.append(threading.Thread(target=_writer))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts), sum(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument(
+        "--no-writer",
+        action="store_true",
+        help="do not run a concurrent writer thread next to the readers",
+    )
+    args = parser.parse_args()
+
+    prepare(args.scale, args.database_url)
+    os.environ["DB_PROFILE"] = "default"
+
+    from sqlalchemy import create_engine, select
+
+    from src.db.database import create_db_engine
+    from src.db.seed import reset_and_seed_db
+    from src.models import Game
+    from src.settings.config import settings
+
+    reset_and_seed_db()
+
+    url = str(settings.database_url)
+    is_sqlite = url.startswith("sqlite")
+    profiles = ["default", "sqlite" if is_sqlite else "postgres"]
+    # Enough pooled connections for every worker in both profiles
+    settings.db_pool_size = args.workers
+
+    print(f"\n{args.workers} workers, {args.seconds:.0f}s per profile\n")
+    print(f"{'profile':<10} {'requests':>9} {'req/sec':>9} {'rows/sec':>11}")
+    for profile in profiles:
+        profile_url = url
+        if is_sqlite:
+            source = Path(url.removeprefix("sqlite:///"))
+            copy = source.with_name(f"{source.stem}-{profile}.db")
+            shutil.copy(source, copy)
+            profile_url = f"sqlite:///{copy}"
+
+        if profile == "default":
+            # Same pool size as the tuned profile, so only the tuning differs
+            kwargs = {"connect_args": {"check_same_thread": False}} if is_sqlite else {}
+            engine = create_engine(profile_url, pool_size=args.workers, **kwargs)
+        else:
+            engine = create_db_engine(profile_url, profile)
+        with engine.connect() as conn:
+            game_ids = list(conn.execute(select(Game.id)).scalars())
+
+        requests, rows = _run(
+            engine, game_ids, args.workers, args.seconds, not args.no_writer
+        )
+        engine.dispose()
+        print(
+            f"{profile:<10} {requests:>9} {requests / args.seconds:>9.0f}"
+            f" {rows / args.seconds:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Cold-start cost of loading the dataset: CSV parsing vs the columnar cache.
+
+For every scale a synthetic dataset is written.  Each load strategy then runs
+in a fresh interpreter, so its peak and final RSS (Linux ``/proc``; both
+include the ~120 MiB of imports every mode shares) are not polluted by
+earlier runs:
+
+* ``csv-raw``  – plain ``pd.read_csv`` (how every process loaded it before)
+* ``csv``      – :func:`~src.services.dataset_store.parse_csv` (compact dtypes)
+* ``cache``    – :class:`~src.services.dataset_store.DatasetStore` served from
+  the warm Feather cache
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_dataset_cache --scales 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .common import prepare
+
+MODES = ("csv-raw", "csv", "cache")
+
+
+def _child(mode: str, csv_path: Path) -> None:
+    import pandas as pd
+
+    from src.services.dataset_store import DatasetStore, parse_csv
+
+    started = time.perf_counter()
+    if mode == "csv-raw":
+        frame = pd.read_csv(csv_path)
+    elif mode == "csv":
+        frame = parse_csv(csv_path)
+    else:
+        frame = DatasetStore.from_csv(csv_path).frame
+    seconds = time.perf_counter() - started
+    # VmHWM / VmRSS rather than ru_maxrss, which survives exec() and would
+    # report the parent's peak
+    status = dict(
+        line.split(":", 1) for line in Path("/proc/self/status").read_text().splitlines()
+    )
+    print(
+        json.dumps(
+            {
+                "seconds": seconds,
+                "peak_mib": int(status["VmHWM"].split()[0]) / 1024,
+                "rss_mib": int(status["VmRSS"].split()[0]) / 1024,
+                "frame_mib": frame.memory_usage(deep=True).sum() / 2**20,
+            }
+        )
+    )
+
+
+def _measure(mode: str, csv_path: Path) -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_dataset_cache", "--child", mode, str(csv_path)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=os.environ,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "CSV"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child[0], Path(args.child[1]))
+        return
+
+    for scale in args.scales:
+        csv_path = prepare(scale)
+        os.environ["DATASET_CACHE_DIR"] = str(csv_path.parent / "cache")
+        cold = _measure("cache", csv_path)  # parses and writes the cache
+        cache_file = next((csv_path.parent / "cache").glob("*.feather"))
+        print(
+            f"CSV {csv_path.stat().st_size / 2**20:.0f} MiB, "
+            f"cache {cache_file.stat().st_size / 2**20:.0f} MiB, "
+            f"first (cache-writing) load {cold['seconds']:.2f}s\n"
+        )
+        print(
+            f"{'mode':<8} {'load s':>8} {'peak RSS MiB':>13}"
+            f" {'RSS MiB':>8} {'frame MiB':>10}"
+        )
+        for mode in MODES:
+            r = _measure(mode, csv_path)
+            print(
+                f"{mode:<8} {r['seconds']:>8.2f} {r['peak_mib']:>13.0f}"
+                f" {r['rss_mib']:>8.0f} {r['frame_mib']:>10.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Per-game event queries: game-key strings (before) vs ``game_id`` (after).
+
+"Before" identifies the game by its ``game_date``/``home_team``/``away_team``
+strings and the event type by name, the way the game routes used to filter.
+"After" filters on the indexed ``game_id`` foreign key and the
+``(game_id, event_type_id)`` composite index.  The database file size is
+printed as well to show the effect of dictionary-encoding the name columns.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_game_queries --scale 50
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .common import prepare, timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=20)
+    args = parser.parse_args()
+    prepare(args.scale)
+
+    from sqlalchemy import select, text
+
+    from src.db import crud
+    from src.db.database import SessionLocal
+    from src.db.seed import reset_and_seed_db
+    from src.models import Event, EventType, Game
+
+    reset_and_seed_db()
+
+    with SessionLocal() as db:
+        game = db.execute(select(Game).order_by(Game.id.desc())).scalars().first()
+        total = db.query(Event).count()
+
+        by_key = (
+            Game.game_date == game.game_date,
+            Game.home_team == game.home_team,
+            Game.away_team == game.away_team,
+        )
+        queries = {
+            "events (before)": select(Event).join(Event.game).where(*by_key),
+            "events (after)": select(Event).where(Event.game_id == game.id),
+            "shots (before)": select(Event.x_coordinate, Event.y_coordinate)
+            .join(Event.game)
+            .join(Event.event_type)
+            .where(*by_key, EventType.name.ilike("shot")),
+            "shots (after)": select(Event.x_coordinate, Event.y_coordinate).where(
+                Event.game_id == game.id,
+                Event.event_type_id == crud.id_of(EventType, "Shot"),
+            ),
+        }
+
+        size_mb = 0.0
+        if db.bind.dialect.name == "sqlite":
+            size_mb = Path(db.bind.url.database).stat().st_size / 1e6
+        print(f"\n{total:,} events ({size_mb:.1f} MB), querying game {game.id}\n")
+        print(f"{'query':<18} {'rows':>6} {'median ms':>10}  plan")
+        for name, stmt in queries.items():
+            rows = len(db.execute(stmt).all())
+            ms = timed(lambda: db.execute(stmt).all())
+            plan = ""
+            if db.bind.dialect.name == "sqlite":
+                compiled = stmt.compile(
+                    dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+                )
+                plan = "; ".join(
+                    row[-1]
+                    for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+                )
+            print(f"{name:<18} {rows:>6} {ms:>10.2f}  {plan}")
+
+
+if __name__ == "__main__":
+    main()
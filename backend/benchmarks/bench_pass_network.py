@@ -0,0 +1,57 @@
+"""Pass networks: cold (grouped query) vs cached per-game edges.
+
+Seeds *scale* copies of every game and times ``/games/{id}/pass-network``
+and the multi-game ``/games/pass-network`` over every game, once with an
+empty edge cache and once with every game's edges cached.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_pass_network --scale 100
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from .common import prepare, timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    prepare(args.scale)
+    from fastapi.testclient import TestClient
+
+    from src.db.seed import reset_and_seed_db
+    from src.main import app
+    from src.services import game_cache
+
+    reset_and_seed_db()
+    client = TestClient(app)
+    game_ids = [g["id"] for g in client.get("/games").json()]
+    everything = {"game_id": game_ids}
+
+    def cold(path: str, **kwargs):
+        game_cache.invalidate()
+        return client.get(path, **kwargs)
+
+    network = client.get("/games/pass-network", params=everything).json()
+    print(
+        f"\n{len(game_ids)} games: {len(network['nodes'])} players, "
+        f"{len(network['edges']):,} edges\n"
+    )
+    print(f"{'request':<28} {'cold ms':>9} {'cached ms':>10}")
+    one = f"/games/{game_ids[0]}/pass-network"
+    for label, path, params in (
+        ("one game", one, None),
+        (f"all {len(game_ids)} games", "/games/pass-network", everything),
+    ):
+        cold_ms = timed(lambda: cold(path, params=params), repeat=3)
+        warm_ms = timed(lambda: client.get(path, params=params), repeat=3)
+        print(f"{label:<28} {cold_ms:>9.1f} {warm_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Possession segmentation: per-event Python loop vs the vectorised engine.
+
+Seeds *scale* copies of every game, loads the ordered event stream once and
+times three things:
+
+* a straightforward per-event loop applying the same start rules,
+* :func:`src.services.possessions.segment` on the same frame, and
+* :func:`src.db.possessions.rebuild` (query + segment + insert) for every
+  game, and for the single game an event write refreshes.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_possessions --scale 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from .common import prepare, timed
+
+
+def _loop_segment(frame) -> int:
+    from src.services.possessions import (
+        ENDING_EVENTS,
+        IGNORED_EVENTS,
+        PASS_EVENTS,
+        STARTING_EVENTS,
+    )
+
+    possessions, current, previous = [], None, None
+    for game, period, team, name in frame[["game_id", "period", "team_id", "event"]].itertuples(
+        index=False
+    ):
+        if name in IGNORED_EVENTS:
+            continue
+        if (
+            current is None
+            or (game, period, team) != current["key"]
+            or name in STARTING_EVENTS
+            or previous in ENDING_EVENTS
+        ):
+            current = {"key": (game, period, team), "events": 0, "passes": 0}
+            possessions.append(current)
+        current["events"] += 1
+        current["passes"] += name in PASS_EVENTS
+        previous = name
+    return len(possessions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    prepare(args.scale)
+    from src.db import possessions
+    from src.db.database import SessionLocal
+    from src.db.seed import reset_and_seed_db
+    from src.services.possessions import segment
+
+    reset_and_seed_db()
+    with SessionLocal() as session:
+        frame = possessions._events_frame(session, None)
+        print(f"\n{len(frame):,} events in {frame['game_id'].nunique()} games\n")
+
+        print(f"{'path':<28} {'ms':>9} {'possessions':>12}")
+        for label, fn in (
+            ("per-event loop", lambda: _loop_segment(frame)),
+            ("segment()", lambda: len(segment(frame))),
+        ):
+            ms = timed(fn, repeat=3)
+            print(f"{label:<28} {ms:>9.1f} {fn():>12,}")
+
+        started = time.perf_counter()
+        stored = possessions.rebuild(session)
+        session.commit()
+        ms = (time.perf_counter() - started) * 1000
+        print(f"{'rebuild() every game':<28} {ms:>9.1f} {stored:>12,}")
+
+        game_id = int(frame["game_id"].iloc[0])
+        ms = timed(lambda: possessions.rebuild(session, [game_id]))
+        stored = possessions.rebuild(session, [game_id])
+        print(f"{'rebuild() one game':<28} {ms:>9.1f} {stored:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Requests/sec for a full-game event payload: ORM + Pydantic vs row fast path.
+
+Mounts a replica of the previous ``/games/{id}/events`` implementation
+(ORM objects validated one by one through ``EventSchema`` and encoded by
+FastAPI's ``jsonable_encoder``/``json``) next to the real route, which
+encodes row tuples straight to orjson bytes.  Both are driven in-process
+through ``httpx.ASGITransport`` with *concurrency* overlapping clients, so
+the numbers measure server-side CPU per request without network noise.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.bench_serialization --seconds 5 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from .common import prepare
+
+
+def _legacy_router():
+    from fastapi import APIRouter, Depends
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.db.database import get_db
+    from src.models import Event
+    from src.schemas import EventSchema
+
+    router = APIRouter(prefix="/legacy")
+
+    @router.get("/games/{game_id}/events", response_model=list[EventSchema])
+    async def legacy_game_events(game_id: int, db: AsyncSession = Depends(get_db)):
+        events = await db.execute(
+            select(Event).where(Event.game_id == game_id).order_by(Event.id)
+        )
+        return events.scalars().all()
+
+    return router
+
+
+async def _run(app, path: str, concurrency: int, seconds: float) -> tuple[float, int]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        size = len((await client.get(path)).content)  # warm-up
+        deadline = time.perf_counter() + seconds
+        done = 0
+
+        async def _worker() -> None:
+            nonlocal done
+            while time.perf_counter() < deadline:
+                resp = await client.get(path)
+                resp.raise_for_status()
+                done += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        return done / (time.perf_counter() - started), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    prepare(args.scale)
+    from sqlalchemy import func, select
+
+    from src.db.database import SessionLocal
+    from src.db.seed import reset_and_seed_db
+    from src.main import app
+    from src.models import Event
+
+    reset_and_seed_db()
+    app.include_router(_legacy_router())
+    with SessionLocal() as session:
+        game_id, rows = session.execute(
+            select(Event.game_id, func.count())
+            .group_by(Event.game_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).one()
+    print(f"\nGame {game_id}: {rows} events, {args.concurrency} clients, {args.seconds:.0f}s each\n")
+
+    print(f"{'path':<26} {'req/sec':>8} {'bytes':>9}")
+    for label, path in (
+        ("ORM + EventSchema", f"/legacy/games/{game_id}/events"),
+        ("rows -> orjson", f"/games/{game_id}/events"),
+    ):
+        rps, size = asyncio.run(_run(app, path, args.concurrency, args.seconds))
+        print(f"{label:<26} {rps:>8.1f} {size:>9,}")
+
+
+if __name__ == "__main__":
+    main()
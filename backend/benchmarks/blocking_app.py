@@ -0,0 +1,45 @@
+"""The application plus replicas of two game routes using a blocking ``Session``.
+
+Served by :mod:`benchmarks.bench_async_load`; the replicas run their queries
+the way the routes did before the async data layer – synchronously inside an
+``async def`` handler, on the event loop.
+"""
+
+from __future__ import annotations
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.db import crud
+from src.db.database import SessionLocal
+from src.main import app
+from src.models import Event, EventType
+from src.schemas import EventSchema
+from src.schemas.shot import ShotCoordinateSchema
+
+
+def _sync_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@app.get("/blocking/games/{game_id}/events", response_model=list[EventSchema])
+async def blocking_game_events(game_id: int, db: Session = Depends(_sync_db)):
+    return db.execute(
+        select(Event).where(Event.game_id == game_id).order_by(Event.id)
+    ).scalars().all()
+
+
+@app.get("/blocking/games/{game_id}/shot-density", response_model=list[ShotCoordinateSchema])
+async def blocking_shot_density(game_id: int, db: Session = Depends(_sync_db)):
+    rows = db.execute(
+        select(Event.x_coordinate.label("x"), Event.y_coordinate.label("y")).where(
+            Event.game_id == game_id,
+            Event.event_type_id == crud.id_of(EventType, "Shot"),
+        )
+    ).all()
+    return [{"x": r.x, "y": r.y} for r in rows]
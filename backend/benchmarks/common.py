@@ -0,0 +1,57 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throw-away database seeded from a synthetic dataset
+made by replicating the games in ``data/games`` *scale* times with shifted
+dates (every game has a distinct home/away pair, so shifted copies never
+collide).  Call :func:`prepare` **before** importing anything from ``src`` –
+settings are read from the environment at import time.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def write_synthetic_dataset(path: Path, scale: int) -> int:
+    """Write *scale* copies of every game to *path*; return the row count."""
+    games = [pd.read_csv(p) for p in sorted((DATA_DIR / "games").glob("*.csv"))]
+    frames = []
+    for i in range(scale):
+        for game in games:
+            shifted = pd.to_datetime(game["game_date"]) + pd.Timedelta(days=i)
+            frames.append(game.assign(game_date=shifted.dt.strftime("%Y-%m-%d")))
+    df = pd.concat(frames, ignore_index=True)
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+def prepare(scale: int, database_url: str | None = None) -> Path:
+    """Create the synthetic dataset and point the application settings at it."""
+    tmp_dir = Path(tempfile.mkdtemp(prefix="bigdatacup-bench-"))
+    csv_path = tmp_dir / "dataset.csv"
+    rows = write_synthetic_dataset(csv_path, scale)
+    print(f"Synthetic dataset: {rows:,} rows ({scale}x) at {csv_path}")
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ["DATABASE_URL"] = database_url or f"sqlite:///{tmp_dir / 'bench.db'}"
+    os.environ["DATASET_CSV"] = str(csv_path)
+    return csv_path
+
+
+def timed(fn: Callable[[], object], repeat: int = 20) -> float:
+    """Return the median wall time of *fn* in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,225 @@
+"""Negotiated response compression (zstd or gzip).
+
+:class:`CompressionMiddleware` picks an encoding from the request's
+``Accept-Encoding`` (zstd is preferred over gzip at equal quality) and
+compresses textual responses:
+
+* complete bodies of at least ``minimum_size`` bytes are compressed in one
+  go.  When the response carries an ETag whose body sits in the
+  :mod:`~src.services.response_cache`, the compressed body is cached next
+  to it, so hot responses are compressed only once;
+* streamed bodies (exports) are compressed chunk by chunk and flushed after
+  each chunk, so clients still receive data as it is produced.
+
+Compressed responses get an encoding-specific ETag (``"<tag>-zstd"``), as
+the bytes differ from the identity encoding.  ``If-None-Match`` handling
+strips that suffix again (see :mod:`src.routes.caching`).
+
+zstd needs the optional ``zstandard`` package; without it only gzip is
+offered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..services.response_cache import response_cache
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Server preference among encodings of equal quality
+ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+_COMPRESSIBLE = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Return the best of :data:`ENCODINGS` acceptable per *accept_encoding*."""
+    if not accept_encoding:
+        return None
+    quality: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        quality[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = quality.get(encoding, quality.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """*etag* of the *encoding* variant (``"abc"`` → ``"abc-gzip"``)."""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def identity_etag(etag: str) -> str:
+    """Inverse of :func:`encoded_etag` (other tags are returned unchanged)."""
+    for encoding in ("zstd", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def _compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and (
+        content_type.startswith(_COMPRESSIBLE) or content_type.endswith("+json")
+    )
+
+
+class _Stream:
+    """Incremental compressor flushing after every chunk."""
+
+    def __init__(self, encoding: str, gzip_level: int, zstd_level: int):
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(self._flush_mode)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses per ``Accept-Encoding``."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _Responder(self, send, encoding, request_headers.get("if-none-match"))
+        await self.app(scope, receive, responder)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+        return gzip.compress(body, self.gzip_level, mtime=0)
+
+
+class _Responder:
+    """``send`` wrapper deciding per response whether and how to compress."""
+
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        send: Send,
+        encoding: str,
+        if_none_match: str | None,
+    ) -> None:
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.if_none_match = if_none_match or ""
+        self.start: Message | None = None
+        self.stream: _Stream | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if message["status"] == 304:
+                # Echo the tag of the variant the client revalidates
+                etag = headers.get("etag")
+                if etag and encoded_etag(etag, self.encoding) in self.if_none_match:
+                    MutableHeaders(scope=message)["ETag"] = encoded_etag(etag, self.encoding)
+                self.passthrough = True
+            elif not _compressible(headers):
+                self.passthrough = True
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is None and not more_body:
+            await self._send_whole(body)
+            return
+
+        if self.stream is None:
+            self.stream = _Stream(
+                self.encoding, self.middleware.gzip_level, self.middleware.zstd_level
+            )
+            headers = self._encoded_headers()
+            del headers["Content-Length"]
+            await self.send(self.start)
+        data = self.stream.compress(body) if body else b""
+        if not more_body:
+            data += self.stream.finish()
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(scope=self.start)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if etag := headers.get("etag"):
+            headers["ETag"] = encoded_etag(etag, self.encoding)
+        return headers
+
+    async def _send_whole(self, body: bytes) -> None:
+        if len(body) < self.middleware.minimum_size:
+            MutableHeaders(scope=self.start).add_vary_header("Accept-Encoding")
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        etag = Headers(raw=self.start["headers"]).get("etag")
+        data = response_cache.variant(etag, self.encoding) if etag else None
+        if data is None:
+            data = self.middleware.compress(self.encoding, body)
+            if etag:
+                response_cache.put_variant(etag, self.encoding, data)
+        headers = self._encoded_headers()
+        headers["Content-Length"] = str(len(data))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": data})
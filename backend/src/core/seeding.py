@@ -0,0 +1,78 @@
+"""Background database seeding with progress tracking.
+
+:func:`run_seeding` runs :func:`~src.db.seed.seed_db` in a worker thread so
+the server can bind and answer health checks while the dataset is loaded.
+Progress is kept in the process-wide :data:`seed_progress`, which the
+``/health/ready`` endpoint reports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Literal
+
+from ..db.loader import LoadStats
+from ..db.seed import seed_db
+from ..services import game_cache, response_cache
+from ..utils.logger import logger
+
+SeedState = Literal["pending", "running", "ready", "failed"]
+
+
+@dataclass
+class SeedProgress:
+    """State of the startup seeding task."""
+
+    state: SeedState = "pending"
+    rows_loaded: int = 0
+    rows_per_sec: float = 0.0
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> None:
+        self.state = "running"
+        self.rows_loaded = 0
+        self.rows_per_sec = 0.0
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        self.error = None
+
+    def update(self, stats: LoadStats) -> None:
+        # Called from the seeding thread; plain attribute writes are atomic
+        self.rows_loaded = stats.rows
+        self.rows_per_sec = round(stats.rows_per_sec, 1)
+
+    def finish(self, error: BaseException | None = None) -> None:
+        self.state = "failed" if error else "ready"
+        self.error = repr(error) if error else None
+        self.finished_at = datetime.now(timezone.utc)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+seed_progress = SeedProgress()
+
+
+async def run_seeding() -> None:
+    """Seed the database off the event loop, recording progress and outcome."""
+    seed_progress.start()
+    try:
+        await asyncio.to_thread(seed_db, progress=seed_progress.update)
+    except Exception as exc:
+        logger.exception("[Startup] Database seeding failed")
+        seed_progress.finish(exc)
+        return
+    finally:
+        # Anything derived from events while seeding ran may be stale now
+        game_cache.invalidate()
+        response_cache.invalidate()
+    seed_progress.finish()
+    logger.info("[Startup] Database ready.")
@@ -7,11 +7,13 @@ application to register these tasks.
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
+from ..settings.config import settings
 from ..utils.logger import logger
-from ..db.seed import reset_and_seed_db
+from .seeding import run_seeding
 
 
 @asynccontextmanager
@@ -24,15 +26,21 @@ async def lifespan(app: FastAPI):
     """
 
     # ------------------------------------------------------------------
-    # Startup – reset & seed database
+    # Startup – seed database in the background (incremental unless
+    # SEED_MODE says otherwise).  The server binds right away; /health/ready
+    # reports 503 until seeding has finished.
     # ------------------------------------------------------------------
-    logger.info("[Startup] Resetting & seeding database …")
-    reset_and_seed_db()
-    logger.info("[Startup] Database ready.")
+    logger.info("[Startup] Seeding database in background (mode=%s) …", settings.seed_mode)
+    seeding = asyncio.create_task(run_seeding())
 
     # Let the application run
     yield
 
+    if not seeding.done():
+        # The worker thread cannot be interrupted; stop waiting for it
+        logger.warning("[Shutdown] Database seeding still in progress.")
+        seeding.cancel()
+
     # ------------------------------------------------------------------
     # Shutdown – perform cleanup if necessary
     # ------------------------------------------------------------------
@@ -0,0 +1,95 @@
+"""Spatial aggregates of event locations (see :mod:`src.services.density`).
+
+The database counts events per group and grid cell in one ``GROUP BY``;
+the counts are then laid out and smoothed per group in NumPy.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from collections import defaultdict
+from typing import Literal, Sequence, get_args
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Event, EventType, Game, Player, Team
+from ..services import density
+from .filters import EventFilter, filter_clauses, strength_columns
+
+
+# Dimensions spatial aggregates can be grouped by
+GroupDimension = Literal["game", "event", "team", "player", "period", "strength"]
+GROUP_DIMENSIONS: tuple[str, ...] = get_args(GroupDimension)
+
+
+def cell_index(column, bins: int, extent: int):
+    """SQL expression for the ``0 … bins - 1`` cell of an integer coordinate."""
+    cell = (column * bins) // extent
+    # The far boundary (x == extent) belongs to the last cell
+    return case((cell >= bins, bins - 1), else_=cell)
+
+
+async def spatial_aggregate(
+    db: AsyncSession,
+    filters: EventFilter,
+    group_by: Sequence[GroupDimension],
+    spec: density.GridSpec,
+) -> list[dict]:
+    """Binned event locations per group, computed in one grouped query.
+
+    Events are counted per ``(group…, cell)`` by the database; each group's
+    counts are then laid out (and smoothed) on a grid in NumPy.  Returns
+    ``{"group": {dimension: value}, "grid": …}`` dicts sorted by group.
+    Raises :class:`ValueError` for unknown dimensions or strength states.
+    """
+    unknown = set(group_by) - set(GROUP_DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Cannot group by {', '.join(sorted(unknown))}")
+
+    own, opp = strength_columns()
+    dimensions = {
+        "game": (Event.game_id,),
+        "event": (EventType.name,),
+        "team": (Team.name,),
+        "player": (Player.name,),
+        "period": (Event.period,),
+        "strength": (own, opp),
+    }
+    keys = [col for dim in group_by for col in dimensions[dim]]
+    cx = cell_index(Event.x_coordinate, spec.x_bins, density.RINK_LENGTH)
+    cy = cell_index(Event.y_coordinate, spec.y_bins, density.RINK_WIDTH)
+
+    stmt = (
+        select(*keys, cx, cy, func.count())
+        .where(Event.x_coordinate.isnot(None), Event.y_coordinate.isnot(None))
+        .group_by(*keys, cx, cy)
+    )
+    if "strength" in group_by or filters.needs_game:
+        stmt = stmt.join(Game, Game.id == Event.game_id)
+    if "event" in group_by:
+        stmt = stmt.outerjoin(EventType, EventType.id == Event.event_type_id)
+    if "team" in group_by:
+        stmt = stmt.outerjoin(Team, Team.id == Event.team_id)
+    if "player" in group_by:
+        stmt = stmt.outerjoin(Player, Player.id == Event.player_id)
+    stmt = stmt.where(*filter_clauses(filters))
+
+    cells: dict[tuple, list[tuple[int, int, int]]] = defaultdict(list)
+    for row in await db.execute(stmt):
+        *key, x, y, n = row
+        cells[tuple(key)].append((x, y, n))
+
+    results = []
+    for key in sorted(cells, key=lambda k: tuple((v is None, v) for v in k)):
+        x, y, n = np.array(cells[key]).T
+        group, values = {}, iter(key)
+        for dim in group_by:
+            if dim == "strength":
+                group[dim] = "{}v{}".format(next(values), next(values))
+            else:
+                group[dim] = next(values)
+        grid = density.cell_grid(x, y, n, spec)
+        results.append({"group": group, "grid": density.grid_payload(grid, spec, int(n.sum()))})
+    return results
@@ -0,0 +1,233 @@
+"""Materialised per-game box scores of teams and players.
+
+``team_game_stats`` and ``player_game_stats`` hold one counter row per
+game/team and game/player/team.  Seeding rebuilds both with one set-based
+``GROUP BY`` pass over the events (:func:`rebuild`).  The event write paths
+in :mod:`.crud` and :mod:`.bulk` then keep them current by applying the
+events they remove and add as deltas (:func:`apply`), so reads never touch
+the events table.
+
+Players are credited for events where they are the primary player.  Next
+to the counters, each line sums the stored expected goals of its shots.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterable, Sequence
+
+from sqlalchemy import and_, bindparam, case, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import (
+    Event,
+    EventType,
+    Game,
+    Player,
+    PlayerGameStats,
+    Team,
+    TeamGameStats,
+)
+
+# Counter → event types it counts (``None``: every event)
+STAT_EVENTS: dict[str, tuple[str, ...] | None] = {
+    "events": None,
+    "shots": ("Shot", "Goal"),
+    "goals": ("Goal",),
+    "faceoff_wins": ("Faceoff Win",),
+    "takeaways": ("Takeaway",),
+    "puck_recoveries": ("Puck Recovery",),
+    "passes": ("Play", "Incomplete Play"),
+    "completed_passes": ("Play",),
+    "zone_entries": ("Zone Entry",),
+    "dump_ins": ("Dump In/Out",),
+    "penalties": ("Penalty Taken",),
+}
+STATS = (*STAT_EVENTS, "xg")
+
+# ``(game_id, team_id, player_id, event_type_id, xg)`` of one event
+EventKey = tuple[int | None, int | None, int | None, int | None, float | None]
+
+_KEYS = {
+    TeamGameStats: ("game_id", "team_id"),
+    PlayerGameStats: ("game_id", "player_id", "team_id"),
+}
+
+
+def event_key(event: Event) -> EventKey:
+    """The box-score relevant columns of *event*."""
+    return (event.game_id, event.team_id, event.player_id, event.event_type_id, event.xg)
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+
+def rebuild(session: Session) -> None:
+    """Recompute both tables from the ``events`` table."""
+    name = EventType.name
+    counters = [
+        func.count().label(stat)
+        if events is None
+        else func.sum(case((name.in_(events), 1), else_=0)).label(stat)
+        for stat, events in STAT_EVENTS.items()
+    ]
+    # Only shots carry an xG value
+    counters.append(func.coalesce(func.sum(Event.xg), 0.0).label("xg"))
+    for model, keys in _KEYS.items():
+        key_columns = [getattr(Event, k) for k in keys]
+        source = (
+            select(*key_columns, *counters)
+            .outerjoin(EventType, EventType.id == Event.event_type_id)
+            .where(*(c.isnot(None) for c in key_columns))
+            .group_by(*key_columns)
+        )
+        table = model.__table__
+        session.execute(table.delete())
+        session.execute(table.insert().from_select([*keys, *STATS], source))
+
+
+def _write_deltas(session: Session, model, deltas: dict[tuple, dict[str, int]]) -> None:
+    deltas = {k: d for k, d in deltas.items() if any(d.values())}
+    if not deltas:
+        return
+    table = model.__table__
+    keys = _KEYS[model]
+    key_columns = [table.c[k] for k in keys]
+    in_deltas = tuple_(*key_columns).in_(list(deltas))
+    existing = set(session.execute(select(*key_columns).where(in_deltas)).tuples().all())
+
+    changed = [
+        {**{f"k_{k}": v for k, v in zip(keys, key)}, **{f"d_{s}": d[s] for s in STATS}}
+        for key, d in deltas.items()
+        if key in existing
+    ]
+    if changed:
+        session.execute(
+            table.update()
+            .where(and_(*(c == bindparam(f"k_{c.name}") for c in key_columns)))
+            .values({s: table.c[s] + bindparam(f"d_{s}") for s in STATS}),
+            changed,
+        )
+    created = [dict(zip(keys, key)) | d for key, d in deltas.items() if key not in existing]
+    if created:
+        session.execute(table.insert(), created)
+    # Lines left without any event drop out of the box score
+    session.execute(table.delete().where(in_deltas, table.c.events <= 0))
+
+
+def _apply(session: Session, removed: Sequence[EventKey], added: Sequence[EventKey]) -> None:
+    type_ids = {k[3] for k in (*removed, *added) if k[3] is not None}
+    names = dict(
+        session.execute(
+            select(EventType.id, EventType.name).where(EventType.id.in_(type_ids))
+        ).all()
+    )
+    team_deltas = defaultdict(lambda: dict.fromkeys(STATS, 0))
+    player_deltas = defaultdict(lambda: dict.fromkeys(STATS, 0))
+    for sign, keys in ((-1, removed), (1, added)):
+        for game_id, team_id, player_id, type_id, xg in keys:
+            if game_id is None or team_id is None:
+                continue
+            name = names.get(type_id)
+            lines = [team_deltas[(game_id, team_id)]]
+            if player_id is not None:
+                lines.append(player_deltas[(game_id, player_id, team_id)])
+            for line in lines:
+                for stat, events in STAT_EVENTS.items():
+                    if events is None or name in events:
+                        line[stat] += sign
+                line["xg"] += sign * (xg or 0.0)
+    _write_deltas(session, TeamGameStats, team_deltas)
+    _write_deltas(session, PlayerGameStats, player_deltas)
+
+
+async def apply(
+    db: AsyncSession, removed: Iterable[EventKey] = (), added: Iterable[EventKey] = ()
+) -> None:
+    """Update the box scores for *removed* and *added* events.
+
+    An updated event is removed with its old key and added with its new one.
+    Call inside the transaction that changes the events.
+    """
+    removed, added = list(removed), list(added)
+    if removed or added:
+        await db.run_sync(_apply, removed, added)
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+def _stats(row) -> dict[str, float]:
+    return {s: row._mapping[s] for s in STATS}
+
+
+def _stat_columns(model) -> list:
+    return [getattr(model, s) for s in STATS]
+
+
+async def game_box_score(db: AsyncSession, game_id: int) -> dict:
+    """Team and player box scores of one game."""
+    teams = await db.execute(
+        select(Team.name, *_stat_columns(TeamGameStats))
+        .join(Team, Team.id == TeamGameStats.team_id)
+        .where(TeamGameStats.game_id == game_id)
+        .order_by(Team.name)
+    )
+    players = await db.execute(
+        select(
+            PlayerGameStats.player_id,
+            Player.name.label("player"),
+            Team.name.label("team"),
+            *_stat_columns(PlayerGameStats),
+        )
+        .join(Player, Player.id == PlayerGameStats.player_id)
+        .join(Team, Team.id == PlayerGameStats.team_id)
+        .where(PlayerGameStats.game_id == game_id)
+        .order_by(Team.name, PlayerGameStats.events.desc(), Player.name)
+    )
+    return {
+        "game_id": game_id,
+        "teams": [{"team": r.name, "stats": _stats(r)} for r in teams],
+        "players": [
+            {"player_id": r.player_id, "player": r.player, "team": r.team, "stats": _stats(r)}
+            for r in players
+        ],
+    }
+
+
+async def player_stats(db: AsyncSession, player: Player) -> dict:
+    """Per-game box scores of *player* and their totals."""
+    rows = (
+        await db.execute(
+            select(
+                Game.id.label("game_id"),
+                Game.game_date,
+                Game.home_team,
+                Game.away_team,
+                Team.name.label("team"),
+                *_stat_columns(PlayerGameStats),
+            )
+            .join(Game, Game.id == PlayerGameStats.game_id)
+            .join(Team, Team.id == PlayerGameStats.team_id)
+            .where(PlayerGameStats.player_id == player.id)
+            .order_by(Game.game_date, Game.id)
+        )
+    ).all()
+    games = [
+        {
+            "game_id": r.game_id,
+            "game_date": r.game_date,
+            "home_team": r.home_team,
+            "away_team": r.away_team,
+            "team": r.team,
+            "stats": _stats(r),
+        }
+        for r in rows
+    ]
+    totals = {s: sum(g["stats"][s] for g in games) for s in STATS}
+    return {"player_id": player.id, "player": player.name, "games": games, "totals": totals}
@@ -0,0 +1,253 @@
+"""Transactional bulk event edits (``POST /events/bulk``).
+
+Creates, partial updates and deletes are applied as a handful of batched
+statements in one transaction, keeping the derived tables (box scores,
+possessions, xG) and data versions current the way the single-event
+writes in :mod:`.crud` do.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal, Sequence
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import box_scores, crud, possessions, versions, xg
+from ..models import Event, EventType, Game, Player, Team
+from ..schemas import EventCreate, EventPatch
+from ..services import spatial
+from ..utils.clock import parse_clock, parse_elapsed
+
+
+BulkOp = Literal["create", "update", "delete"]
+BulkStatus = Literal["created", "updated", "deleted", "not_found"]
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one item of a bulk edit (``index`` within its op's list)."""
+
+    op: BulkOp
+    index: int
+    id: int | None
+    status: BulkStatus
+
+
+@dataclass
+class BulkResult:
+    """Per-item outcomes and whether the edit was committed."""
+
+    applied: bool
+    items: list[BulkItemResult]
+
+
+async def _ids_by_name(
+    db: AsyncSession, model, names: set[str], make=None, scope: str | None = None
+) -> dict[str, int]:
+    """Map *names* to ``model`` ids, inserting the missing rows in one batch.
+
+    *make* builds the insert parameters of a missing name (default
+    ``{"name": name}``); *scope* is touched when anything was inserted.
+    """
+    if not names:
+        return {}
+    by_name = select(model.name, model.id)
+    found = dict((await db.execute(by_name.where(model.name.in_(names)))).tuples().all())
+    missing = sorted(names - found.keys())
+    if missing:
+        await db.execute(insert(model), [make(n) if make else {"name": n} for n in missing])
+        found |= dict((await db.execute(by_name.where(model.name.in_(missing)))).tuples().all())
+        versions.touch(db, scope)
+    return found
+
+
+async def _game_ids(db: AsyncSession, keys: set[tuple[str, str, str]]) -> dict[tuple, int]:
+    """Map ``(game_date, home_team, away_team)`` *keys* to game ids, inserting new games."""
+    if not keys:
+        return {}
+    key_columns = (Game.game_date, Game.home_team, Game.away_team)
+    stmt = select(*key_columns, Game.id).where(Game.game_date.in_({k[0] for k in keys}))
+    found = {tuple(r[:3]): r[3] for r in (await db.execute(stmt)).all()}
+    missing = sorted(keys - found.keys())
+    if missing:
+        teams = await _team_ids(db, {t for k in missing for t in k[1:]})
+        await db.execute(
+            insert(Game),
+            [
+                {
+                    "game_date": date,
+                    "home_team": home,
+                    "away_team": away,
+                    "home_team_id": teams[home],
+                    "away_team_id": teams[away],
+                }
+                for date, home, away in missing
+            ],
+        )
+        found |= {tuple(r[:3]): r[3] for r in (await db.execute(stmt)).all()}
+        versions.touch(db, versions.GAMES)
+    return found
+
+
+async def _team_ids(db: AsyncSession, names: set[str]) -> dict[str, int]:
+    used = set((await db.execute(select(Team.abbreviation))).scalars())
+    return await _ids_by_name(
+        db,
+        Team,
+        names,
+        make=lambda n: {"name": n, "abbreviation": crud.team_abbreviation(n, used)},
+    )
+
+
+async def _encode_many(db: AsyncSession, payloads: list[dict]) -> list[dict]:
+    """Batched :func:`~.crud._encode` of full or partial event *payloads*.
+
+    Game fields, ``period``/``clock`` and coordinates must be complete where present
+    (see :func:`bulk_edit_events`).
+    """
+    game_keys = {
+        tuple(p[f] for f in crud.GAME_FIELDS) for p in payloads if crud.GAME_FIELDS[0] in p
+    }
+    players = {
+        p[f].strip() for p in payloads for f in ("player", "player_2") if p.get(f) and p[f].strip()
+    }
+    games = await _game_ids(db, game_keys)
+    teams = await _team_ids(db, {p["team"] for p in payloads if "team" in p})
+    event_types = await _ids_by_name(db, EventType, {p["event"] for p in payloads if "event" in p})
+    player_ids = await _ids_by_name(db, Player, players, scope=versions.PLAYERS)
+
+    rows = []
+    for payload in payloads:
+        data = dict(payload)
+        if crud.GAME_FIELDS[0] in data:
+            data["game_id"] = games[tuple(data.pop(f) for f in crud.GAME_FIELDS)]
+        if "clock" in data:
+            data["clock_seconds"] = parse_clock(data["clock"])
+            data["elapsed_seconds"] = parse_elapsed(data["period"], data["clock"])
+        if crud.COORD_FIELDS[0] in data:
+            data["spatial_cell"] = spatial.cell_key(*(data[f] for f in crud.COORD_FIELDS))
+        if "team" in data:
+            data["team_id"] = teams[data.pop("team")]
+        if "event" in data:
+            data["event_type_id"] = event_types[data.pop("event")]
+        for field in ("player", "player_2"):
+            if field in data:
+                name = data.pop(field)
+                data[f"{field}_id"] = player_ids[name.strip()] if name and name.strip() else None
+        rows.append(data)
+    return rows
+
+
+async def bulk_edit_events(
+    db: AsyncSession,
+    creates: Sequence[EventCreate] = (),
+    updates: Sequence[EventPatch] = (),
+    deletes: Sequence[int] = (),
+    atomic: bool = True,
+) -> BulkResult:
+    """Apply *creates*, partial *updates* and *deletes* in one transaction.
+
+    Names are resolved with one query per dimension and every op runs as a
+    single batched statement, so the cost is a handful of round trips and one
+    commit regardless of the batch size.  Updates and deletes of unknown ids
+    are reported as ``not_found``; with *atomic* any such item aborts the
+    whole edit before anything is written, otherwise the rest is applied.
+    """
+    targets = {u.id for u in updates} | set(deletes)
+    current = {}
+    if targets:
+        stmt = (
+            select(
+                Event.id,
+                Event.game_id,
+                Event.team_id,
+                Event.player_id,
+                Event.event_type_id,
+                Event.xg,
+                Event.period,
+                Event.clock,
+                *(getattr(Event, f) for f in crud.COORD_FIELDS),
+                *(getattr(Game, f) for f in crud.GAME_FIELDS),
+            )
+            .outerjoin(Game, Event.game_id == Game.id)
+            .where(Event.id.in_(targets))
+        )
+        current = {r[0]: r for r in (await db.execute(stmt)).all()}
+
+    items = [
+        BulkItemResult("update", i, u.id, "updated" if u.id in current else "not_found")
+        for i, u in enumerate(updates)
+    ] + [
+        BulkItemResult("delete", i, d, "deleted" if d in current else "not_found")
+        for i, d in enumerate(deletes)
+    ]
+    if atomic and any(item.status == "not_found" for item in items):
+        return BulkResult(False, items)
+
+    touched_games: set[int | None] = set()
+    # Box-score keys of the events as they are now, and as they will be
+    key_columns = ("game_id", "team_id", "player_id", "event_type_id", "xg")
+    latest = {id_: tuple(row._mapping[c] for c in key_columns) for id_, row in current.items()}
+    removed, added = [], []
+    # Position in ``added`` of every written event's final key
+    last_write: dict[int, int] = {}
+    if creates:
+        rows = await _encode_many(db, [c.model_dump() for c in creates])
+        ids = (
+            await db.execute(
+                insert(Event).returning(Event.id, sort_by_parameter_order=True), rows
+            )
+        ).scalars().all()
+        items[:0] = [BulkItemResult("create", i, id_, "created") for i, id_ in enumerate(ids)]
+        touched_games.update(r["game_id"] for r in rows)
+        for id_, row in zip(ids, rows):
+            latest[id_] = tuple(row.get(c) for c in key_columns)
+            last_write[id_] = len(added)
+            added.append(latest[id_])
+
+    patches = []
+    for u in updates:
+        if u.id not in current:
+            continue
+        data = u.model_dump(exclude_unset=True, exclude={"id"})
+        previous = current[u.id]._mapping
+        # Complete the game key, game time and location from the current values
+        for group in (crud.GAME_FIELDS, crud.TIME_FIELDS, crud.COORD_FIELDS):
+            if any(f in data for f in group):
+                data = {f: previous[f] for f in group} | data
+        patches.append((u.id, data))
+        touched_games.add(current[u.id].game_id)
+    rows = await _encode_many(db, [data for _, data in patches])
+    rows = [{"id": id_} | row for (id_, _), row in zip(patches, rows) if row]
+    if rows:
+        await db.execute(update(Event), rows)
+        touched_games.update(r["game_id"] for r in rows if "game_id" in r)
+        for row in rows:
+            key = latest[row["id"]]
+            removed.append(key)
+            latest[row["id"]] = tuple(row.get(c, v) for c, v in zip(key_columns, key))
+            last_write[row["id"]] = len(added)
+            added.append(latest[row["id"]])
+
+    # Written events are scored before deletes can remove them
+    scores = await xg.refresh(db, last_write)
+    for id_, i in last_write.items():
+        latest[id_] = added[i] = (*added[i][:-1], scores[id_])
+
+    found = [d for d in set(deletes) if d in current]
+    if found:
+        await db.execute(
+            delete(Event)
+            .where(Event.id.in_(found))
+            .execution_options(synchronize_session=False)
+        )
+        touched_games.update(current[d].game_id for d in found)
+        removed += [latest[d] for d in found]
+
+    if creates or rows or found:
+        await box_scores.apply(db, removed, added)
+        await possessions.refresh(db, touched_games)
+        await crud.commit_event_writes(db, *touched_games)
+    return BulkResult(True, items)
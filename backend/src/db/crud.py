@@ -1,33 +1,328 @@
-from sqlalchemy.orm import Session
+"""Async CRUD helpers for events and the dimension rows they reference."""
 
-from ..models import Event
+from typing import AsyncIterator, Sequence
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+
+from . import box_scores, possessions, versions, xg
+from ..models import Event, EventType, Game, Player, Team
 from ..schemas import EventCreate, EventUpdate
+from ..services import game_cache, response_cache, spatial
+from ..utils.clock import parse_clock, parse_elapsed
+from .filters import EventFilter, filter_clauses
+
+# Event fields that are resolved through the owning game
+GAME_FIELDS = ("game_date", "home_team", "away_team")
+# Event fields ``elapsed_seconds`` is derived from
+TIME_FIELDS = ("period", "clock")
+# Event fields ``spatial_cell`` is derived from
+COORD_FIELDS = ("x_coordinate", "y_coordinate")
+
+
+def team_abbreviation(name: str, used: set[str]) -> str:
+    """Derive a unique three-character abbreviation for *name*.
+
+    *used* holds the abbreviations already taken and is updated in place.
+    """
+    # Take last segment after '-' to avoid prefix like 'Olympic (Women) - '
+    seg = name.split("-")[-1].strip()
+    letters = "".join(ch for ch in seg if ch.isalpha())
+    if len(letters) >= 3:
+        base = letters[:3].upper()
+    else:
+        base = (letters.upper() + "XXX")[:3]
+    abbr = base
+    # Ensure uniqueness
+    i = 1
+    while abbr in used:
+        if len(base) == 3 and i < 10:
+            abbr = base[:2] + str(i)
+        else:
+            abbr = (base + chr(64 + i))[:3]
+        i += 1
+    used.add(abbr)
+    return abbr
+
+
+def id_of(model, name: str):
+    """Scalar subquery resolving a dictionary *name* to its ``model.id``.
+
+    Lets callers filter events by name while the comparison itself stays on
+    the integer foreign key (and its indexes).
+    """
+    return select(model.id).where(model.name == name).scalar_subquery()
+
+
+# ---------------------------------------------------------------------------
+# Dimension rows
+# ---------------------------------------------------------------------------
+
+
+async def _first(db: AsyncSession, stmt):
+    return (await db.execute(stmt.limit(1))).scalars().first()
+
+
+async def get_or_create_team(db: AsyncSession, name: str) -> Team:
+    team = await _first(db, select(Team).where(Team.name == name))
+    if team is None:
+        used = set((await db.execute(select(Team.abbreviation))).scalars())
+        team = Team(name=name, abbreviation=team_abbreviation(name, used))
+        db.add(team)
+        await db.flush()
+    return team
+
+
+async def get_or_create_player(db: AsyncSession, name: str) -> Player:
+    name = name.strip()
+    player = await _first(db, select(Player).where(Player.name == name))
+    if player is None:
+        player = Player(name=name)
+        db.add(player)
+        await db.flush()
+        versions.touch(db, versions.PLAYERS)
+    return player
+
+
+async def get_or_create_event_type(db: AsyncSession, name: str) -> EventType:
+    event_type = await _first(db, select(EventType).where(EventType.name == name))
+    if event_type is None:
+        event_type = EventType(name=name)
+        db.add(event_type)
+        await db.flush()
+    return event_type
+
+
+async def get_or_create_game(
+    db: AsyncSession, game_date: str, home_team: str, away_team: str
+) -> Game:
+    """Return the game identified by date & teams, inserting it if missing."""
+    game = await _first(
+        db,
+        select(Game).where(
+            Game.game_date == game_date,
+            Game.home_team == home_team,
+            Game.away_team == away_team,
+        ),
+    )
+    if game is None:
+        game = Game(
+            game_date=game_date,
+            home_team=home_team,
+            away_team=away_team,
+            home_team_id=(await get_or_create_team(db, home_team)).id,
+            away_team_id=(await get_or_create_team(db, away_team)).id,
+        )
+        db.add(game)
+        await db.flush()
+        versions.touch(db, versions.GAMES)
+    return game
+
 
+async def _encode(db: AsyncSession, data: dict, current: Event | None = None) -> dict:
+    """Translate the name fields of an event payload into foreign keys.
 
-def get_event(db: Session, event_id: int) -> Event | None:
-    return db.query(Event).filter(Event.id == event_id).first()
+    For updates, game fields missing from *data* are taken from *current*.
+    """
+    data = dict(data)
+    game_key = {f: data.pop(f) for f in GAME_FIELDS if f in data}
+    if game_key:
+        if current is not None:
+            game_key = {f: getattr(current, f) for f in GAME_FIELDS} | game_key
+        data["game_id"] = (await get_or_create_game(db, **game_key)).id
 
+    if "clock" in data:
+        data["clock_seconds"] = parse_clock(data["clock"])
+    if "clock" in data or "period" in data:
+        data["elapsed_seconds"] = parse_elapsed(
+            data.get("period", getattr(current, "period", None)),
+            data.get("clock", getattr(current, "clock", None)),
+        )
+    if any(f in data for f in COORD_FIELDS):
+        data["spatial_cell"] = spatial.cell_key(
+            *(data.get(f, getattr(current, f, None)) for f in COORD_FIELDS)
+        )
+    if "team" in data:
+        data["team_id"] = (await get_or_create_team(db, data.pop("team"))).id
+    if "event" in data:
+        data["event_type_id"] = (await get_or_create_event_type(db, data.pop("event"))).id
+    for field in ("player", "player_2"):
+        if field in data:
+            name = data.pop(field)
+            data[f"{field}_id"] = (
+                (await get_or_create_player(db, name)).id if name and name.strip() else None
+            )
+    return data
 
-def get_events(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Event).offset(skip).limit(limit).all()
 
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
 
-def create_event(db: Session, event_in: EventCreate) -> Event:
-    obj = Event(**event_in.model_dump())
+
+async def get_event(db: AsyncSession, event_id: int) -> Event | None:
+    return await db.get(Event, event_id)
+
+
+def event_rows_query():
+    """Core ``SELECT`` of decoded event rows, columns in ``EventSchema`` order.
+
+    Names are joined in from the dimension tables, so rows can be serialised
+    without loading ORM objects.
+    """
+    player_2 = aliased(Player)
+    return (
+        select(
+            Event.id,
+            Game.game_date,
+            Game.home_team,
+            Game.away_team,
+            Event.period,
+            Event.clock,
+            Event.home_team_skaters,
+            Event.away_team_skaters,
+            Event.home_team_goals,
+            Event.away_team_goals,
+            Team.name.label("team"),
+            Player.name.label("player"),
+            EventType.name.label("event"),
+            Event.x_coordinate,
+            Event.y_coordinate,
+            Event.detail_1,
+            Event.detail_2,
+            Event.detail_3,
+            Event.detail_4,
+            player_2.name.label("player_2"),
+            Event.x_coordinate_2,
+            Event.y_coordinate_2,
+            Event.elapsed_seconds,
+            Event.xg,
+        )
+        .outerjoin(Game, Game.id == Event.game_id)
+        .outerjoin(Team, Team.id == Event.team_id)
+        .outerjoin(Player, Player.id == Event.player_id)
+        .outerjoin(EventType, EventType.id == Event.event_type_id)
+        .outerjoin(player_2, player_2.id == Event.player_2_id)
+    )
+
+
+# Column names of :func:`event_rows_query`
+EVENT_ROW_COLUMNS: tuple[str, ...] = tuple(c.name for c in event_rows_query().selected_columns)
+
+
+async def get_event_rows(
+    db: AsyncSession,
+    filters: EventFilter | None = None,
+    after: int | None = None,
+    limit: int | None = None,
+) -> Sequence[Row]:
+    """Decoded event rows matching *filters*, ordered by id.
+
+    *after* continues a keyset pagination: only events with a larger id are
+    returned, so every page costs the same however deep it is.
+    """
+    stmt = event_rows_query().order_by(Event.id).limit(limit)
+    if filters is not None:
+        # event_rows_query() already joins the game, as strength filters need
+        stmt = stmt.where(*filter_clauses(filters))
+    if after is not None:
+        stmt = stmt.where(Event.id > after)
+    return (await db.execute(stmt)).all()
+
+
+async def stream_event_rows(
+    db: AsyncSession, game_id: int, batch_size: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield the decoded events of *game_id* in batches from a streaming cursor."""
+    stmt = (
+        event_rows_query()
+        .where(Event.game_id == game_id)
+        .order_by(Event.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(stmt)
+    async for batch in result.partitions():
+        yield batch
+
+
+async def _score(db: AsyncSession, obj: Event) -> None:
+    # Stored by a Core UPDATE; mirrored on the loaded object without a flush
+    await db.flush()
+    scores = await xg.refresh(db, [obj.id])
+    set_committed_value(obj, "xg", scores[obj.id])
+
+
+async def commit_event_writes(db: AsyncSession, *game_ids: int | None) -> None:
+    """Commit event writes to *game_ids* and drop what was derived from them.
+
+    The games' versions move in the same transaction; cached responses and
+    in-process game caches are invalidated once it has committed.
+    """
+    # The used event types can change with any event write
+    versions.touch(db, versions.EVENT_TYPES, *(
+        versions.game_scope(g) for g in game_ids if g is not None
+    ))
+    scopes = await versions.flush(db)
+    await db.commit()
+    if scopes:
+        response_cache.invalidate(*scopes)
+    game_cache.invalidate(*game_ids)
+
+
+async def create_event(db: AsyncSession, event_in: EventCreate) -> Event:
+    obj = Event(**(await _encode(db, event_in.model_dump())))
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    await _score(db, obj)
+    await box_scores.apply(db, added=[box_scores.event_key(obj)])
+    await possessions.refresh(db, [obj.game_id])
+    await commit_event_writes(db, obj.game_id)
+    await db.refresh(obj)
     return obj
 
 
-def update_event(db: Session, db_obj: Event, event_in: EventUpdate) -> Event:
-    for field, value in event_in.model_dump(exclude_unset=True).items():
+async def update_event(db: AsyncSession, db_obj: Event, event_in: EventUpdate) -> Event:
+    previous_game_id = db_obj.game_id
+    previous_key = box_scores.event_key(db_obj)
+    data = await _encode(db, event_in.model_dump(exclude_unset=True), current=db_obj)
+    for field, value in data.items():
         setattr(db_obj, field, value)
-    db.commit()
-    db.refresh(db_obj)
+    await _score(db, db_obj)
+    await box_scores.apply(db, [previous_key], [box_scores.event_key(db_obj)])
+    await possessions.refresh(db, {previous_game_id, db_obj.game_id})
+    await commit_event_writes(db, previous_game_id, db_obj.game_id)
+    await db.refresh(db_obj)
     return db_obj
 
 
-def delete_event(db: Session, db_obj: Event) -> None:
-    db.delete(db_obj)
-    db.commit() 
\ No newline at end of file
+async def delete_event(db: AsyncSession, db_obj: Event) -> None:
+    game_id = db_obj.game_id
+    await box_scores.apply(db, removed=[box_scores.event_key(db_obj)])
+    await db.delete(db_obj)
+    await possessions.refresh(db, [game_id])
+    await commit_event_writes(db, game_id)
+
+
+async def game_timeline_rows(db: AsyncSession, game_id: int) -> Sequence[Row]:
+    """Rows for :meth:`~..services.game_state.GameTimeline.from_rows`.
+
+    Events without a parseable game time are left out.
+    """
+    stmt = (
+        select(
+            Event.id,
+            Event.elapsed_seconds,
+            EventType.name,
+            Event.team_id == Game.home_team_id,
+            Event.home_team_skaters,
+            Event.away_team_skaters,
+            Event.home_team_goals,
+            Event.away_team_goals,
+        )
+        .join(Game, Game.id == Event.game_id)
+        .outerjoin(EventType, EventType.id == Event.event_type_id)
+        .where(Event.game_id == game_id, Event.elapsed_seconds.isnot(None))
+        .order_by(Event.elapsed_seconds, Event.id)
+    )
+    return (await db.execute(stmt)).all()
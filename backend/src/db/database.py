@@ -1,25 +1,155 @@
-from sqlalchemy import create_engine
+"""SQLAlchemy engine & session setup.
+
+The engine is built from an *engine profile* chosen through
+``settings.db_profile``:
+
+* ``sqlite`` – WAL journal, ``synchronous=NORMAL``, memory-mapped I/O, a
+  larger page cache and in-memory temp tables, applied on every connection.
+  ``check_same_thread`` is disabled because the pool hands connections to
+  FastAPI's worker threads.
+* ``postgres`` – a sized ``QueuePool`` with overflow, pre-ping, recycling and
+  a server-side ``statement_timeout``.
+* ``default`` – SQLAlchemy defaults, no tuning.
+
+``auto`` (the default) picks ``sqlite`` or ``postgres`` from the URL scheme.
+
+Two engines are created from the same URL and profile: a synchronous one for
+seeding and scripts (:data:`SessionLocal`) and an async one – aiosqlite or
+asyncpg – that backs the request-scoped :class:`AsyncSession` handed out by
+:func:`get_db`, so route handlers never block the event loop on I/O.
+"""
+
+from typing import AsyncIterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from ..settings.config import settings
 
-# SQLAlchemy engine & session setup
-engine = create_engine(
-    str(settings.database_url),
-    connect_args={
-        "check_same_thread": False if str(settings.database_url).startswith("sqlite") else False
-    },
-)
+
+def resolve_profile(url: str, profile: str = "auto") -> str:
+    """Return the concrete engine profile for *url*."""
+    if profile != "auto":
+        return profile
+    if url.startswith("sqlite"):
+        return "sqlite"
+    if url.startswith("postgres"):
+        return "postgres"
+    return "default"
+
+
+def _sqlite_pragmas() -> list[str]:
+    return [
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size={settings.sqlite_cache_size}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def apply_sqlite_pragmas(engine: Engine) -> None:
+    """Run the SQLite profile pragmas on every new DBAPI connection of *engine*."""
+    pragmas = _sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def pool_options() -> dict:
+    """Connection-pool keyword arguments of the PostgreSQL profile."""
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def create_db_engine(url: str, profile: str = "auto") -> Engine:
+    """Create a synchronous engine for *url* using the given engine profile."""
+    profile = resolve_profile(url, profile)
+
+    if profile == "sqlite":
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(engine)
+        return engine
+
+    if profile == "postgres":
+        connect_args = {}
+        if settings.db_statement_timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        return create_engine(url, connect_args=connect_args, **pool_options())
+
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(url, connect_args=connect_args)
+
+
+# Async drivers per backend – the sync URL may name its own driver
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """Return *url* rewritten to use the async driver of its backend."""
+    parsed = make_url(url.replace("postgres://", "postgresql://", 1))
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def create_async_db_engine(url: str, profile: str = "auto") -> AsyncEngine:
+    """Create an async engine for *url* using the given engine profile."""
+    profile = resolve_profile(url, profile)
+    url = async_url(url)
+
+    if profile == "sqlite":
+        engine = create_async_engine(url, connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(engine.sync_engine)
+        return engine
+
+    if profile == "postgres":
+        connect_args = {}
+        if settings.db_statement_timeout_ms:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings.db_statement_timeout_ms)
+            }
+        return create_async_engine(url, connect_args=connect_args, **pool_options())
+
+    return create_async_engine(url)
+
+
+engine = create_db_engine(str(settings.database_url), settings.db_profile)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine(str(settings.database_url), settings.db_profile)
+# Objects stay usable after commit so handlers can serialise what they wrote
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """FastAPI dependency that yields a database session per request."""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency that yields an async database session per request."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
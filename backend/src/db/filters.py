@@ -0,0 +1,145 @@
+"""Filters over the events table.
+
+:class:`EventFilter` describes which events a request asks for and
+:func:`filter_clauses` turns it into ``WHERE`` clauses on the events table.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from sqlalchemy import and_, case, false, or_, select
+
+from ..models import Event, EventType, Game, Player, Team
+from ..services import spatial
+from ..utils.clock import parse_clock
+
+
+# Named strength states, from the eventing team's point of view
+_STRENGTH_ALIASES = ("even", "powerplay", "shorthanded")
+
+
+@dataclass
+class EventFilter:
+    """Event selection shared by listings and aggregates.
+
+    Empty sequences and ``None`` bounds match everything.
+    """
+
+    game_ids: Sequence[int] = ()
+    events: Sequence[str] = ()
+    teams: Sequence[str] = ()
+    players: Sequence[str] = ()
+    periods: Sequence[int] = ()
+    # ``"5v4"`` (own skaters first) or one of :data:`_STRENGTH_ALIASES`
+    strengths: Sequence[str] = ()
+    # ``M:SS`` game-clock bounds (inclusive, in either order)
+    clock_from: str | None = None
+    clock_to: str | None = None
+    # Elapsed game-time window in seconds, ``[elapsed_from, elapsed_to)``
+    elapsed_from: int | None = None
+    elapsed_to: int | None = None
+    # Area the event's coordinates lie in (see ``services.spatial``)
+    area: spatial.Shape | None = None
+
+    @property
+    def needs_game(self) -> bool:
+        """Whether :func:`filter_clauses` refers to the joined ``games`` row."""
+        return bool(self.strengths)
+
+
+def strength_columns():
+    """``(own, opponent)`` skater counts from the eventing team's perspective.
+
+    Requires :class:`~..models.Game` to be joined.
+    """
+    is_home = Event.team_id == Game.home_team_id
+    own = case((is_home, Event.home_team_skaters), else_=Event.away_team_skaters)
+    opp = case((is_home, Event.away_team_skaters), else_=Event.home_team_skaters)
+    return own, opp
+
+
+def _strength_clause(strength: str, own, opp):
+    if strength == "even":
+        return own == opp
+    if strength == "powerplay":
+        return own > opp
+    if strength == "shorthanded":
+        return own < opp
+    try:
+        own_n, opp_n = (int(n) for n in strength.lower().split("v"))
+    except ValueError:
+        raise ValueError(
+            f"Invalid strength {strength!r}: expected e.g. '5v4' or one of "
+            f"{', '.join(_STRENGTH_ALIASES)}"
+        ) from None
+    return and_(own == own_n, opp == opp_n)
+
+
+def _clock_bound(value: str) -> int:
+    seconds = parse_clock(value)
+    if seconds is None:
+        raise ValueError(f"Invalid clock {value!r}: expected M:SS")
+    return seconds
+
+
+def filter_clauses(filters: EventFilter) -> list:
+    """``WHERE`` clauses for *filters*.
+
+    Strength filters need :class:`~..models.Game` joined (see
+    :attr:`EventFilter.needs_game`).  Raises :class:`ValueError` for an
+    invalid strength state or clock bound.
+    """
+    clauses = []
+    if filters.game_ids:
+        clauses.append(Event.game_id.in_(filters.game_ids))
+    if filters.events:
+        clauses.append(_name_clause(Event.event_type_id, EventType, filters.events))
+    if filters.teams:
+        clauses.append(_name_clause(Event.team_id, Team, filters.teams))
+    if filters.players:
+        clauses.append(_name_clause(Event.player_id, Player, filters.players))
+    if filters.periods:
+        clauses.append(Event.period.in_(filters.periods))
+    if filters.strengths:
+        own, opp = strength_columns()
+        clauses.append(or_(*(_strength_clause(s, own, opp) for s in filters.strengths)))
+    bounds = [_clock_bound(v) for v in (filters.clock_from, filters.clock_to) if v]
+    if bounds:
+        clauses.append(Event.clock_seconds.between(min(bounds), max(bounds)))
+    if filters.elapsed_from is not None:
+        clauses.append(Event.elapsed_seconds >= filters.elapsed_from)
+    if filters.elapsed_to is not None:
+        clauses.append(Event.elapsed_seconds < filters.elapsed_to)
+    if filters.area is not None:
+        clauses.append(_area_clause(filters.area))
+    return clauses
+
+
+def _name_clause(column, model, names: Sequence[str]):
+    # One name is compared as a scalar subquery, so the ``(column, id)``
+    # indexes return the events already in keyset order
+    if len(names) == 1:
+        return column == select(model.id).where(model.name == names[0]).scalar_subquery()
+    return column.in_(select(model.id).where(model.name.in_(names)))
+
+
+def _area_clause(area: spatial.Shape):
+    # Key ranges of the index narrow the candidates; the exact shape is then
+    # checked on the indexed coordinates
+    ranges = spatial.key_ranges(area)
+    if not ranges:
+        return false()
+    x, y = Event.x_coordinate, Event.y_coordinate
+    if isinstance(area, spatial.Circle):
+        exact = (x - area.x) * (x - area.x) + (y - area.y) * (y - area.y) <= area.radius**2
+    else:
+        exact = and_(x.between(area.x_min, area.x_max), y.between(area.y_min, area.y_max))
+    if spatial.coverage(ranges) > spatial.INDEX_MAX_SHARE:
+        return exact
+    cells = [
+        Event.spatial_cell == lo if lo == hi else Event.spatial_cell.between(lo, hi)
+        for lo, hi in ranges
+    ]
+    return and_(or_(*cells), exact)
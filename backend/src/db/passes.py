@@ -0,0 +1,57 @@
+"""Queries behind pass networks (see :mod:`src.services.pass_network`)."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud
+from ..models import Event, EventType
+
+
+async def edge_rows(db: AsyncSession, game_ids: Sequence[int]) -> Sequence[Row]:
+    """Completed passes of *game_ids* grouped by game, passer, receiver and team.
+
+    Rows are ``(game_id, passer, receiver, team, passes, starts, ends, x, y,
+    x2, y2)``: ``starts``/``ends`` count the passes with a located start/end
+    and the coordinate sums run over those passes only (see
+    :class:`~src.services.pass_network.PassEdges`).
+    """
+    key = (Event.game_id, Event.player_id, Event.player_2_id, Event.team_id)
+    start = and_(Event.x_coordinate.isnot(None), Event.y_coordinate.isnot(None))
+    end = and_(Event.x_coordinate_2.isnot(None), Event.y_coordinate_2.isnot(None))
+
+    def total(located, column):
+        return func.coalesce(func.sum(case((located, column))), 0)
+
+    stmt = (
+        select(
+            *key,
+            func.count(),
+            func.count(case((start, 1))),
+            func.count(case((end, 1))),
+            total(start, Event.x_coordinate),
+            total(start, Event.y_coordinate),
+            total(end, Event.x_coordinate_2),
+            total(end, Event.y_coordinate_2),
+        )
+        .where(
+            Event.game_id.in_(game_ids),
+            Event.event_type_id == crud.id_of(EventType, "Play"),
+            *(c.isnot(None) for c in key[1:]),
+        )
+        .group_by(*key)
+    )
+    return (await db.execute(stmt)).all()
+
+
+async def names_by_id(db: AsyncSession, model, ids) -> dict[int, str]:
+    """``{id: name}`` of the *model* rows with *ids*."""
+    ids = {int(i) for i in ids}
+    if not ids:
+        return {}
+    rows = await db.execute(select(model.id, model.name).where(model.id.in_(ids)))
+    return dict(rows.tuples().all())
@@ -0,0 +1,99 @@
+"""Stored possession sequences (see :mod:`src.services.possessions`).
+
+Possessions depend on the order of a game's events, so they are not patched
+with deltas: seeding recomputes every game in one pass (:func:`rebuild`) and
+event writes recompute the games they touch (:func:`refresh`), inside the
+transaction that changes the events.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from typing import Collection
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import Event, EventType, Possession, Team
+from ..services.possessions import EVENT_COLUMNS, segment
+
+
+def _events_frame(session: Session, game_ids: Collection[int] | None) -> pd.DataFrame:
+    stmt = (
+        select(
+            Event.game_id,
+            Event.id,
+            Event.period,
+            Event.elapsed_seconds,
+            Event.team_id,
+            EventType.name.label("event"),
+            Event.x_coordinate,
+        )
+        .outerjoin(EventType, EventType.id == Event.event_type_id)
+        .where(Event.game_id.isnot(None), Event.elapsed_seconds.isnot(None))
+        .order_by(Event.game_id, Event.elapsed_seconds, Event.id)
+    )
+    if game_ids is not None:
+        stmt = stmt.where(Event.game_id.in_(game_ids))
+    rows = session.execute(stmt).all()
+    # Column-wise conversion is several times faster than a frame of row tuples
+    columns = zip(*rows) if rows else [()] * len(EVENT_COLUMNS)
+    return pd.DataFrame(
+        {
+            name: np.array(values, dtype=object if name == "event" else None)
+            for name, values in zip(EVENT_COLUMNS, columns)
+        }
+    )
+
+
+def rebuild(session: Session, game_ids: Collection[int | None] | None = None) -> int:
+    """Recompute the possessions of *game_ids* (every game when ``None``).
+
+    Returns the number of possessions stored.
+    """
+    if game_ids is not None:
+        game_ids = [g for g in game_ids if g is not None]
+        if not game_ids:
+            return 0
+    table = Possession.__table__
+    stmt = delete(table)
+    if game_ids is not None:
+        stmt = stmt.where(table.c.game_id.in_(game_ids))
+    session.execute(stmt)
+
+    possessions = segment(_events_frame(session, game_ids))
+    if not possessions.empty:
+        # tolist() hands the DBAPI plain Python values (entry_zone keeps None)
+        columns = list(possessions.columns)
+        records = zip(*(possessions[c].tolist() for c in columns))
+        session.execute(insert(table), [dict(zip(columns, r)) for r in records])
+    return len(possessions)
+
+
+async def refresh(db: AsyncSession, game_ids: Collection[int | None]) -> None:
+    """Recompute the possessions of *game_ids* inside *db*'s transaction."""
+    # Sessions do not autoflush; pending event writes must be visible
+    await db.flush()
+    await db.run_sync(rebuild, list(game_ids))
+
+
+async def game_possessions(
+    db: AsyncSession, game_id: int, team: str | None = None
+) -> list[dict]:
+    """Possessions of one game in order, with team names."""
+    stmt = (
+        select(Possession, Team.name.label("team"))
+        .join(Team, Team.id == Possession.team_id)
+        .where(Possession.game_id == game_id)
+        .order_by(Possession.number)
+    )
+    if team:
+        stmt = stmt.where(Team.name == team)
+    columns = [c.name for c in Possession.__table__.c if c.name not in ("id", "team_id")]
+    return [
+        {c: getattr(p, c) for c in columns} | {"team": name}
+        for p, name in (await db.execute(stmt)).all()
+    ]
@@ -1,141 +1,208 @@
-"""Utility to reset (drop & recreate) the DB and seed it with the Olympic Women's dataset."""
+"""Seed the database with the Olympic Women's dataset.
 
+Two entry points are provided:
+
+* :func:`seed_db` – fingerprints every source CSV (size, mtime and SHA-256)
+  together with :data:`SCHEMA_VERSION` in the ``seed_metadata`` table and only
+  touches the database when something changed.  Unchanged files are detected
+  from their size/mtime without being read, so a warm start costs the same no
+  matter how large the dataset is.  When the dataset does change, only the
+  rows that were added or removed are applied; events created through the API
+  are never touched.
+* :func:`reset_and_seed_db` – drop & recreate every table and load everything
+  from scratch.
+"""
+
+import functools
 import random
 import logging
+import numpy as np
 import pandas as pd
 
+from collections import Counter
+
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Iterator
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    delete,
+    exists,
+    insert,
+    select,
+)
 from sqlalchemy.orm import Session
 
+from .crud import team_abbreviation
+from . import box_scores, possessions, versions, xg
 from .database import Base, SessionLocal, engine
-from ..models import Event, Team, Player, Game
+from .loader import LoadStats, load_events
+from ..models import Event, EventType, Team, Player, Game, SeedMetadata
+from ..services.columnar_cache import SourceFingerprint, load_cached
+from ..services.dataset_store import COLUMN_MAP, iter_csv_chunks, loaded_store
+from ..services.spatial import cell_keys
+from ..settings.config import settings
+from ..utils.clock import clock_seconds, elapsed_seconds
 
 # Get module-level logger
 logger = logging.getLogger(__name__)
 
 
-# Path to jersey numbers CSV (must have columns Player,Number). Typo fixed and fallbacks supported.
-PLAYER_INFO_CSV = (
-    Path(__file__).resolve().parents[2] / "data" / "womens_hockey_jersey_numbers.csv"
+# Bump whenever a model changes shape: a mismatch forces a full reset on the
+# next start because incremental updates cannot migrate existing tables.
+SCHEMA_VERSION = 13
+
+# Called with the running load statistics after every chunk of events
+ProgressCallback = Callable[[LoadStats], None]
+
+# ``seed_metadata.source`` keys
+EVENTS_SOURCE = "events"
+JERSEYS_SOURCE = "jersey_numbers"
+
+# Row hashes of the CSV being synchronised, tagged with the chunk they came
+# from.  Created per seeding run on the seeding connection only.
+_seen_hashes = Table(
+    "seed_row_hashes",
+    MetaData(),
+    Column("hash", BigInteger, index=True),
+    Column("chunk", Integer),
+    prefixes=["TEMPORARY"],
 )
+
 random.seed(42)
 
 
-def reset_and_seed_db() -> None:
-    """Drop existing tables, recreate them, and load data from CSV."""
+# ---------------------------------------------------------------------------
+# Source fingerprints
+# ---------------------------------------------------------------------------
 
-    # Drop & recreate schema
-    logger.info("Dropping existing database tables…")
-    Base.metadata.drop_all(bind=engine)
-    logger.info("Creating new database tables…")
-    Base.metadata.create_all(bind=engine)
 
-    # Load CSV
-    csv_path = (
-        Path(__file__).resolve().parents[2] / "data" / "olympic_womens_dataset.csv"
+def _record_fingerprint(session: Session, source: str, fp: SourceFingerprint) -> None:
+    session.merge(
+        SeedMetadata(
+            source=source,
+            sha256=fp.sha256,
+            size=fp.size,
+            mtime_ns=fp.mtime_ns,
+            schema_version=SCHEMA_VERSION,
+            seeded_at=datetime.now(timezone.utc),
+        )
+    )
+
+
+def _unchanged(
+    session: Session, source: str, fp: SourceFingerprint, meta: SeedMetadata | None
+) -> bool:
+    """Return True when *fp* matches the stored fingerprint for *source*.
+
+    The size/mtime comparison avoids reading the file at all.  If only the
+    mtime moved (e.g. a fresh checkout) but the content hash is identical, the
+    stored fingerprint is refreshed so the next start takes the fast path.
+    """
+    if fp.same_stat(meta):
+        return True
+    if meta is not None and meta.sha256 == fp.sha256:
+        _record_fingerprint(session, source, fp)
+        return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Source readers
+# ---------------------------------------------------------------------------
+
+
+def _row_hashes(df: pd.DataFrame, occurrences: Counter | None = None) -> pd.Series:
+    """Return a signed 64-bit content hash for every row of *df*.
+
+    Identical rows are disambiguated by their occurrence number so duplicates
+    in the CSV map to distinct events.  When *df* is one chunk of a file,
+    *occurrences* carries the content hashes of the earlier chunks and is
+    updated in place, so duplicates are numbered across the whole file.
+    """
+    row_hash = pd.util.hash_pandas_object(df[list(COLUMN_MAP.values())], index=False)
+    occurrence = row_hash.groupby(row_hash).cumcount()
+    if occurrences is not None:
+        hashes = row_hash.tolist()
+        occurrence += np.fromiter(
+            (occurrences.get(h, 0) for h in hashes), dtype=np.int64, count=len(hashes)
+        )
+        occurrences.update(hashes)
+    combined = pd.util.hash_pandas_object(
+        pd.DataFrame({"hash": row_hash, "occurrence": occurrence}), index=False
     )
-    logger.info("Loading CSV data from %s", csv_path)
+    return pd.Series(combined.to_numpy().view("int64"), index=df.index)
+
+
+def _read_jersey_csv(csv_path: Path) -> pd.DataFrame:
+    return pd.read_csv(csv_path).rename(columns=lambda col: col.strip())
+
+
+def _load_jersey_numbers(csv_path: Path) -> dict[str, int]:
+    """Return a lower-cased player name → jersey number mapping."""
     if not csv_path.exists():
-        raise FileNotFoundError(f"Dataset file not found at {csv_path}")
-    df = pd.read_csv(csv_path)
-
-    # Rename columns to snake_case to match model fields
-    df = df.rename(
-        columns={
-            "Game Date": "game_date",
-            "Home Team": "home_team",
-            "Away Team": "away_team",
-            "Period": "period",
-            "Clock": "clock",
-            "Home Team Skaters": "home_team_skaters",
-            "Away Team Skaters": "away_team_skaters",
-            "Home Team Goals": "home_team_goals",
-            "Away Team Goals": "away_team_goals",
-            "Team": "team",
-            "Player": "player",
-            "Event": "event",
-            "X Coordinate": "x_coordinate",
-            "Y Coordinate": "y_coordinate",
-            "Detail 1": "detail_1",
-            "Detail 2": "detail_2",
-            "Detail 3": "detail_3",
-            "Detail 4": "detail_4",
-            "Player 2": "player_2",
-            "X Coordinate 2": "x_coordinate_2",
-            "Y Coordinate 2": "y_coordinate_2",
-        }
+        return {}
+    try:
+        pi_df = load_cached(csv_path, _read_jersey_csv, version="1")
+    except Exception as exc:
+        logger.warning("Failed to read jersey numbers CSV: %s", exc)
+        return {}
+
+    # allow either Number or Jersey Number column naming
+    num_col = next(
+        (c for c in ["Number", "Jersey Number", "Jersey"] if c in pi_df.columns), None
     )
+    if num_col is None or "Player" not in pi_df.columns:
+        return {}
 
-    # Fill NaNs with None for SQLAlchemy compatibility
-    df = df.where(pd.notna(df), None)
+    pi_df = pi_df.dropna(subset=[num_col])
+    names = pi_df["Player"].astype(str).str.strip().str.lower()
+    return dict(zip(names, pi_df[num_col].astype(int)))
 
-    # ---------------------------------------------------------------------
-    # Prepare Teams, Players, Games, Events
-    # ---------------------------------------------------------------------
 
-    # Unique teams from home/away/team columns
+# ---------------------------------------------------------------------------
+# Dimension tables
+# ---------------------------------------------------------------------------
+
+
+def _ensure_teams(session: Session, df: pd.DataFrame) -> None:
+    """Insert any team named in *df* that is not yet in the ``teams`` table."""
     team_series = pd.concat([df["home_team"], df["away_team"], df["team"]])
-    unique_team_names = team_series.dropna().unique()
-
-    used_abbr: set[str] = set()
-
-    def _abbr(name: str) -> str:
-        # Take last segment after '-' to avoid prefix like 'Olympic (Women) - '
-        seg = name.split("-")[-1].strip()
-        letters = "".join(ch for ch in seg if ch.isalpha())
-        if len(letters) >= 3:
-            base = letters[:3].upper()
-        else:
-            base = (letters.upper() + "XXX")[:3]
-        abbr = base
-        # Ensure uniqueness
-        i = 1
-        while abbr in used_abbr:
-            if len(base) == 3 and i < 10:
-                abbr = base[:2] + str(i)
-            else:
-                abbr = (base + chr(64 + i))[:3]
-            i += 1
-        used_abbr.add(abbr)
-        return abbr
-
-    teams = [Team(name=name, abbreviation=_abbr(name)) for name in unique_team_names]
-    logger.info("Prepared %d teams for bulk insert", len(teams))
-
-    # -----------------------------
-    # Unique players (strip & dedup)
-    # -----------------------------
+    existing = set(session.execute(select(Team.name)).scalars())
+    new_names = [n for n in team_series.dropna().unique() if n not in existing]
+    if not new_names:
+        return
+
+    used_abbr: set[str] = set(session.execute(select(Team.abbreviation)).scalars())
+    teams = [
+        Team(name=name, abbreviation=team_abbreviation(name, used_abbr))
+        for name in new_names
+    ]
+    session.bulk_save_objects(teams)
+    logger.info("Inserted %d teams", len(teams))
+
+
+def _ensure_players(session: Session, df: pd.DataFrame, number_lookup: dict[str, int]) -> None:
+    """Insert any player named in *df* that is not yet in the ``players`` table."""
     player_series = pd.concat([df["player"], df["player_2"]])
     # Remove null/None then strip whitespace
     cleaned_names = player_series.dropna().map(lambda x: str(x).strip())
     # Remove empty strings
     cleaned_names = cleaned_names[cleaned_names != ""]
 
-    unique_player_names = sorted(cleaned_names.unique())
-
-    number_lookup: dict[str, int] = {}
-    if PLAYER_INFO_CSV.exists():
-        try:
-            pi_df = pd.read_csv(PLAYER_INFO_CSV)
-            # allow either Number or Jersey Number column naming
-            num_col = None
-            for c in ["Number", "Jersey Number", "Jersey"]:
-                if c in pi_df.columns:
-                    num_col = c
-                    break
-            if num_col and "Player" in pi_df.columns:
-                # Use iterrows instead of itertuples to keep the original column names
-                # (itertuples sanitises names like "Jersey Number" → "Jersey_Number")
-                pi_df = pi_df.rename(columns=lambda col: col.strip())
-                for _, csv_row in pi_df.iterrows():
-                    player_name = str(csv_row["Player"]).strip().lower()
-                    number_val = csv_row[num_col]
-                    if pd.notna(number_val):
-                        number_lookup[player_name] = int(number_val)
-        except Exception as exc:
-            logger.warning("Failed to read jersey numbers CSV: %s", exc)
+    existing = set(session.execute(select(Player.name)).scalars())
+    new_names = sorted(n for n in cleaned_names.unique() if n not in existing)
+    if not new_names:
+        return
 
     assigned_numbers: set[int] = set(number_lookup.values())
+    assigned_numbers.update(
+        n for n in session.execute(select(Player.number)).scalars() if n is not None
+    )
 
     def _random_unused() -> int:
         for _ in range(200):
@@ -150,32 +217,303 @@ def reset_and_seed_db() -> None:
             name=name,
             number=number_lookup.get(name.lower()) or _random_unused(),
         )
-        for name in unique_player_names
+        for name in new_names
     ]
-    logger.info(
-        "Prepared %d players for bulk insert (with jersey numbers)", len(players)
-    )
+    session.bulk_save_objects(players)
+    logger.info("Inserted %d players (with jersey numbers)", len(players))
+
 
-    # Unique games based on date + teams
+def _ensure_event_types(session: Session, df: pd.DataFrame) -> None:
+    """Insert any event name in *df* that is not yet in ``event_types``."""
+    existing = set(session.execute(select(EventType.name)).scalars())
+    new_names = sorted(n for n in df["event"].dropna().unique() if n not in existing)
+    if new_names:
+        session.bulk_save_objects([EventType(name=name) for name in new_names])
+        logger.info("Inserted %d event types", len(new_names))
+
+
+def _name_ids(session: Session, model) -> dict[str, int]:
+    """Return the ``name → id`` mapping of a dictionary table."""
+    return dict(session.execute(select(model.name, model.id)).tuples().all())
+
+
+def _ensure_games(session: Session, df: pd.DataFrame) -> None:
+    """Insert any (date, home, away) game in *df* that is not yet stored."""
+    existing = set(
+        session.execute(select(Game.game_date, Game.home_team, Game.away_team)).tuples()
+    )
+    team_ids = _name_ids(session, Team)
     unique_games_df = df[["game_date", "home_team", "away_team"]].drop_duplicates()
     games = [
-        Game(game_date=row.game_date, home_team=row.home_team, away_team=row.away_team)
+        Game(
+            game_date=row.game_date,
+            home_team=row.home_team,
+            away_team=row.away_team,
+            home_team_id=team_ids.get(row.home_team),
+            away_team_id=team_ids.get(row.away_team),
+        )
         for row in unique_games_df.itertuples(index=False)
+        if tuple(row) not in existing
     ]
-    logger.info("Prepared %d games for bulk insert", len(games))
+    if games:
+        session.bulk_save_objects(games)
+        logger.info("Inserted %d games", len(games))
+
+
+def _game_ids(session: Session, df: pd.DataFrame) -> pd.Series:
+    """Return the ``games.id`` of every row of *df*, aligned to its index."""
+    key = ["game_date", "home_team", "away_team"]
+    games = pd.DataFrame(
+        session.execute(select(Game.id, *(getattr(Game, c) for c in key))).all(),
+        columns=["game_id", *key],
+    )
+    merged = df[key].merge(games, how="left", on=key)
+    return pd.Series(merged["game_id"].to_numpy(), index=df.index, dtype="Int64")
+
+
+def _encode_chunk(session: Session, chunk: pd.DataFrame) -> pd.DataFrame:
+    """Replace the name columns of *chunk* with dictionary foreign keys.
+
+    Returns only the columns that exist on the ``events`` table.
+    """
+    player_ids = _name_ids(session, Player)
+
+    def _players(col: pd.Series) -> pd.Series:
+        return col.astype("string").str.strip().map(player_ids).astype("Int64")
+
+    seconds_left = clock_seconds(chunk["clock"])
+    encoded = chunk.assign(
+        game_id=_game_ids(session, chunk),
+        clock_seconds=seconds_left,
+        elapsed_seconds=elapsed_seconds(chunk["period"], seconds_left),
+        spatial_cell=cell_keys(chunk["x_coordinate"], chunk["y_coordinate"]),
+        team_id=chunk["team"].map(_name_ids(session, Team)).astype("Int64"),
+        event_type_id=chunk["event"].map(_name_ids(session, EventType)).astype("Int64"),
+        player_id=_players(chunk["player"]),
+        player_2_id=_players(chunk["player_2"]),
+    )
+    return encoded[[c for c in encoded.columns if c in Event.__table__.c]]
+
+
+# ---------------------------------------------------------------------------
+# Source synchronisation
+# ---------------------------------------------------------------------------
+
+
+def _dataset_chunks(csv_path: Path) -> Iterator[pd.DataFrame]:
+    """The dataset in ``settings.seed_chunk_size`` chunks.
+
+    Slices the shared store when it is already in memory; otherwise the CSV
+    is parsed one chunk at a time, so memory stays bounded by the chunk size.
+    """
+    store = loaded_store()
+    if store is not None:
+        return store.iter_chunks(settings.seed_chunk_size)
+    return iter_csv_chunks(csv_path, settings.seed_chunk_size)
+
+
+def _sync_events(
+    session: Session,
+    meta: SeedMetadata | None,
+    number_lookup: Callable[[], dict[str, int]],
+    *,
+    full: bool = False,
+    progress: ProgressCallback | None = None,
+) -> bool:
+    """Bring the seeded events in line with the dataset CSV.
+
+    The dataset is read and written in ``settings.seed_chunk_size`` chunks
+    (see :func:`_dataset_chunks`) through :func:`~.loader.load_events`.
+    Rows are matched on :func:`_row_hashes`: CSV rows whose hash is not yet
+    in the database are inserted, seeded events whose hash no longer appears
+    in the CSV are deleted afterwards, everything else is left alone.  The
+    hashes seen so far live in a temporary table, so the diff is done by the
+    database rather than in Python.  *full* skips the diff when the events
+    table is known to be empty; *progress* is forwarded to the loader.
+    Returns whether anything was applied.
+    """
+    csv_path = Path(settings.dataset_csv)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Dataset file not found at {csv_path}")
+
+    fp = SourceFingerprint.of(csv_path)
+    if _unchanged(session, EVENTS_SOURCE, fp, meta):
+        logger.info("Dataset %s unchanged – skipping event seeding", csv_path.name)
+        return False
+
+    conn = session.connection()
+    if not full:
+        _seen_hashes.create(conn)
+
+    def _fresh_chunks() -> Iterator[pd.DataFrame]:
+        occurrences: Counter = Counter()
+        for chunk_no, chunk in enumerate(_dataset_chunks(csv_path)):
+            chunk = chunk.assign(source_row_hash=_row_hashes(chunk, occurrences))
+            if not full:
+                conn.execute(
+                    insert(_seen_hashes),
+                    [
+                        {"hash": h, "chunk": chunk_no}
+                        for h in chunk["source_row_hash"].tolist()
+                    ],
+                )
+                existing = set(
+                    conn.execute(
+                        select(Event.source_row_hash).join(
+                            _seen_hashes,
+                            (_seen_hashes.c.hash == Event.source_row_hash)
+                            & (_seen_hashes.c.chunk == chunk_no),
+                        )
+                    ).scalars()
+                )
+                chunk = chunk.loc[~chunk["source_row_hash"].isin(existing)]
+
+            # Prepare Teams, Players, Event types, Games referenced by this chunk
+            _ensure_teams(session, chunk)
+            _ensure_players(session, chunk, number_lookup())
+            _ensure_event_types(session, chunk)
+            _ensure_games(session, chunk)
+            session.flush()
+            yield _encode_chunk(session, chunk)
+
+    stats = load_events(conn, _fresh_chunks(), progress)
+
+    removed = 0
+    if not full:
+        removed = conn.execute(
+            delete(Event).where(
+                Event.source_row_hash.isnot(None),
+                ~exists().where(_seen_hashes.c.hash == Event.source_row_hash),
+            )
+        ).rowcount
+        _seen_hashes.drop(conn)
+
+    _record_fingerprint(session, EVENTS_SOURCE, fp)
+    logger.info(
+        "Applied dataset changes: %d events inserted, %d removed",
+        stats.rows,
+        removed,
+    )
+    return True
+
+
+def _sync_jersey_numbers(
+    session: Session,
+    meta: SeedMetadata | None,
+    number_lookup: Callable[[], dict[str, int]],
+) -> bool:
+    """Re-apply jersey numbers to existing players when the jersey CSV changed.
+
+    Returns whether the CSV was applied.
+    """
+    csv_path = Path(settings.jersey_numbers_csv)
+    if not csv_path.exists():
+        return False
+
+    fp = SourceFingerprint.of(csv_path)
+    if _unchanged(session, JERSEYS_SOURCE, fp, meta):
+        return False
+
+    lookup = number_lookup()
+    updated = 0
+    for player in session.query(Player).all():
+        number = lookup.get(player.name.lower())
+        if number is not None and player.number != number:
+            player.number = number
+            updated += 1
+
+    _record_fingerprint(session, JERSEYS_SOURCE, fp)
+    logger.info("Applied jersey numbers: %d players updated", updated)
+    return True
 
-    # Events (one per row)
-    records = df.to_dict(orient="records")
-    events = [Event(**record) for record in records]
-    logger.info("Prepared %d events for bulk insert", len(events))
+
+def _sync_all(
+    session: Session,
+    meta: dict[str, SeedMetadata],
+    *,
+    full: bool = False,
+    progress: ProgressCallback | None = None,
+) -> None:
+    # The jersey CSV is only parsed if one of the sources actually changed
+    number_lookup = functools.cache(
+        lambda: _load_jersey_numbers(Path(settings.jersey_numbers_csv))
+    )
+    if _sync_events(
+        session, meta.get(EVENTS_SOURCE), number_lookup, full=full, progress=progress
+    ):
+        # Box scores sum the shots' xG, so shots are scored first
+        xg.rebuild(session)
+        box_scores.rebuild(session)
+        possessions.rebuild(session)
+        # Which games a dataset change touched is not tracked; bump them all
+        game_ids = session.execute(select(Game.id)).scalars()
+        versions.touch(
+            session,
+            versions.GAMES,
+            versions.EVENT_TYPES,
+            versions.PLAYERS,
+            *map(versions.game_scope, game_ids),
+        )
+    if _sync_jersey_numbers(session, meta.get(JERSEYS_SOURCE), number_lookup):
+        versions.touch(session, versions.PLAYERS)
+    versions.bump(session)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def reset_and_seed_db(progress: ProgressCallback | None = None) -> None:
+    """Drop existing tables, recreate them, and load data from CSV."""
+
+    # Drop & recreate schema
+    logger.info("Dropping existing database tables…")
+    Base.metadata.drop_all(bind=engine)
+    logger.info("Creating new database tables…")
+    Base.metadata.create_all(bind=engine)
 
     session: Session = SessionLocal()
     try:
-        # Insert in logical order to respect potential future FKs
-        session.bulk_save_objects(teams)
-        session.bulk_save_objects(players)
-        session.bulk_save_objects(games)
-        session.bulk_save_objects(events)
+        _sync_all(session, {}, full=True, progress=progress)
+        session.commit()
+        logger.info("Database seeding complete")
+    finally:
+        session.close()
+
+
+def seed_db(mode: str | None = None, progress: ProgressCallback | None = None) -> None:
+    """Seed the database according to *mode* (defaults to ``settings.seed_mode``).
+
+    ``incremental`` falls back to a full reset when the database has never
+    been seeded or was seeded with a different :data:`SCHEMA_VERSION`.
+    *progress* is called with the running :class:`~.loader.LoadStats` after
+    every chunk of events loaded.
+    """
+    mode = mode or settings.seed_mode
+    if mode == "skip":
+        logger.info("Seeding disabled (SEED_MODE=skip)")
+        return
+    if mode == "reset":
+        reset_and_seed_db(progress)
+        return
+
+    # Creates missing tables only – existing data is preserved
+    Base.metadata.create_all(bind=engine)
+
+    session: Session = SessionLocal()
+    try:
+        meta = {m.source: m for m in session.query(SeedMetadata).all()}
+        if not meta or any(m.schema_version != SCHEMA_VERSION for m in meta.values()):
+            logger.info(
+                "Database not seeded with schema v%d – performing full reset",
+                SCHEMA_VERSION,
+            )
+            session.close()
+            reset_and_seed_db(progress)
+            return
+
+        _sync_all(session, meta, progress=progress)
         session.commit()
         logger.info("Database seeding complete")
     finally:
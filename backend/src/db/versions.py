@@ -0,0 +1,102 @@
+"""Data-version counters behind HTTP conditional caching.
+
+Every cacheable *scope* – one per game (:func:`game_scope`) plus the global
+collections :data:`GAMES`, :data:`EVENT_TYPES` and :data:`PLAYERS` – has a
+counter in the ``data_versions`` table.  Writers :func:`touch` the scopes
+they change and :func:`flush` them inside the same transaction, so a
+version moves exactly when the data it covers is committed.  Readers turn the
+versions of the scopes a response depends on into an ETag.
+
+A new counter starts at the current time in milliseconds rather than 1, so
+versions keep increasing across a full database reset and an ETag issued
+before the reset can never match data loaded after it.
+"""
+
+from __future__ import annotations
+
+import time
+
+from typing import Iterable
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import DataVersion
+
+# Global collections
+GAMES = "games"
+EVENT_TYPES = "event_types"
+PLAYERS = "players"
+
+# ``Session.info`` key holding the scopes touched in the current transaction
+_TOUCHED = "touched_data_scopes"
+
+
+def game_scope(game_id: int) -> str:
+    """Scope covering everything derived from the events of one game."""
+    return f"game:{game_id}"
+
+
+def touch(session: Session | AsyncSession, *scopes: str | None) -> None:
+    """Mark *scopes* as changed by the session's current transaction."""
+    session.info.setdefault(_TOUCHED, set()).update(s for s in scopes if s)
+
+
+def _bump(session: Session, scopes: list[str]) -> None:
+    table = DataVersion.__table__
+    initial = time.time_ns() // 1_000_000
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert(table).values([{"scope": s, "version": initial} for s in scopes])
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.scope], set_={"version": table.c.version + 1}
+            )
+        )
+        return
+    # Generic fallback: update existing counters, then create the missing ones
+    session.execute(
+        update(table).where(table.c.scope.in_(scopes)).values(version=table.c.version + 1)
+    )
+    existing = set(session.execute(select(table.c.scope).where(table.c.scope.in_(scopes))).scalars())
+    missing = [{"scope": s, "version": initial} for s in scopes if s not in existing]
+    if missing:
+        session.execute(table.insert(), missing)
+
+
+def bump(session: Session, scopes: Iterable[str] = ()) -> None:
+    """Increment the counters of *scopes* and of every touched scope now."""
+    scopes = sorted(set(scopes) | session.info.pop(_TOUCHED, set()))
+    if scopes:
+        _bump(session, scopes)
+
+
+async def flush(db: AsyncSession) -> list[str]:
+    """Increment the counters of every scope touched since the last flush.
+
+    Call before committing the transaction that changed the data.  Returns
+    the bumped scopes.
+    """
+    scopes = sorted(db.info.pop(_TOUCHED, set()))
+    if scopes:
+        await db.run_sync(_bump, scopes)
+    return scopes
+
+
+async def game_versions(db: AsyncSession, game_ids: Iterable[int]) -> dict[int, int]:
+    """Return the :func:`game_scope` counter of every game in *game_ids*."""
+    scopes = {game_id: game_scope(game_id) for game_id in game_ids}
+    current = await get_versions(db, scopes.values())
+    return {game_id: current[scope] for game_id, scope in scopes.items()}
+
+
+async def get_versions(db: AsyncSession, scopes: Iterable[str]) -> dict[str, int]:
+    """Return the counter of every scope in *scopes* (0 if never bumped)."""
+    scopes = list(scopes)
+    rows = await db.execute(
+        select(DataVersion.scope, DataVersion.version).where(DataVersion.scope.in_(scopes))
+    )
+    found = dict(rows.tuples().all())
+    return {s: found.get(s, 0) for s in scopes}
@@ -0,0 +1,102 @@
+"""Stored expected-goals values of shots (see :mod:`src.services.xg`).
+
+``events.xg`` holds the goal probability of every shot and goal; other
+events keep ``NULL``.  Seeding retrains the model on every shot in the
+database, persists it and scores all shots in one batch (:func:`rebuild`).
+Event writes score the events they create or change with the persisted
+model (:func:`refresh`), so reads never run inference.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from typing import Collection
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import Event, EventType, Game
+from ..services import xg
+from ..services.xg import SHOT_COLUMNS, SHOT_EVENTS
+from .filters import strength_columns
+
+
+def _shots_frame(session: Session, event_ids: Collection[int] | None) -> pd.DataFrame:
+    own, opp = strength_columns()
+    stmt = (
+        select(
+            Event.id,
+            EventType.name.label("event"),
+            Event.x_coordinate,
+            Event.y_coordinate,
+            Event.detail_1,
+            Event.detail_3,
+            Event.detail_4,
+            own.label("own_skaters"),
+            opp.label("opp_skaters"),
+        )
+        .join(EventType, EventType.id == Event.event_type_id)
+        .outerjoin(Game, Game.id == Event.game_id)
+        .where(EventType.name.in_(SHOT_EVENTS))
+    )
+    if event_ids is not None:
+        stmt = stmt.where(Event.id.in_(event_ids))
+    return pd.DataFrame(
+        session.execute(stmt).all(), columns=["id", "event", *SHOT_COLUMNS]
+    )
+
+
+def _scores(shots: pd.DataFrame, model: xg.XGModel | None) -> dict[int, float | None]:
+    values = xg.score(model, shots)
+    return {
+        int(i): None if np.isnan(v) else float(v) for i, v in zip(shots["id"], values)
+    }
+
+
+def _store(session: Session, scores: dict[int, float | None]) -> None:
+    if not scores:
+        return
+    table = Event.__table__
+    session.execute(
+        update(table).where(table.c.id == bindparam("b_id")).values(xg=bindparam("b_xg")),
+        [{"b_id": i, "b_xg": v} for i, v in scores.items()],
+    )
+
+
+def rebuild(session: Session) -> xg.XGModel | None:
+    """Retrain on every shot, persist the model and rescore all shots.
+
+    Without enough goals to train on, the persisted model (if any) is kept
+    and used for scoring.  Returns the model the shots were scored with.
+    """
+    shots = _shots_frame(session, None)
+    model = xg.train(shots, shots["event"] == "Goal")
+    if model is not None:
+        xg.save(model)
+    else:
+        model = xg.get_model()
+    session.execute(update(Event).where(Event.xg.isnot(None)).values(xg=None))
+    _store(session, _scores(shots, model))
+    return model
+
+
+def _refresh(session: Session, event_ids: list[int]) -> dict[int, float | None]:
+    scores: dict[int, float | None] = dict.fromkeys(event_ids)
+    scores.update(_scores(_shots_frame(session, event_ids), xg.get_model()))
+    _store(session, scores)
+    return scores
+
+
+async def refresh(db: AsyncSession, event_ids: Collection[int]) -> dict[int, float | None]:
+    """Score *event_ids* inside *db*'s transaction and return ``{id: xg}``.
+
+    Events that are not shots (any more) get ``None``.
+    """
+    event_ids = list(event_ids)
+    if not event_ids:
+        return {}
+    await db.flush()
+    return await db.run_sync(_refresh, event_ids)
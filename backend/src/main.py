@@ -10,6 +10,7 @@ from .routes.games import router as games_router
 from .routes.events import router as events_router
 from .routes.players import router as players_router
 
+from .core.compression import CompressionMiddleware
 from .core.startup import lifespan
 
 
@@ -35,6 +36,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        zstd_level=settings.compression_zstd_level,
+    )
+
 # Register all routers
 app.include_router(chat_router)
 app.include_router(misc_router)
@@ -2,10 +2,21 @@ from .event import Event
 from .team import Team
 from .player import Player
 from .game import Game
+from .event_type import EventType
+from .seed_metadata import SeedMetadata
+from .data_version import DataVersion
+from .box_score import PlayerGameStats, TeamGameStats
+from .possession import Possession
 
 __all__ = [
     "Event",
     "Team",
     "Player",
     "Game",
+    "EventType",
+    "SeedMetadata",
+    "DataVersion",
+    "TeamGameStats",
+    "PlayerGameStats",
+    "Possession",
 ]
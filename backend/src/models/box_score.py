@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer
+
+from ..db.database import Base
+
+
+class _StatLine:
+    """Counter columns shared by both box-score tables.
+
+    Which event types feed each counter is defined in
+    :data:`src.db.box_scores.STAT_EVENTS`.
+    """
+
+    events = Column(Integer, nullable=False, default=0)
+    shots = Column(Integer, nullable=False, default=0)
+    goals = Column(Integer, nullable=False, default=0)
+    faceoff_wins = Column(Integer, nullable=False, default=0)
+    takeaways = Column(Integer, nullable=False, default=0)
+    puck_recoveries = Column(Integer, nullable=False, default=0)
+    passes = Column(Integer, nullable=False, default=0)
+    completed_passes = Column(Integer, nullable=False, default=0)
+    zone_entries = Column(Integer, nullable=False, default=0)
+    dump_ins = Column(Integer, nullable=False, default=0)
+    penalties = Column(Integer, nullable=False, default=0)
+    # Summed expected goals of the shots counted in ``shots``
+    xg = Column(Float, nullable=False, default=0)
+
+
+class TeamGameStats(_StatLine, Base):
+    """Box score of one team in one game, materialised from its events."""
+
+    __tablename__ = "team_game_stats"
+
+    game_id = Column(Integer, ForeignKey("games.id"), primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
+
+
+class PlayerGameStats(_StatLine, Base):
+    """Box score of one player (as primary player of events) in one game."""
+
+    __tablename__ = "player_game_stats"
+    __table_args__ = (Index("ix_player_game_stats_player", "player_id"),)
+
+    game_id = Column(Integer, ForeignKey("games.id"), primary_key=True)
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), primary_key=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, String
+
+from ..db.database import Base
+
+
+class DataVersion(Base):
+    """Change counter of one cacheable scope (a game or a global collection).
+
+    See :mod:`src.db.versions` for the scope names and how they are bumped.
+    """
+
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False)
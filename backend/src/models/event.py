@@ -1,30 +1,96 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+)
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import relationship
 
 from ..db.database import Base
 
 
 class Event(Base):
+    """A single tagged event.
+
+    Team, player and event-type names are dictionary-encoded as small integer
+    foreign keys; the game date and teams come from the owning :class:`Game`.
+    The original string attributes are exposed as read-only proxies so the
+    API schemas (``from_attributes``) keep serialising the same JSON.
+    """
+
     __tablename__ = "events"
+    __table_args__ = (
+        # Per-game lookups are range scans on these; both lead with game_id so
+        # they also serve plain ``game_id = ?`` filters.
+        Index("ix_events_game_event_type", "game_id", "event_type_id"),
+        Index("ix_events_game_team", "game_id", "team_id"),
+        # Timeline windows: ``game_id = ? AND elapsed_seconds BETWEEN …``
+        Index("ix_events_game_elapsed", "game_id", "elapsed_seconds"),
+        # Keyset pages of /events filtered by player, team or event type but
+        # not by game: the matching events are read in id order
+        Index("ix_events_player", "player_id", "id"),
+        Index("ix_events_team", "team_id", "id"),
+        Index("ix_events_event_type", "event_type_id", "id"),
+        # Spatial queries scan key ranges of this; coordinates and type are
+        # included so candidates are checked without reading the rows
+        Index(
+            "ix_events_spatial",
+            "spatial_cell",
+            "event_type_id",
+            "x_coordinate",
+            "y_coordinate",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    game_date = Column(String)
-    home_team = Column(String)
-    away_team = Column(String)
+    game_id = Column(Integer, ForeignKey("games.id"), nullable=True)
     period = Column(Integer)
     clock = Column(String)
+    # ``clock`` as seconds left in the period, for range filters
+    clock_seconds = Column(SmallInteger, nullable=True)
+    # Game seconds since the opening face-off (see ``utils.clock``)
+    elapsed_seconds = Column(Integer, nullable=True)
     home_team_skaters = Column(Integer)
     away_team_skaters = Column(Integer)
     home_team_goals = Column(Integer)
     away_team_goals = Column(Integer)
-    team = Column(String)
-    player = Column(String)
-    event = Column(String)
+    team_id = Column(Integer, ForeignKey("teams.id"))
+    player_id = Column(Integer, ForeignKey("players.id"))
+    event_type_id = Column(SmallInteger, ForeignKey("event_types.id"))
     x_coordinate = Column(Integer, nullable=True)
     y_coordinate = Column(Integer, nullable=True)
+    # Z-order key of the coordinates' grid cell (see ``services.spatial``)
+    spatial_cell = Column(SmallInteger, nullable=True)
     detail_1 = Column(String, nullable=True)
     detail_2 = Column(String, nullable=True)
     detail_3 = Column(String, nullable=True)
     detail_4 = Column(String, nullable=True)
-    player_2 = Column(String, nullable=True)
+    player_2_id = Column(Integer, ForeignKey("players.id"), nullable=True)
     x_coordinate_2 = Column(Integer, nullable=True)
-    y_coordinate_2 = Column(Integer, nullable=True) 
\ No newline at end of file
+    y_coordinate_2 = Column(Integer, nullable=True)
+    # Expected-goals probability of shots and goals (see ``services.xg``)
+    xg = Column(Float, nullable=True)
+
+    # Hash of the source CSV row this event was seeded from; NULL for events
+    # created through the API so incremental re-seeding never touches them.
+    source_row_hash = Column(BigInteger, nullable=True, index=True)
+
+    # Dimension rows are joined in when events are loaded through the ORM
+    game = relationship("Game", lazy="joined")
+    team_ref = relationship("Team", lazy="joined")
+    player_ref = relationship("Player", foreign_keys=[player_id], lazy="joined")
+    player_2_ref = relationship("Player", foreign_keys=[player_2_id], lazy="joined")
+    event_type = relationship("EventType", lazy="joined")
+
+    game_date = association_proxy("game", "game_date")
+    home_team = association_proxy("game", "home_team")
+    away_team = association_proxy("game", "away_team")
+    team = association_proxy("team_ref", "name")
+    player = association_proxy("player_ref", "name")
+    player_2 = association_proxy("player_2_ref", "name")
+    event = association_proxy("event_type", "name")
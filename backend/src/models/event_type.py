@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, SmallInteger, String
+
+from ..db.database import Base
+
+
+class EventType(Base):
+    __tablename__ = "event_types"
+
+    # SQLite only auto-increments an ``INTEGER PRIMARY KEY``
+    id = Column(
+        SmallInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    name = Column(String, unique=True, nullable=False)
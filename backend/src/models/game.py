@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, ForeignKey, Integer, String, UniqueConstraint
 
 from ..db.database import Base
 
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        UniqueConstraint("game_date", "home_team", "away_team", name="uq_games_key"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     game_date = Column(String)
     home_team = Column(String)
-    away_team = Column(String) 
\ No newline at end of file
+    away_team = Column(String)
+    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    away_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
@@ -0,0 +1,33 @@
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+
+from ..db.database import Base
+
+
+class Possession(Base):
+    """One possession sequence of a game, derived from its events.
+
+    Rows are recomputed from the events by :mod:`src.db.possessions`; see
+    :mod:`src.services.possessions` for how sequences are segmented.
+    """
+
+    __tablename__ = "possessions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    game_id = Column(Integer, ForeignKey("games.id"), nullable=False, index=True)
+    # 1-based position within the game
+    number = Column(Integer, nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    period = Column(Integer, nullable=False)
+    start_event_id = Column(Integer, nullable=False)
+    end_event_id = Column(Integer, nullable=False)
+    # Elapsed game seconds
+    start_elapsed = Column(Integer, nullable=False)
+    end_elapsed = Column(Integer, nullable=False)
+    duration = Column(Integer, nullable=False)
+    events = Column(Integer, nullable=False)
+    passes = Column(Integer, nullable=False)
+    shots = Column(Integer, nullable=False)
+    # Zone of the first event: ``defensive``/``neutral``/``offensive``
+    entry_zone = Column(String, nullable=True)
+    ended_in_shot = Column(Boolean, nullable=False)
+    goal = Column(Boolean, nullable=False)
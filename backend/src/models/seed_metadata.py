@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from ..db.database import Base
+
+
+class SeedMetadata(Base):
+    """Fingerprint of a source CSV as of the last time it was seeded."""
+
+    __tablename__ = "seed_metadata"
+
+    source = Column(String, primary_key=True)
+    sha256 = Column(String(64), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    schema_version = Column(Integer, nullable=False)
+    seeded_at = Column(DateTime, nullable=False)
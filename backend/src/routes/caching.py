@@ -0,0 +1,105 @@
+"""HTTP conditional caching and server-side response caching.
+
+:func:`etag` builds a dependency that derives a strong ETag from the request
+URL and the data versions (see :mod:`src.db.versions`) of the scopes the
+response depends on.  A matching ``If-None-Match`` short-circuits the
+request with ``304 Not Modified`` before the endpoint queries anything.
+
+:func:`cached` additionally serves the encoded body from the in-process
+:mod:`~src.services.response_cache`, keyed by that ETag.
+"""
+
+import hashlib
+
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.compression import identity_etag
+from ..db import versions
+from ..db.database import get_db
+from ..services.response_cache import response_cache
+from ..settings.config import settings
+
+
+def _resolve(scopes: tuple[str, ...], request: Request) -> list[str]:
+    return [s.format(**request.path_params) for s in scopes]
+
+
+def _matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison; compressed variants are tagged
+    # with an encoding suffix by the compression middleware
+    candidates = (
+        identity_etag(t.strip().removeprefix("W/")) for t in if_none_match.split(",")
+    )
+    return tag in candidates
+
+
+def etag(*scopes: str):
+    """Dependency tagging the response with the versions of *scopes*.
+
+    Scopes may reference path parameters, e.g. ``"game:{game_id}"``.  The
+    dependency returns the caching headers; endpoints returning a
+    :class:`~fastapi.Response` themselves must pass them on.
+    """
+
+    async def _conditional(
+        request: Request, response: Response, db: AsyncSession = Depends(get_db)
+    ) -> dict[str, str]:
+        names = _resolve(scopes, request)
+        current = await versions.get_versions(db, names)
+        digest = hashlib.sha1(request.url.path.encode())
+        digest.update(str(sorted(request.query_params.multi_items())).encode())
+        digest.update(str(sorted(current.items())).encode())
+        headers = {
+            "ETag": f'"{digest.hexdigest()}"',
+            "Cache-Control": settings.http_cache_control,
+        }
+        if _matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return headers
+
+    return _conditional
+
+
+@dataclass
+class CacheSlot:
+    """Where an endpoint's encoded response lives in the response cache."""
+
+    key: str
+    scopes: frozenset[str]
+    headers: dict[str, str]
+
+    def hit(self) -> Response | None:
+        """The cached response, if there is one."""
+        item = response_cache.get(self.key)
+        if item is None:
+            return None
+        return Response(item.body, media_type=item.media_type, headers=self.headers)
+
+    def store(self, body: bytes, media_type: str = "application/json") -> Response:
+        """Cache *body* and return it as the response."""
+        response_cache.put(self.key, body, media_type, self.scopes)
+        return Response(body, media_type=media_type, headers=self.headers)
+
+
+def cached(*scopes: str):
+    """Dependency combining :func:`etag` with the server-side response cache.
+
+    Endpoints return ``slot.hit()`` when it is set and otherwise encode their
+    result and return ``slot.store(body)``.
+    """
+
+    async def _slot(
+        request: Request, cache_headers: dict[str, str] = Depends(etag(*scopes))
+    ) -> CacheSlot:
+        return CacheSlot(
+            cache_headers["ETag"], frozenset(_resolve(scopes, request)), cache_headers
+        )
+
+    return _slot
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from ..services.pandas_service import query_pandas_agent
@@ -34,5 +35,6 @@ async def chat_with_pandas(chat_input: ChatInput):
 
     game_ctx = chat_input.game.model_dump()
 
-    response = query_pandas_agent(last_user_message, game_ctx)
+    # The agent makes blocking LLM calls – keep them off the event loop
+    response = await run_in_threadpool(query_pandas_agent, last_user_message, game_ctx)
     return {"role": "assistant", "content": response}
\ No newline at end of file
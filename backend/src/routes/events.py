@@ -1,13 +1,30 @@
 """Event listing and CRUD endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+import base64
+import orjson
+
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, distinct
 
 from ..db.database import get_db
-from ..db import crud
-from ..models import Event
-from ..schemas import EventSchema, EventCreate, EventUpdate
+from ..db.filters import EventFilter
+from ..db import aggregates, bulk, crud, versions
+from ..models import Event, EventType
+from ..schemas import (
+    EventSchema,
+    EventPageSchema,
+    EventCreate,
+    EventUpdate,
+    EventBulkRequest,
+    EventBulkResultSchema,
+)
+from ..schemas.shot import SpatialAggregateSchema
+from ..services import density, export, spatial
+from .caching import CacheSlot, cached
+from .params import grid_spec
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
@@ -17,17 +34,204 @@ router = APIRouter(prefix="/events", tags=["Events"])
 # ---------------------------------------------------------------------------
 
 
-@router.get("", response_model=list[EventSchema])
-async def list_events(limit: int = 100, skip: int = 0, db: Session = Depends(get_db)):
-    """Return up to *limit* events from the database for demo purposes."""
-    return crud.get_events(db, skip=skip, limit=limit)
+def _encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps({"after": last_id})).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        after = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))["after"]
+    except (ValueError, TypeError, KeyError):
+        after = None
+    if not isinstance(after, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after
+
+
+@router.get("", response_model=EventPageSchema)
+async def list_events(
+    game_id: list[int] = Query([], description="Game ids (repeat for several)"),
+    event: list[str] = Query([], description="Event type names"),
+    team: list[str] = Query([], description="Names of the eventing team"),
+    player: list[str] = Query([], description="Names of the primary player"),
+    period: list[int] = Query([]),
+    strength: list[str] = Query(
+        [],
+        description="Strength of the eventing team: `5v4` style or even/powerplay/shorthanded",
+    ),
+    clock_from: str | None = Query(None, description="Game clock bound, `M:SS`"),
+    clock_to: str | None = Query(None, description="Other game clock bound, `M:SS`"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return one page of events matching the filters, ordered by id.
+
+    Pass the returned ``next_cursor`` to fetch the following page.
+    """
+    filters = EventFilter(
+        game_ids=game_id,
+        events=event,
+        teams=team,
+        players=player,
+        periods=period,
+        strengths=strength,
+        clock_from=clock_from,
+        clock_to=clock_to,
+    )
+    after = _decode_cursor(cursor) if cursor else None
+    try:
+        # One extra row tells whether another page follows
+        rows = await crud.get_event_rows(db, filters, after=after, limit=limit + 1)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    return _page(rows, limit)
+
+
+def _page(rows, limit: int) -> Response:
+    """``EventPageSchema`` response of up to *limit* of *rows* (one extra row
+    tells whether another page follows)."""
+    next_cursor = _encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    # Rows are encoded directly; ``response_model`` only documents the shape
+    body = (
+        b'{"items":'
+        + export.json_rows(crud.EVENT_ROW_COLUMNS, rows[:limit])
+        + b',"next_cursor":'
+        + orjson.dumps(next_cursor)
+        + b"}"
+    )
+    return Response(body, media_type="application/json")
+
+
+def _area(
+    zone: str | None,
+    rect: tuple[float | None, ...],
+    circle: tuple[float | None, ...],
+) -> spatial.Shape:
+    given = [
+        zone is not None,
+        any(v is not None for v in rect),
+        any(v is not None for v in circle),
+    ]
+    if sum(given) != 1:
+        raise HTTPException(
+            status_code=422,
+            detail="Give exactly one of zone, x_min/x_max/y_min/y_max or x/y/radius",
+        )
+    if zone is not None:
+        try:
+            return spatial.zone(zone)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+    if given[1]:
+        if None in rect:
+            raise HTTPException(
+                status_code=422, detail="A rectangle needs x_min, x_max, y_min and y_max"
+            )
+        x_min, x_max, y_min, y_max = rect
+        if x_min > x_max or y_min > y_max:
+            raise HTTPException(status_code=422, detail="Rectangle minimums exceed maximums")
+        return spatial.Rect(x_min, x_max, y_min, y_max)
+    if None in circle:
+        raise HTTPException(status_code=422, detail="A radius query needs x, y and radius")
+    return spatial.Circle(*circle)
+
+
+@router.get("/spatial", response_model=EventPageSchema)
+async def spatial_events(
+    zone: str | None = Query(None, description=f"Named area: {', '.join(spatial.ZONES)}"),
+    x_min: float | None = Query(None, description="Rectangle bounds (inclusive)"),
+    x_max: float | None = None,
+    y_min: float | None = None,
+    y_max: float | None = None,
+    x: float | None = Query(None, description="Centre of a radius query"),
+    y: float | None = None,
+    radius: float | None = Query(None, gt=0, description="Radius in feet"),
+    game_id: list[int] = Query([], description="Game ids (repeat for several)"),
+    event: list[str] = Query([], description="Event type names"),
+    team: list[str] = Query([], description="Names of the eventing team"),
+    player: list[str] = Query([], description="Names of the primary player"),
+    period: list[int] = Query([]),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return one page of events located in an area, across all games.
+
+    The area is a named *zone*, a rectangle or a circle, in the eventing
+    team's attacking direction (the attacked net is at x = 189).  It is
+    resolved through the spatial grid index, so the cost follows the
+    number of events in the area rather than the size of the table.
+    """
+    filters = EventFilter(
+        game_ids=game_id,
+        events=event,
+        teams=team,
+        players=player,
+        periods=period,
+        area=_area(zone, (x_min, x_max, y_min, y_max), (x, y, radius)),
+    )
+    after = _decode_cursor(cursor) if cursor else None
+    try:
+        rows = await crud.get_event_rows(db, filters, after=after, limit=limit + 1)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return _page(rows, limit)
 
 
 @router.get("/types", response_model=list[str])
-async def list_event_types(db: Session = Depends(get_db)):
-    """Return all distinct values of Event.event column."""
-    result = db.execute(select(distinct(Event.event))).scalars().all()
-    return sorted(filter(None, result))
+async def list_event_types(
+    db: AsyncSession = Depends(get_db),
+    cache: CacheSlot = Depends(cached(versions.EVENT_TYPES)),
+):
+    """Return the names of all event types that occur in the events table."""
+    if hit := cache.hit():
+        return hit
+    used = select(distinct(Event.event_type_id))
+    result = (await db.execute(select(EventType.name).where(EventType.id.in_(used)))).scalars().all()
+    return cache.store(orjson.dumps(sorted(filter(None, result))))
+
+
+@router.get("/aggregate", response_model=list[SpatialAggregateSchema])
+async def aggregate_events(
+    game_id: list[int] = Query([], description="Game ids (repeat for several)"),
+    event: list[str] = Query([], description="Event type names"),
+    team: list[str] = Query([], description="Names of the eventing team"),
+    player: list[str] = Query([], description="Names of the primary player"),
+    period: list[int] = Query([]),
+    strength: list[str] = Query(
+        [],
+        description="Strength of the eventing team: `5v4` style or even/powerplay/shorthanded",
+    ),
+    clock_from: str | None = Query(None, description="Game clock bound, `M:SS`"),
+    clock_to: str | None = Query(None, description="Other game clock bound, `M:SS`"),
+    group_by: list[aggregates.GroupDimension] = Query(
+        [], description="One grid per combination"
+    ),
+    spec: density.GridSpec = Depends(grid_spec),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return density grids of event locations across games.
+
+    Every filter accepts several values; an omitted filter matches
+    everything.  Without ``group_by`` a single grid covers all matching
+    events, otherwise there is one grid per distinct group.
+    """
+    filters = EventFilter(
+        game_ids=game_id,
+        events=event,
+        teams=team,
+        players=player,
+        periods=period,
+        strengths=strength,
+        clock_from=clock_from,
+        clock_to=clock_to,
+    )
+    try:
+        return await aggregates.spatial_aggregate(db, filters, group_by, spec)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
 
 # ---------------------------------------------------------------------------
@@ -36,30 +240,55 @@ async def list_event_types(db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=EventSchema)
-async def create_event(event_in: EventCreate, db: Session = Depends(get_db)):
-    return crud.create_event(db, event_in)
+async def create_event(event_in: EventCreate, db: AsyncSession = Depends(get_db)):
+    return await crud.create_event(db, event_in)
+
+
+@router.post(
+    "/bulk",
+    response_model=EventBulkResultSchema,
+    responses={409: {"model": EventBulkResultSchema}},
+)
+async def bulk_edit_events(
+    body: EventBulkRequest,
+    atomic: bool = Query(
+        True, description="Reject the whole edit (409) if any update/delete id is unknown"
+    ),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply many creates, partial updates and deletes in one transaction.
+
+    Every item gets a result with its op, index and event id.  Creates are
+    applied before updates, and updates before deletes.
+    """
+    result = await bulk.bulk_edit_events(
+        db, body.create, body.update, body.delete, atomic=atomic
+    )
+    if not result.applied:
+        return JSONResponse(status_code=409, content=asdict(result))
+    return asdict(result)
 
 
 @router.get("/{event_id}", response_model=EventSchema)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = crud.get_event(db, event_id)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_db)):
+    event = await crud.get_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 
 @router.put("/{event_id}", response_model=EventSchema)
-async def update_event(event_id: int, event_in: EventUpdate, db: Session = Depends(get_db)):
-    event = crud.get_event(db, event_id)
+async def update_event(event_id: int, event_in: EventUpdate, db: AsyncSession = Depends(get_db)):
+    event = await crud.get_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return crud.update_event(db, event, event_in)
+    return await crud.update_event(db, event, event_in)
 
 
 @router.delete("/{event_id}", status_code=204)
-async def delete_event(event_id: int, db: Session = Depends(get_db)):
-    event = crud.get_event(db, event_id)
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_db)):
+    event = await crud.get_event(db, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    crud.delete_event(db, event)
+    await crud.delete_event(db, event)
     return Response(status_code=204)
@@ -1,123 +1,356 @@
 """Routes related to games and game-derived data."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import distinct, select
+import numpy as np
+import orjson
 
-from ..db.database import get_db
-from ..models import Game, Event
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import aggregates, box_scores, crud, passes, possessions, versions
+from ..db.database import AsyncSessionLocal, get_db
+from ..db.filters import EventFilter
+from ..models import Event, EventType, Game, Player, Team
 from ..schemas import GameSchema, EventSchema
-from ..schemas.shot import ShotCoordinateSchema
+from ..schemas.box_score import GameBoxScoreSchema
+from ..schemas.game import GameStateSchema
+from ..schemas.pass_network import PassNetworkSchema
+from ..schemas.possession import PossessionSchema
+from ..schemas.shot import DensityGridSchema, ShotCoordinateSchema
+from ..services import density, export, game_state, pass_network
+from ..services.game_cache import game_cache
+from .caching import CacheSlot, cached, etag
+from .params import grid_spec
 
 router = APIRouter(prefix="/games", tags=["Games"])
 
+DensityMode = Literal["points", "grid"]
 
-@router.get("", response_model=list[GameSchema])
-async def list_games(db: Session = Depends(get_db)):
-    """Return all *Game* records."""
-    return db.query(Game).all()
+_GAME_SCOPE = "game:{game_id}"
 
 
-@router.get("/{game_id}/events", response_model=list[EventSchema])
-async def game_events(game_id: int, db: Session = Depends(get_db)):
-    """Return all events belonging to the given game id."""
-    game_obj = db.query(Game).filter(Game.id == game_id).first()
+async def _get_game_or_404(db: AsyncSession, game_id: int) -> Game:
+    game_obj = await db.get(Game, game_id)
     if not game_obj:
         raise HTTPException(status_code=404, detail="Game not found")
+    return game_obj
 
-    events = (
-        db.query(Event)
-        .filter(
-            Event.game_date == game_obj.game_date,
-            Event.home_team == game_obj.home_team,
-            Event.away_team == game_obj.away_team,
-        )
-        .all()
-    )
-    return events
+
+@router.get(
+    "", response_model=list[GameSchema], dependencies=[Depends(etag(versions.GAMES))]
+)
+async def list_games(db: AsyncSession = Depends(get_db)):
+    """Return all *Game* records."""
+    return (await db.execute(select(Game).order_by(Game.id))).scalars().all()
 
 
-@router.get("/{game_id}/shot-density", response_model=list[ShotCoordinateSchema])
-async def game_shot_density(game_id: int, team: str | None = None, db: Session = Depends(get_db)):
-    """Return all (x, y) shot coordinates for the given game.
+@router.get("/{game_id}/events", response_model=list[EventSchema])
+async def game_events(
+    game_id: int,
+    from_: int | None = Query(
+        None, alias="from", ge=0, description="Window start in elapsed game seconds (inclusive)"
+    ),
+    to: int | None = Query(
+        None, ge=0, description="Window end in elapsed game seconds (exclusive)"
+    ),
+    db: AsyncSession = Depends(get_db),
+    cache: CacheSlot = Depends(cached(_GAME_SCOPE)),
+):
+    """Return the events belonging to the given game id.
 
-    Optionally filter by *team* (home/away/team name).
+    ``from``/``to`` restrict the result to a slice of game time (see
+    ``elapsed_seconds``), e.g. the window shown by a timeline scrubber.
     """
-    game_obj = db.query(Game).filter(Game.id == game_id).first()
-    if not game_obj:
-        raise HTTPException(status_code=404, detail="Game not found")
+    if from_ is not None and to is not None and to < from_:
+        raise HTTPException(status_code=422, detail="`to` must not be before `from`")
+    if hit := cache.hit():
+        return hit
+    await _get_game_or_404(db, game_id)
 
-    query = (
-        db.query(Event.x_coordinate.label("x"), Event.y_coordinate.label("y"))
-        .filter(
-            Event.game_date == game_obj.game_date,
-            Event.home_team == game_obj.home_team,
-            Event.away_team == game_obj.away_team,
-            Event.event.ilike("shot"),
-            Event.x_coordinate.isnot(None),
-            Event.y_coordinate.isnot(None),
-        )
+    # Rows are encoded directly; ``response_model`` only documents the shape
+    filters = EventFilter(game_ids=[game_id], elapsed_from=from_, elapsed_to=to)
+    rows = await crud.get_event_rows(db, filters)
+    return cache.store(export.json_rows(crud.EVENT_ROW_COLUMNS, rows))
+
+
+@router.get(
+    "/{game_id}/boxscore",
+    response_model=GameBoxScoreSchema,
+    dependencies=[Depends(etag(_GAME_SCOPE))],
+)
+async def game_box_score(game_id: int, db: AsyncSession = Depends(get_db)):
+    """Return the team and player box scores of the given game."""
+    await _get_game_or_404(db, game_id)
+    return await box_scores.game_box_score(db, game_id)
+
+
+@router.get(
+    "/{game_id}/possessions",
+    response_model=list[PossessionSchema],
+    dependencies=[Depends(etag(_GAME_SCOPE))],
+)
+async def game_possessions(
+    game_id: int,
+    team: str | None = Query(None, description="Only this team's possessions"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return the possession sequences of the given game in order."""
+    await _get_game_or_404(db, game_id)
+    return await possessions.game_possessions(db, game_id, team)
+
+
+async def _pass_network(db: AsyncSession, game_ids: list[int], team: str | None) -> dict:
+    """Network of *game_ids* from their cached edges, querying only the misses."""
+    current = await versions.game_versions(db, game_ids)
+    edges = {g: game_cache.get(g, "pass_edges", v) for g, v in current.items()}
+    missing = [g for g, e in edges.items() if e is None]
+    if missing:
+        rows: dict[int, list] = {g: [] for g in missing}
+        for game_id, *edge in await passes.edge_rows(db, missing):
+            rows[game_id].append(edge)
+        for game_id, game_rows in rows.items():
+            edges[game_id] = pass_network.PassEdges.from_rows(game_rows)
+            game_cache.put(game_id, "pass_edges", current[game_id], edges[game_id])
+    combined = pass_network.PassEdges.concat(edges.values())
+
+    teams = await passes.names_by_id(db, Team, np.unique(combined.team))
+    if team is not None:
+        team_ids = [i for i, name in teams.items() if name == team]
+        combined = combined.of_team(team_ids[0] if team_ids else -1)
+    players = await passes.names_by_id(
+        db, Player, np.union1d(combined.passer, combined.receiver)
     )
+    return {
+        "game_ids": sorted(game_ids),
+        "team": team,
+        **pass_network.network(combined, players, teams),
+    }
 
-    if team:
-        query = query.filter(Event.team == team)
 
-    rows = query.all()
-    return [{"x": r.x, "y": r.y} for r in rows]
+@router.get("/pass-network", response_model=PassNetworkSchema)
+async def games_pass_network(
+    game_id: list[int] = Query(..., description="Game ids (repeat for several)"),
+    team: str | None = Query(None, description="Only this team's passes"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return the passing network summed over the requested games."""
+    game_ids = sorted(set(game_id))
+    found = (await db.execute(select(Game.id).where(Game.id.in_(game_ids)))).scalars().all()
+    missing = set(game_ids) - set(found)
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Games not found: {sorted(missing)}"
+        )
+    return await _pass_network(db, game_ids, team)
 
 
-@router.get("/{game_id}/goal-density", response_model=list[ShotCoordinateSchema])
-async def game_goal_density(game_id: int, team: str | None = None, db: Session = Depends(get_db)):
-    """Return all (x, y) goal coordinates for the given game."""
-    game_obj = db.query(Game).filter(Game.id == game_id).first()
-    if not game_obj:
-        raise HTTPException(status_code=404, detail="Game not found")
+@router.get(
+    "/{game_id}/pass-network",
+    response_model=PassNetworkSchema,
+    dependencies=[Depends(etag(_GAME_SCOPE))],
+)
+async def game_pass_network(
+    game_id: int,
+    team: str | None = Query(None, description="Only this team's passes"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return who passes to whom in the given game, with player centrality.
+
+    Edges are completed passes (``Play`` events with a receiver); see
+    ``services.pass_network`` for the metrics.
+    """
+    await _get_game_or_404(db, game_id)
+    return await _pass_network(db, [game_id], team)
+
+
+@router.get(
+    "/{game_id}/state",
+    response_model=GameStateSchema,
+    dependencies=[Depends(etag(_GAME_SCOPE))],
+)
+async def game_state_at(
+    game_id: int,
+    t: int = Query(..., ge=0, description="Elapsed game seconds"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Return score, skaters and shot/faceoff totals after game second *t*.
+
+    Shots include goals; faceoffs count faceoff wins.  The game's timeline
+    is built once per data version, so every later ``t`` is a binary
+    search.  *t* may not be after the end of the game (regulation, or the
+    last period played).
+    """
+    await _get_game_or_404(db, game_id)
+    version = (await versions.game_versions(db, [game_id]))[game_id]
+    timeline = game_cache.get(game_id, "timeline", version)
+    if timeline is None:
+        timeline = game_state.GameTimeline.from_rows(
+            await crud.game_timeline_rows(db, game_id)
+        )
+        game_cache.put(game_id, "timeline", version, timeline)
+    if t > timeline.end:
+        raise HTTPException(
+            status_code=422, detail=f"`t` must not be after the end of the game ({timeline.end})"
+        )
+    return timeline.state_at(t)
+
+
+async def _density(
+    db: AsyncSession,
+    game_id: int,
+    event: str,
+    team: str | None,
+    mode: DensityMode,
+    spec: density.GridSpec,
+):
+    """Raw coordinates (``mode=points``) or a binned grid of *event* in a game.
+
+    *event* matches event types case-insensitively.
+    """
+    await _get_game_or_404(db, game_id)
+    names = (
+        await db.execute(
+            select(EventType.name).where(func.lower(EventType.name) == event.lower())
+        )
+    ).scalars().all()
 
-    query = (
-        db.query(Event.x_coordinate.label("x"), Event.y_coordinate.label("y"))
-        .filter(
-            Event.game_date == game_obj.game_date,
-            Event.home_team == game_obj.home_team,
-            Event.away_team == game_obj.away_team,
-            Event.event.ilike("goal"),
+    if mode == "points":
+        if not names:
+            return []
+        query = select(
+            Event.x_coordinate.label("x"), Event.y_coordinate.label("y"), Event.xg
+        ).where(
+            Event.game_id == game_id,
+            Event.event_type_id.in_(select(EventType.id).where(EventType.name.in_(names))),
             Event.x_coordinate.isnot(None),
             Event.y_coordinate.isnot(None),
         )
-    )
-    if team:
-        query = query.filter(Event.team == team)
+        if team:
+            query = query.where(Event.team_id == crud.id_of(Team, team))
+        rows = (await db.execute(query)).all()
+        return [{"x": r.x, "y": r.y, "xg": r.xg} for r in rows]
 
-    rows = query.all()
-    return [{"x": r.x, "y": r.y} for r in rows]
+    groups = []
+    if names:
+        filters = EventFilter(
+            game_ids=[game_id], events=names, teams=[team] if team else []
+        )
+        groups = await aggregates.spatial_aggregate(db, filters, [], spec)
+    if groups:
+        return groups[0]["grid"]
+    return density.grid_payload(np.zeros((spec.y_bins, spec.x_bins)), spec, 0)
 
 
-@router.get("/{game_id}/export")
-async def export_game_data(game_id: int, db: Session = Depends(get_db)):
-    """Return full game metadata and all associated events for the given game id."""
-    from fastapi.responses import JSONResponse  # imported here to avoid circular imports
+_MODE = Query("points", description="`points` for raw coordinates, `grid` for a binned grid")
+
+
+@router.get(
+    "/{game_id}/shot-density",
+    response_model=list[ShotCoordinateSchema] | DensityGridSchema,
+)
+async def game_shot_density(
+    game_id: int,
+    team: str | None = None,
+    mode: DensityMode = _MODE,
+    spec: density.GridSpec = Depends(grid_spec),
+    db: AsyncSession = Depends(get_db),
+    cache: CacheSlot = Depends(cached(_GAME_SCOPE)),
+):
+    """Return shot locations for the given game.
+
+    Optionally filter by *team* (home/away/team name).  ``mode=grid`` returns
+    a fixed-size density grid instead of every shot.
+    """
+    if hit := cache.hit():
+        return hit
+    return cache.store(orjson.dumps(await _density(db, game_id, "Shot", team, mode, spec)))
 
-    # Fetch game
-    game_obj = db.query(Game).filter(Game.id == game_id).first()
-    if not game_obj:
-        raise HTTPException(status_code=404, detail="Game not found")
 
-    events_q = (
-        db.query(Event)
-        .filter(
-            Event.game_date == game_obj.game_date,
-            Event.home_team == game_obj.home_team,
-            Event.away_team == game_obj.away_team,
+@router.get(
+    "/{game_id}/goal-density",
+    response_model=list[ShotCoordinateSchema] | DensityGridSchema,
+)
+async def game_goal_density(
+    game_id: int,
+    team: str | None = None,
+    mode: DensityMode = _MODE,
+    spec: density.GridSpec = Depends(grid_spec),
+    db: AsyncSession = Depends(get_db),
+    cache: CacheSlot = Depends(cached(_GAME_SCOPE)),
+):
+    """Return goal locations for the given game (see ``shot-density``)."""
+    if hit := cache.hit():
+        return hit
+    return cache.store(orjson.dumps(await _density(db, game_id, "Goal", team, mode, spec)))
+
+
+def _export_filename(game: dict, extension: str) -> str:
+    safe_home = game["home_team"].replace(" ", "_")
+    safe_away = game["away_team"].replace(" ", "_")
+    return f"{game['game_date']}_{safe_home}_vs_{safe_away}.{extension}"
+
+
+async def _event_batches(game_id: int):
+    # The request's session is closed once the endpoint returns, so the
+    # streaming body reads through its own session.
+    async with AsyncSessionLocal() as db:
+        async for batch in crud.stream_event_rows(db, game_id):
+            yield batch
+
+
+def _export_stream(fmt: export.ExportFormat, game: dict):
+    return export.encode(fmt, game, crud.EVENT_ROW_COLUMNS, _event_batches(game["id"]))
+
+
+@router.get("/export")
+async def export_games(
+    game_id: list[int] = Query(..., description="Game ids (repeat for several)"),
+    format: export.ExportFormat = "csv",
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream a ZIP archive with one *format* export file per requested game."""
+    games = (
+        await db.execute(select(Game).where(Game.id.in_(game_id)).order_by(Game.id))
+    ).scalars().all()
+    missing = set(game_id) - {g.id for g in games}
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Games not found: {sorted(missing)}"
         )
-        .all()
+    game_data = [GameSchema.model_validate(g).model_dump() for g in games]
+    extension = export.FORMATS[format][1]
+
+    async def _members():
+        for game in game_data:
+            yield _export_filename(game, extension), _export_stream(format, game)
+
+    return StreamingResponse(
+        export.zip_stream(_members()),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="games_export.zip"'},
     )
 
-    game_data = GameSchema.model_validate(game_obj).model_dump()
-    event_data = [EventSchema.model_validate(ev).model_dump() for ev in events_q]
 
-    payload = {"game": game_data, "events": event_data}
+@router.get("/{game_id}/export")
+async def export_game_data(
+    game_id: int,
+    format: export.ExportFormat = "json",
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream game metadata and all associated events for the given game id.
 
-    safe_home = game_data["home_team"].replace(" ", "_")
-    safe_away = game_data["away_team"].replace(" ", "_")
-    filename = f"{game_data['game_date']}_{safe_home}_vs_{safe_away}.json"
+    ``json`` keeps the ``{"game": …, "events": […]}`` shape; ``ndjson``,
+    ``csv`` and ``parquet`` contain the events only.
+    """
+    game_obj = await _get_game_or_404(db, game_id)
+    game_data = GameSchema.model_validate(game_obj).model_dump()
+    media_type, extension = export.FORMATS[format]
+    filename = _export_filename(game_data, extension)
 
-    return JSONResponse(content=payload, headers={"Content-Disposition": f"attachment; filename=\"{filename}\""})
+    return StreamingResponse(
+        _export_stream(format, game_data),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
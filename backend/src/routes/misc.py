@@ -1,8 +1,13 @@
 """Miscellaneous and health-check endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.seeding import seed_progress
+from ..services.response_cache import response_cache
 from ..settings.config import settings
 from ..db.database import get_db
 
@@ -21,6 +26,38 @@ async def ping():
     return {"ping": "pong"}
 
 
+@router.get("/health/live", tags=["Health"])
+async def liveness():
+    """Liveness probe – the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready", tags=["Health"])
+async def readiness(db: AsyncSession = Depends(get_db)):
+    """Readiness probe – 200 once seeding finished and the database answers.
+
+    Returns 503 with the seeding progress while the dataset is still loading
+    (or if seeding failed).
+    """
+    body = {"status": "ready", "seeding": seed_progress.as_dict()}
+    if not seed_progress.ready:
+        body["status"] = seed_progress.state
+        return JSONResponse(status_code=503, content=jsonable_encoder(body))
+    try:
+        await db.execute(text("SELECT 1"))
+    except Exception as exc:
+        body["status"] = "database unavailable"
+        body["error"] = repr(exc)
+        return JSONResponse(status_code=503, content=jsonable_encoder(body))
+    return body
+
+
+@router.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    """Size and hit/miss counters of the in-process response cache."""
+    return response_cache.stats()
+
+
 @router.get("/hello/{name}", tags=["Example"])
 async def say_hello(name: str):
     """Return a personalised greeting."""
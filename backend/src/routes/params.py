@@ -0,0 +1,18 @@
+"""Query-parameter dependencies shared by several routers."""
+
+from fastapi import Query
+
+from ..services import density
+
+
+def grid_spec(
+    bins: int | None = Query(
+        None, ge=1, le=200, description="Grid columns along the rink (rows keep cells square)"
+    ),
+    cell_size: float | None = Query(
+        None, gt=0, le=85, description="Grid cell size in feet (ignored with `bins`)"
+    ),
+    sigma: float = Query(0.0, ge=0, le=10, description="Gaussian smoothing radius in cells"),
+) -> density.GridSpec:
+    """Density-grid resolution and smoothing from ``bins``/``cell_size``/``sigma``."""
+    return density.GridSpec.from_params(bins, cell_size, sigma)
@@ -1,18 +1,33 @@
 """Player listing endpoints."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..db import box_scores, versions
 from ..db.database import get_db
 from ..models import Player
+from ..schemas.box_score import PlayerStatsSchema
 from ..schemas.player import PlayerSchema
+from .caching import etag
 
 router = APIRouter(prefix="/players", tags=["Players"])
 
 
-@router.get("", response_model=list[PlayerSchema])
-async def list_players(limit: int | None = None, db: Session = Depends(get_db)):
-    query = db.query(Player)
+@router.get(
+    "", response_model=list[PlayerSchema], dependencies=[Depends(etag(versions.PLAYERS))]
+)
+async def list_players(limit: int | None = None, db: AsyncSession = Depends(get_db)):
+    query = select(Player).order_by(Player.id)
     if limit:
         query = query.limit(limit)
-    return query.all()
+    return (await db.execute(query)).scalars().all()
+
+
+@router.get("/{player_id}/stats", response_model=PlayerStatsSchema)
+async def player_stats(player_id: int, db: AsyncSession = Depends(get_db)):
+    """Return the player's box score in every game and the totals."""
+    player = await db.get(Player, player_id)
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return await box_scores.player_stats(db, player)
@@ -10,9 +10,14 @@ from .player import PlayerSchema  # noqa: F401
 from .game import GameSchema  # noqa: F401
 from .event import (
     EventSchema,
+    EventPageSchema,
     EventBase,
     EventCreate,
     EventUpdate,
+    EventPatch,
+    EventBulkRequest,
+    EventBulkItemSchema,
+    EventBulkResultSchema,
 )  # noqa: F401
 
 __all__ = [
@@ -20,7 +25,12 @@ __all__ = [
     "PlayerSchema",
     "GameSchema",
     "EventSchema",
+    "EventPageSchema",
     "EventBase",
     "EventCreate",
     "EventUpdate",
+    "EventPatch",
+    "EventBulkRequest",
+    "EventBulkItemSchema",
+    "EventBulkResultSchema",
 ]
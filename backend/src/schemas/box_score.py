@@ -0,0 +1,63 @@
+"""Pydantic schemas for the materialised box scores."""
+
+from pydantic import BaseModel
+
+
+class StatLineSchema(BaseModel):
+    """Event counters of a team or player (see ``db.box_scores.STAT_EVENTS``)."""
+
+    events: int
+    # Shots include goals
+    shots: int
+    goals: int
+    faceoff_wins: int
+    takeaways: int
+    puck_recoveries: int
+    # Attempted (``Play`` + ``Incomplete Play``) and completed passes
+    passes: int
+    completed_passes: int
+    zone_entries: int
+    dump_ins: int
+    penalties: int
+    # Summed expected goals of the shots
+    xg: float
+
+
+class TeamBoxScoreSchema(BaseModel):
+    team: str
+    stats: StatLineSchema
+
+
+class PlayerBoxScoreSchema(BaseModel):
+    player_id: int
+    player: str
+    team: str
+    stats: StatLineSchema
+
+
+class GameBoxScoreSchema(BaseModel):
+    """Box score of one game, per team and per player."""
+
+    game_id: int
+    teams: list[TeamBoxScoreSchema]
+    players: list[PlayerBoxScoreSchema]
+
+
+class PlayerGameLineSchema(BaseModel):
+    """A player's box score in one game."""
+
+    game_id: int
+    game_date: str
+    home_team: str
+    away_team: str
+    team: str
+    stats: StatLineSchema
+
+
+class PlayerStatsSchema(BaseModel):
+    """A player's per-game box scores and their totals."""
+
+    player_id: int
+    player: str
+    games: list[PlayerGameLineSchema]
+    totals: StatLineSchema
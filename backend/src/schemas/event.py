@@ -4,9 +4,15 @@ Separated from `schemas.__init__` for better organisation and to align with the
 other schema modules (`team.py`, `player.py`, etc.).
 """
 
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+
+
+def _not_blank(value: Optional[str]) -> Optional[str]:
+    if value is not None and not value.strip():
+        raise ValueError("must not be blank")
+    return value
 
 
 class EventSchema(BaseModel):
@@ -34,10 +40,22 @@ class EventSchema(BaseModel):
     player_2: Optional[str] = None
     x_coordinate_2: Optional[int] = None
     y_coordinate_2: Optional[int] = None
+    # Game seconds since the opening face-off, derived from period and clock
+    elapsed_seconds: Optional[int] = None
+    # Expected-goals probability (shots and goals only)
+    xg: Optional[float] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class EventPageSchema(BaseModel):
+    """One page of a keyset-paginated event listing."""
+
+    items: list[EventSchema]
+    # Opaque token for the following page; ``None`` on the last page
+    next_cursor: Optional[str] = None
+
+
 class EventBase(BaseModel):
     """Shared attributes used for create & update operations."""
 
@@ -63,6 +81,12 @@ class EventBase(BaseModel):
     x_coordinate_2: Optional[int] = None
     y_coordinate_2: Optional[int] = None
 
+    @field_validator("player")
+    @classmethod
+    def player_not_blank(cls, value: str) -> str:
+        """Every event has a primary player, so a blank name is rejected."""
+        return _not_blank(value)
+
 
 class EventCreate(EventBase):
     """Schema for creating a new Event."""
@@ -76,9 +100,92 @@ class EventUpdate(EventBase):
     pass
 
 
+class EventPatch(BaseModel):
+    """Partial update of one event in a bulk edit; omitted fields are kept."""
+
+    id: int
+    game_date: Optional[str] = None
+    home_team: Optional[str] = None
+    away_team: Optional[str] = None
+    period: Optional[int] = None
+    clock: Optional[str] = None
+    home_team_skaters: Optional[int] = None
+    away_team_skaters: Optional[int] = None
+    home_team_goals: Optional[int] = None
+    away_team_goals: Optional[int] = None
+    team: Optional[str] = None
+    player: Optional[str] = None
+    event: Optional[str] = None
+    x_coordinate: Optional[int] = None
+    y_coordinate: Optional[int] = None
+    detail_1: Optional[str] = None
+    detail_2: Optional[str] = None
+    detail_3: Optional[str] = None
+    detail_4: Optional[str] = None
+    player_2: Optional[str] = None
+    x_coordinate_2: Optional[int] = None
+    y_coordinate_2: Optional[int] = None
+
+    @field_validator(
+        "game_date",
+        "home_team",
+        "away_team",
+        "period",
+        "clock",
+        "home_team_skaters",
+        "away_team_skaters",
+        "home_team_goals",
+        "away_team_goals",
+        "team",
+        "player",
+        "event",
+    )
+    @classmethod
+    def required_fields_not_null(cls, value):
+        """Fields required by :class:`EventBase` may be omitted but not nulled."""
+        if value is None:
+            raise ValueError("may be omitted but not set to null")
+        return value
+
+    @field_validator("player")
+    @classmethod
+    def player_not_blank(cls, value: Optional[str]) -> Optional[str]:
+        """A patched player name may not be blank either."""
+        return _not_blank(value)
+
+
+class EventBulkRequest(BaseModel):
+    """Creates, partial updates and deletes applied in one transaction."""
+
+    create: list[EventCreate] = Field(default_factory=list, max_length=10_000)
+    update: list[EventPatch] = Field(default_factory=list, max_length=10_000)
+    delete: list[int] = Field(default_factory=list, max_length=10_000)
+
+
+class EventBulkItemSchema(BaseModel):
+    """Outcome of one bulk item; ``index`` is its position in its op's list."""
+
+    op: Literal["create", "update", "delete"]
+    index: int
+    id: Optional[int] = None
+    status: Literal["created", "updated", "deleted", "not_found"]
+
+
+class EventBulkResultSchema(BaseModel):
+    """Per-item outcomes of a bulk edit and whether it was committed."""
+
+    applied: bool
+    items: list[EventBulkItemSchema]
+
+
 __all__ = [
     "EventSchema",
+    "EventPageSchema",
     "EventBase",
     "EventCreate",
     "EventUpdate",
+    "EventPatch",
+    "EventBulkRequest",
+    "EventBulkItemSchema",
+    "EventBulkResultSchema",
 ]
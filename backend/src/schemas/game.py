@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -7,4 +9,26 @@ class GameSchema(BaseModel):
     home_team: str
     away_team: str
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TeamStateSchema(BaseModel):
+    """One team's side of a :class:`GameStateSchema`."""
+
+    goals: int
+    # ``None`` before the first event
+    skaters: Optional[int] = None
+    shots: int
+    faceoffs: int
+
+
+class GameStateSchema(BaseModel):
+    """Cumulative game state after every event up to elapsed second ``t``."""
+
+    t: int
+    period: int
+    clock: str
+    events: int
+    last_event_id: Optional[int] = None
+    home: TeamStateSchema
+    away: TeamStateSchema
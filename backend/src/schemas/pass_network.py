@@ -0,0 +1,43 @@
+"""Pydantic schemas for passing networks."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PassNodeSchema(BaseModel):
+    """A player with pass totals and centrality (see ``services.pass_network``)."""
+
+    player_id: int
+    player: Optional[str] = None
+    team: Optional[str] = None
+    passes_made: int
+    passes_received: int
+    # Centrality within the player's team network
+    degree: float
+    pagerank: float
+    eigenvector: float
+    closeness: float
+    # Average start of the player's passes
+    x: Optional[float] = None
+    y: Optional[float] = None
+
+
+class PassEdgeSchema(BaseModel):
+    """Completed passes from one player to another and their average vector."""
+
+    passer_id: int
+    receiver_id: int
+    passes: int
+    # Average vector of the passes with located ends; None without any
+    dx: Optional[float] = None
+    dy: Optional[float] = None
+
+
+class PassNetworkSchema(BaseModel):
+    """Passing network over one or more games."""
+
+    game_ids: list[int]
+    team: Optional[str] = None
+    nodes: list[PassNodeSchema]
+    edges: list[PassEdgeSchema]
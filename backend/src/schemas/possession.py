@@ -0,0 +1,29 @@
+"""Pydantic schema for stored possession sequences."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PossessionSchema(BaseModel):
+    """One possession of a game (see ``services.possessions``)."""
+
+    game_id: int
+    # 1-based position within the game
+    number: int
+    team: str
+    period: int
+    start_event_id: int
+    end_event_id: int
+    # Elapsed game seconds; a possession lasts until the next one starts
+    start_elapsed: int
+    end_elapsed: int
+    duration: int
+    events: int
+    # Attempted passes (``Play`` + ``Incomplete Play``); shots include goals
+    passes: int
+    shots: int
+    # Zone of the first event: ``defensive``/``neutral``/``offensive``
+    entry_zone: Optional[str] = None
+    ended_in_shot: bool
+    goal: bool
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -6,5 +8,32 @@ class ShotCoordinateSchema(BaseModel):
 
     x: int
     y: int
+    # Expected-goals probability of the shot
+    xg: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DensityGridSchema(BaseModel):
+    """Binned event density over the 200 x 85 rink.
+
+    ``values[j][i]`` is the (optionally smoothed) count in the cell spanning
+    ``[i * cell_width, (i + 1) * cell_width)`` along and
+    ``[j * cell_height, (j + 1) * cell_height)`` across the rink.
+    """
+
+    x_bins: int
+    y_bins: int
+    cell_width: float
+    cell_height: float
+    sigma: float
+    total: int
+    max: float
+    values: list[list[float]]
+
+
+class SpatialAggregateSchema(BaseModel):
+    """Density grid of one group of events (see ``/events/aggregate``)."""
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    group: dict[str, str | int | None]
+    grid: DensityGridSchema
@@ -0,0 +1,183 @@
+"""Binary columnar cache of parsed source CSVs.
+
+:func:`load_cached` parses a CSV once and stores the typed result as an
+uncompressed Feather (Arrow IPC) file under ``settings.dataset_cache_dir``.
+Later loads read that file instead of parsing text again; converting it back
+to pandas dtypes still copies the data.  Each cache file has a JSON sidecar
+recording the source's path, size, mtime and SHA-256 plus a caller-supplied
+version.  The cache is used while the source's size and mtime match.  If
+only the mtime moved (e.g. a fresh checkout), it is still used when the
+content hash matches.
+
+Every write prunes the directory: entries whose source no longer exists or
+that were written in another format are removed, and only the
+``settings.dataset_cache_max_entries`` most recently written are kept.
+
+pyarrow is optional: without it, or with ``DATASET_CACHE=false``, sources
+are simply parsed every time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pandas as pd
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from ..settings.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - optional dependency
+    pa = feather = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout written by this module changes
+CACHE_FORMAT = 2
+
+
+@dataclass
+class SourceFingerprint:
+    """Cheap (size/mtime) and exact (SHA-256) identity of a source file."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    _sha256: str | None = None
+
+    @classmethod
+    def of(cls, path: Path) -> "SourceFingerprint":
+        stat = path.stat()
+        return cls(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    @property
+    def sha256(self) -> str:
+        """Content hash, computed on first access in 1 MiB blocks."""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            with self.path.open("rb") as fh:
+                for block in iter(lambda: fh.read(1 << 20), b""):
+                    digest.update(block)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def same_stat(self, meta: Any) -> bool:
+        """Whether *meta* (anything with ``size``/``mtime_ns``) matches."""
+        return (
+            meta is not None
+            and meta.size == self.size
+            and meta.mtime_ns == self.mtime_ns
+        )
+
+
+@dataclass
+class _CacheKey:
+    size: int
+    mtime_ns: int
+    sha256: str
+    version: str
+    # Resolved path of the cached source
+    source: str = ""
+    format: int = CACHE_FORMAT
+
+
+def cache_path(source: Path) -> Path:
+    """Return the Feather file caching *source*."""
+    # The resolved path is part of the name so same-named sources never clash
+    tag = hashlib.sha1(str(source.resolve()).encode()).hexdigest()[:12]
+    return Path(settings.dataset_cache_dir) / f"{source.stem}-{tag}.feather"
+
+
+def _read_key(path: Path) -> _CacheKey | None:
+    try:
+        return _CacheKey(**json.loads(path.read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_key(path: Path, fp: SourceFingerprint, version: str) -> None:
+    key = _CacheKey(fp.size, fp.mtime_ns, fp.sha256, version, str(fp.path.resolve()))
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(key.__dict__))
+    os.replace(tmp, path)
+
+
+def _write_cache(target: Path, frame: pd.DataFrame) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    # Uncompressed: reading needs no decompression pass
+    feather.write_feather(frame, tmp, compression="uncompressed")
+    os.replace(tmp, target)
+
+
+def _remove(entry: Path) -> None:
+    for path in (entry, entry.with_suffix(".json")):
+        path.unlink(missing_ok=True)
+
+
+def _prune(keep: Path) -> None:
+    """Drop stale cache entries and cap the directory (see the module docs)."""
+    live = []
+    for entry in keep.parent.glob("*.feather"):
+        if entry == keep:
+            continue
+        key = _read_key(entry.with_suffix(".json"))
+        if key is None or key.format != CACHE_FORMAT or not Path(key.source).exists():
+            _remove(entry)
+        else:
+            live.append(entry)
+    live.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+    for entry in live[max(settings.dataset_cache_max_entries - 1, 0) :]:
+        _remove(entry)
+
+
+def load_cached(
+    source: Path, parse: Callable[[Path], pd.DataFrame], version: str
+) -> pd.DataFrame:
+    """Return ``parse(source)``, served from the columnar cache when valid.
+
+    *version* identifies the output of *parse* (column names, dtypes); a
+    cache written under another version is ignored and rewritten.
+    """
+    source = Path(source)
+    if feather is None or not settings.dataset_cache:
+        return parse(source)
+
+    fp = SourceFingerprint.of(source)
+    target = cache_path(source)
+    key_path = target.with_suffix(".json")
+    key = _read_key(key_path)
+
+    if key is not None and key.version == version and key.format == CACHE_FORMAT:
+        fresh = fp.same_stat(key)
+        if fresh or key.sha256 == fp.sha256:
+            try:
+                frame = feather.read_table(target, memory_map=True).to_pandas()
+            except (OSError, pa.ArrowException) as exc:
+                logger.warning("Ignoring unreadable cache %s: %s", target, exc)
+            else:
+                if not fresh:
+                    _write_key(key_path, fp, version)
+                logger.debug("Loaded %s from cache %s", source.name, target)
+                return frame
+
+    frame = parse(source)
+    try:
+        _write_cache(target, frame)
+        _write_key(key_path, fp, version)
+        logger.info("Cached %s as %s", source.name, target)
+    except (OSError, pa.ArrowException) as exc:
+        logger.warning("Could not cache %s: %s", source.name, exc)
+        return frame
+    try:
+        _prune(target)
+    except OSError as exc:
+        logger.warning("Could not prune %s: %s", target.parent, exc)
+    return frame
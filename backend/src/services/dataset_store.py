@@ -0,0 +1,217 @@
+"""Process-wide, in-memory copy of the events dataset.
+
+The dataset CSV is parsed once into a compact :class:`pandas.DataFrame`
+(categoricals for names, small nullable integers for counts and coordinates)
+and indexed by game.  Parsed frames go through the columnar cache, so later
+process starts skip CSV parsing entirely.  The chat agent and analytics code
+read the same :class:`DatasetStore` through :func:`get_store`, which reloads
+it only when the file on disk changes.
+
+Seeding applies the same rules chunk by chunk (:func:`iter_csv_chunks`), so
+loading a dataset into the database never holds the whole file; it reuses
+the store instead when one is already in memory (:func:`loaded_store`).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from typing import Iterator
+
+from ..settings.config import settings
+from .columnar_cache import load_cached
+
+logger = logging.getLogger(__name__)
+
+# CSV header → Event model field; the single normalisation rule for the dataset
+COLUMN_MAP = {
+    "game_date": "game_date",
+    "Home Team": "home_team",
+    "Away Team": "away_team",
+    "Period": "period",
+    "Clock": "clock",
+    "Home Team Skaters": "home_team_skaters",
+    "Away Team Skaters": "away_team_skaters",
+    "Home Team Goals": "home_team_goals",
+    "Away Team Goals": "away_team_goals",
+    "Team": "team",
+    "Player": "player",
+    "Event": "event",
+    "X Coordinate": "x_coordinate",
+    "Y Coordinate": "y_coordinate",
+    "Detail 1": "detail_1",
+    "Detail 2": "detail_2",
+    "Detail 3": "detail_3",
+    "Detail 4": "detail_4",
+    "Player 2": "player_2",
+    "X Coordinate 2": "x_coordinate_2",
+    "Y Coordinate 2": "y_coordinate_2",
+}
+
+# Columns identifying a game
+GAME_KEY = ("game_date", "home_team", "away_team")
+
+# Field → compact dtype.  Names repeat heavily so they are stored as
+# categoricals; integers use the smallest nullable type that fits the rink
+# (200 × 85) and the game clock.
+DTYPES = {
+    "game_date": "category",
+    "home_team": "category",
+    "away_team": "category",
+    "period": "Int8",
+    "clock": "category",
+    "home_team_skaters": "Int8",
+    "away_team_skaters": "Int8",
+    "home_team_goals": "Int8",
+    "away_team_goals": "Int8",
+    "team": "category",
+    "player": "category",
+    "event": "category",
+    "x_coordinate": "Int16",
+    "y_coordinate": "Int16",
+    "detail_1": "category",
+    "detail_2": "category",
+    "detail_3": "category",
+    "detail_4": "category",
+    "player_2": "category",
+    "x_coordinate_2": "Int16",
+    "y_coordinate_2": "Int16",
+}
+
+# Identifies the frame produced by :func:`parse_csv` in the columnar cache;
+# bump when COLUMN_MAP, DTYPES or the parsing rules change.
+FRAME_VERSION = "1"
+
+
+def _read_csv(csv_path: Path, **kwargs):
+    reverse = {field: header for header, field in COLUMN_MAP.items()}
+    # Categoricals are built by the parser; nullable integers are much
+    # faster to cast afterwards than to parse directly.
+    return pd.read_csv(
+        csv_path,
+        usecols=list(COLUMN_MAP),
+        dtype={
+            reverse[field]: dtype for field, dtype in DTYPES.items() if dtype == "category"
+        },
+        **kwargs,
+    )
+
+
+def _normalise(raw: pd.DataFrame) -> pd.DataFrame:
+    frame = raw.rename(columns=COLUMN_MAP).astype(DTYPES)
+    return frame[list(COLUMN_MAP.values())]
+
+
+def parse_csv(csv_path: Path) -> pd.DataFrame:
+    """Parse the dataset CSV with :data:`COLUMN_MAP` names and :data:`DTYPES`."""
+    return _normalise(_read_csv(csv_path))
+
+
+def iter_csv_chunks(csv_path: Path, size: int) -> Iterator[pd.DataFrame]:
+    """Parse *csv_path* like :func:`parse_csv`, *size* rows at a time.
+
+    Only one chunk is held in memory.  Categories are per chunk, but the
+    values (and their row hashes) match :func:`parse_csv`.
+    """
+    with _read_csv(csv_path, chunksize=size) as reader:
+        for raw in reader:
+            yield _normalise(raw)
+
+
+class DatasetStore:
+    """The events dataset held once in memory and indexed by game."""
+
+    def __init__(self, frame: pd.DataFrame, source: Path | None = None):
+        self.frame = frame
+        self.source = source
+        self._stat = _stat(source) if source is not None else None
+        self._games: dict[tuple[str, str, str], np.ndarray] = (
+            frame.groupby(list(GAME_KEY), observed=True, sort=False).indices
+            if not frame.empty
+            else {}
+        )
+
+    @classmethod
+    def from_csv(cls, csv_path: Path) -> "DatasetStore":
+        """Load *csv_path* through the columnar cache (see :func:`parse_csv`)."""
+        csv_path = Path(csv_path)
+        frame = load_cached(csv_path, parse_csv, FRAME_VERSION)
+        store = cls(frame, source=csv_path)
+        logger.info(
+            "Loaded dataset %s: %d rows, %d games, %.1f MiB",
+            csv_path.name,
+            len(frame),
+            len(store._games),
+            store.memory_bytes / 2**20,
+        )
+        return store
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def memory_bytes(self) -> int:
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    @property
+    def games(self) -> list[tuple[str, str, str]]:
+        """Keys of every game in the dataset, in file order."""
+        return list(self._games)
+
+    def game_frame(self, game_date: str, home_team: str, away_team: str) -> pd.DataFrame:
+        """Return the rows of one game (empty if the game is unknown)."""
+        positions = self._games.get((game_date, home_team, away_team))
+        if positions is None:
+            return self.frame.iloc[:0]
+        return self.frame.iloc[positions]
+
+    def iter_chunks(self, size: int) -> Iterator[pd.DataFrame]:
+        """Yield consecutive slices of at most *size* rows."""
+        for start in range(0, len(self.frame), size):
+            yield self.frame.iloc[start : start + size]
+
+    def is_current(self) -> bool:
+        """Whether the source file is unchanged since it was loaded."""
+        return self.source is None or _stat(self.source) == self._stat
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+_store: DatasetStore | None = None
+_lock = threading.Lock()
+
+
+def loaded_store() -> DatasetStore | None:
+    """The shared store if it is in memory and current, without loading it."""
+    csv_path = Path(settings.dataset_csv)
+    with _lock:
+        if _store is not None and _store.source == csv_path and _store.is_current():
+            return _store
+        return None
+
+
+def get_store() -> DatasetStore:
+    """Return the shared store for ``settings.dataset_csv``.
+
+    The CSV is parsed on first use and again only if the file (or the
+    configured path) changed since.  Raises :class:`FileNotFoundError` when the
+    dataset is missing.
+    """
+    global _store
+    csv_path = Path(settings.dataset_csv)
+    with _lock:
+        if _store is None or _store.source != csv_path or not _store.is_current():
+            if not csv_path.exists():
+                raise FileNotFoundError(f"Dataset file not found at {csv_path}")
+            _store = DatasetStore.from_csv(csv_path)
+        return _store
@@ -0,0 +1,168 @@
+"""Streaming encoders for game exports.
+
+Each encoder consumes batches of event rows (tuples in
+:data:`~src.db.crud.EVENT_ROW_COLUMNS` order) as they arrive from a database
+cursor and yields bytes straight away, so memory stays bounded by one batch
+and the first byte does not wait for the last row:
+
+* ``json``    – ``{"game": …, "events": […]}`` (the original export shape)
+* ``ndjson``  – one event object per line
+* ``csv``     – header plus one line per event
+* ``parquet`` – one row group per batch (needs pyarrow)
+
+:func:`zip_stream` packs several such streams into one ZIP archive, again
+without buffering whole members.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+import orjson
+
+from typing import AsyncIterator, Literal, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+ExportFormat = Literal["json", "ndjson", "csv", "parquet"]
+
+# Format → (media type, file extension)
+FORMATS: dict[str, tuple[str, str]] = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+RowBatches = AsyncIterator[Sequence[Sequence]]
+
+# Columns of the event rows that hold numbers; everything else is text
+_INT_COLUMNS = {
+    "id",
+    "period",
+    "home_team_skaters",
+    "away_team_skaters",
+    "home_team_goals",
+    "away_team_goals",
+    "x_coordinate",
+    "y_coordinate",
+    "x_coordinate_2",
+    "y_coordinate_2",
+    "elapsed_seconds",
+}
+_FLOAT_COLUMNS = {"xg"}
+
+
+def _arrow_type(column: str):
+    if column in _INT_COLUMNS:
+        return pa.int32()
+    return pa.float64() if column in _FLOAT_COLUMNS else pa.string()
+
+
+class _Sink(io.RawIOBase):
+    """Write-only, unseekable buffer drained after every write burst."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def json_rows(columns: Sequence[str], rows: Sequence[Sequence]) -> bytes:
+    """Encode *rows* as a JSON array of ``{column: value}`` objects."""
+    return orjson.dumps([dict(zip(columns, row)) for row in rows])
+
+
+async def _json(game: dict, columns: Sequence[str], batches: RowBatches):
+    yield b'{"game":' + orjson.dumps(game) + b',"events":['
+    first = True
+    async for batch in batches:
+        if not batch:
+            continue
+        # Strip the array brackets so batches join into one array
+        body = json_rows(columns, batch)[1:-1]
+        yield body if first else b"," + body
+        first = False
+    yield b"]}"
+
+
+async def _ndjson(game: dict, columns: Sequence[str], batches: RowBatches):
+    async for batch in batches:
+        yield b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in batch)
+
+
+async def _csv(game: dict, columns: Sequence[str], batches: RowBatches):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+async def _parquet(game: dict, columns: Sequence[str], batches: RowBatches):
+    if pq is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    schema = pa.schema([(c, _arrow_type(c)) for c in columns])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for batch in batches:
+            if batch:
+                table = pa.Table.from_pylist(
+                    [dict(zip(columns, row)) for row in batch], schema=schema
+                )
+                writer.write_table(table)
+                if data := sink.drain():
+                    yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+_ENCODERS = {"json": _json, "ndjson": _ndjson, "csv": _csv, "parquet": _parquet}
+
+
+def encode(
+    fmt: ExportFormat, game: dict, columns: Sequence[str], batches: RowBatches
+) -> AsyncIterator[bytes]:
+    """Encode one game's event *batches* as *fmt* (``game`` is used by JSON)."""
+    return _ENCODERS[fmt](game, columns, batches)
+
+
+async def zip_stream(
+    members: AsyncIterator[tuple[str, AsyncIterator[bytes]]],
+) -> AsyncIterator[bytes]:
+    """Stream a ZIP archive of ``(filename, byte stream)`` *members*."""
+    sink = _Sink()
+    # An unseekable sink makes zipfile write sizes in data descriptors, so
+    # nothing has to be rewritten once a member is complete.
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        async for name, chunks in members:
+            with archive.open(name, "w", force_zip64=True) as member:
+                async for chunk in chunks:
+                    member.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    yield sink.drain()
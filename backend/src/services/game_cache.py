@@ -0,0 +1,84 @@
+"""In-process cache of values derived from one game's events.
+
+Entries are keyed by game, a *kind* naming what was derived (a timeline,
+pass edges, …) and the game's data version (see :mod:`src.db.versions`) the
+reader saw *before* it queried the events.  A value can therefore only be
+served to readers that see the same version:
+
+* a read racing a write may still store what it computed, but under the
+  version it started from, which the next reader no longer asks for;
+* writes committed by another process bump the shared counter, so every
+  worker misses and rebuilds.
+
+Writers still :func:`invalidate` the games they changed so memory is
+released right away.  The cache is an LRU bounded by the ``nbytes`` of the
+stored values (``GAME_CACHE_MAX_BYTES``).
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from ..settings.config import settings
+
+
+class GameCache:
+    """Byte-capped LRU of per-game values, tagged with the game's version."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[tuple[int, Hashable], tuple[int, Any, int]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, game_id: int, kind: Hashable, version: int) -> Any | None:
+        """The *kind* value of *game_id* built at *version*, if cached."""
+        key = (game_id, kind)
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[0] != version:
+            self._drop(key)
+            return None
+        self._items.move_to_end(key)
+        return item[1]
+
+    def put(self, game_id: int, kind: Hashable, version: int, value: Any) -> None:
+        """Store *value*, built from *game_id*'s events at *version*."""
+        size = int(getattr(value, "nbytes", 0))
+        if size > self.max_bytes:
+            return
+        key = (game_id, kind)
+        if key in self._items:
+            self._drop(key)
+        self._items[key] = (version, value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._items)))
+
+    def invalidate(self, game_id: int | None = None) -> None:
+        """Drop every value of *game_id*, or of every game when ``None``."""
+        if game_id is None:
+            self._items.clear()
+            self._bytes = 0
+            return
+        for key in [k for k in self._items if k[0] == game_id]:
+            self._drop(key)
+
+    def _drop(self, key: tuple[int, Hashable]) -> None:
+        self._bytes -= self._items.pop(key)[2]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+game_cache = GameCache(settings.game_cache_max_bytes)
+
+
+def invalidate(*game_ids: int | None) -> None:
+    """Forget cached values of *game_ids* (all games when called without any)."""
+    if not game_ids:
+        game_cache.invalidate()
+    for game_id in game_ids:
+        if game_id is not None:
+            game_cache.invalidate(game_id)
@@ -0,0 +1,103 @@
+"""Cumulative game state over time, answered by binary search.
+
+A :class:`GameTimeline` holds one entry per event of a game, sorted by
+elapsed game time, with the state *after* that event as NumPy arrays:
+score (the dataset's pre-event ``home_team_goals``/``away_team_goals`` plus
+the event's own goal), skaters on ice and running shot and faceoff counts
+per team.  :meth:`GameTimeline.state_at` finds the last event at or before
+a time with :func:`numpy.searchsorted`, so any point of the game costs
+O(log n) once the timeline is built.
+
+Timelines are built once per game version and kept in the shared
+:mod:`~src.services.game_cache`.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from ..utils.clock import PERIOD_SECONDS, REGULATION_PERIODS, format_elapsed
+
+# Event types counted as shots (goals are shots that went in)
+SHOT_EVENTS = ("Shot", "Goal")
+FACEOFF_EVENT = "Faceoff Win"
+
+# Per-team state columns of a timeline
+_TEAM_STATE = ("goals", "skaters", "shots", "faceoffs")
+
+
+@dataclass(frozen=True)
+class GameTimeline:
+    """Per-event cumulative state of one game, in elapsed-time order."""
+
+    elapsed: np.ndarray
+    event_ids: np.ndarray
+    # ``(2, n)`` arrays, row 0 home and row 1 away
+    goals: np.ndarray
+    skaters: np.ndarray
+    shots: np.ndarray
+    faceoffs: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> "GameTimeline":
+        """Build from ``(id, elapsed_seconds, event, is_home, home_skaters,
+        away_skaters, home_goals, away_goals)`` rows sorted by elapsed time."""
+        n = len(rows)
+        columns = list(zip(*rows)) if n else [()] * 8
+        ids, elapsed, events, is_home = columns[:4]
+        skaters = np.array(columns[4:6], dtype=np.int16).reshape(2, n)
+        goals_before = np.array(columns[6:8], dtype=np.int16).reshape(2, n)
+
+        events = np.array(events, dtype=object)
+        home = np.array(is_home, dtype=bool)
+        sides = np.stack([home, ~home])
+
+        goal = sides & (events == "Goal")
+        shot = sides & np.isin(events, SHOT_EVENTS)
+        faceoff = sides & (events == FACEOFF_EVENT)
+        return cls(
+            elapsed=np.array(elapsed, dtype=np.int32),
+            event_ids=np.array(ids, dtype=np.int64),
+            goals=goals_before + goal,
+            skaters=skaters,
+            shots=np.cumsum(shot, axis=1, dtype=np.int32),
+            faceoffs=np.cumsum(faceoff, axis=1, dtype=np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.elapsed)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, f).nbytes for f in self.__dataclass_fields__)
+
+    @property
+    def end(self) -> int:
+        """Elapsed seconds at the end of regulation or of the last period played."""
+        last = int(self.elapsed[-1]) if len(self) else 0
+        return max(REGULATION_PERIODS, -(-last // PERIOD_SECONDS)) * PERIOD_SECONDS
+
+    def state_at(self, t: int) -> dict:
+        """State after every event up to and including elapsed second *t*."""
+        i = int(np.searchsorted(self.elapsed, t, side="right")) - 1
+        period, clock = format_elapsed(t)
+        state = {
+            "t": t,
+            "period": period,
+            "clock": clock,
+            "events": i + 1,
+            "last_event_id": int(self.event_ids[i]) if i >= 0 else None,
+        }
+        for side, row in (("home", 0), ("away", 1)):
+            state[side] = {
+                name: int(getattr(self, name)[row, i]) if i >= 0 else None
+                for name in _TEAM_STATE
+            }
+            if i < 0:
+                # Nothing happened yet: no score and no counts, skaters unknown
+                state[side].update(goals=0, shots=0, faceoffs=0)
+        return state
+
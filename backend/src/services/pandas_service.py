@@ -5,24 +5,16 @@ from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe
 from langchain_openai import ChatOpenAI
 from ..settings.config import settings
 from ..utils.logger import logger
+from .dataset_store import DatasetStore, get_store
 from typing import Dict, Tuple, Optional
 
-# Cache for agents keyed by (game_date, home_team, away_team)
+# Cache for agents keyed by (game_date, home_team, away_team), built from
+# ``_agents_store``; cleared when the shared store is reloaded
 _agents: Dict[Tuple[str, str, str], Optional[object]] = {}
+_agents_store: Optional[DatasetStore] = None
 
-# Load the full dataset once at module import
 _current_dir = os.path.dirname(os.path.abspath(__file__))
 _backend_dir = os.path.dirname(os.path.dirname(_current_dir))
-_dataset_path = os.path.join(_backend_dir, "data", "olympic_womens_dataset.csv")
-
-try:
-    _full_df = pd.read_csv(_dataset_path)
-    # Normalise column names to snake_case (if not already)
-    _full_df.columns = [c.strip().lower().replace(" ", "_") for c in _full_df.columns]
-    logger.info("Loaded main dataset with shape %s", _full_df.shape)
-except Exception as exc:
-    logger.error("Failed to load main dataset: %s", exc)
-    _full_df = pd.DataFrame()
 
 # Player info (optional – not game-specific, so we can load once)
 _player_info_path = os.path.join(_backend_dir, "data", "player_info.csv")
@@ -50,23 +42,26 @@ def _make_agent_key(game_ctx: dict) -> Tuple[str, str, str]:
 
 def _create_agent_for_game(game_ctx: dict):
     """Create and cache a pandas agent filtered to the given game."""
+    global _agents_store
     key = _make_agent_key(game_ctx)
-    if key in _agents and _agents[key] is not None:
-        return _agents[key]
 
     # Validate dataset availability
-    if _full_df.empty:
-        logger.error("Full dataframe is empty; cannot create game-specific agent.")
+    try:
+        store = get_store()
+    except Exception as exc:
+        logger.error("Failed to load main dataset: %s", exc)
         _agents[key] = None
         return None
 
-    # Filter rows for this game – note: dataset columns lower-snake
-    mask = (
-        (_full_df["game_date"] == key[0])
-        & (_full_df["home_team"] == key[1])
-        & (_full_df["away_team"] == key[2])
-    )
-    game_df = _full_df.loc[mask].copy()
+    # Agents hold a copy of their game's rows; a reloaded store outdates them
+    if store is not _agents_store:
+        _agents.clear()
+        _agents_store = store
+    if key in _agents and _agents[key] is not None:
+        return _agents[key]
+
+    # Copy so the agent's REPL cannot modify the shared store
+    game_df = store.game_frame(*key).copy()
 
     if game_df.empty:
         logger.warning("No rows found for game %s", key)
@@ -0,0 +1,221 @@
+"""Passing networks from completed plays.
+
+A completed ``Play`` links its primary player (the passer) to ``player_2``
+(the receiver).  The database groups a game's plays by passer, receiver and
+team in one query (:func:`~src.db.passes.edge_rows`); :class:`PassEdges`
+holds those sums as arrays and is cached per game version in the shared
+:mod:`~src.services.game_cache`.
+A network over any set of games is the sum of their edges: the arrays are
+laid into ``scipy.sparse`` player × player matrices, where duplicate
+entries add up, and every metric is computed from the sparse matrices:
+
+* ``passes_made`` / ``passes_received`` – weighted out- and in-degree,
+* ``degree`` – distinct passing partners (either direction) over ``n - 1``,
+* ``pagerank`` – PageRank of the pass-weighted graph (damping 0.85),
+* ``eigenvector`` – eigenvector centrality of the symmetrised counts,
+* ``closeness`` – harmonic closeness over pass hops (1 when a player passes
+  to every teammate directly).
+
+Passes never cross teams, so the metrics are computed within each team's
+network.  Edges carry the average pass vector (``dx``, ``dy``) and nodes the
+average location their passes start from, both over the passes whose
+coordinates were recorded.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+
+DAMPING = 0.85
+# Centrality metrics of every node
+METRICS = ("degree", "pagerank", "eigenvector", "closeness")
+_ITERATIONS = 100
+_TOLERANCE = 1e-10
+
+
+@dataclass(frozen=True)
+class PassEdges:
+    """Per passer/receiver sums of completed passes."""
+
+    passer: np.ndarray
+    receiver: np.ndarray
+    team: np.ndarray
+    passes: np.ndarray
+    # Passes with a located start / end; the coordinate sums run over these
+    starts: np.ndarray
+    ends: np.ndarray
+    # Sums of the start and end coordinates
+    x: np.ndarray
+    y: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> "PassEdges":
+        """Build from rows of the fields in order (see ``db.passes.edge_rows``)."""
+        columns = list(zip(*rows)) if rows else [()] * 10
+        ints = [np.array(c, dtype=np.int64) for c in columns[:6]]
+        floats = [np.array(c, dtype=float) for c in columns[6:]]
+        return cls(*ints, *floats)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, f).nbytes for f in self.__dataclass_fields__)
+
+    def of_team(self, team_id: int) -> "PassEdges":
+        """The edges of passes made by *team_id*."""
+        keep = self.team == team_id
+        return PassEdges(*(getattr(self, f)[keep] for f in self.__dataclass_fields__))
+
+    @classmethod
+    def concat(cls, parts: Iterable["PassEdges"]) -> "PassEdges":
+        parts = list(parts)
+        if not parts:
+            return cls.from_rows([])
+        return cls(
+            *(
+                np.concatenate([getattr(p, f) for p in parts])
+                for f in cls.__dataclass_fields__
+            )
+        )
+
+
+def _power_iteration(step, n: int) -> np.ndarray:
+    v = np.full(n, 1.0 / n)
+    for _ in range(_ITERATIONS):
+        nxt = step(v)
+        if np.abs(nxt - v).sum() < _TOLERANCE:
+            return nxt
+        v = nxt
+    return v
+
+
+def _pagerank(counts: sparse.csr_matrix) -> np.ndarray:
+    n = counts.shape[0]
+    out = np.asarray(counts.sum(axis=1)).ravel()
+    # Row-normalised transitions; players who never pass jump anywhere
+    inv = sparse.diags(np.divide(1.0, out, out=np.zeros(n), where=out > 0))
+    transitions = (inv @ counts).T.tocsr()
+    dangling = out == 0
+
+    def step(v: np.ndarray) -> np.ndarray:
+        return DAMPING * (transitions @ v + v[dangling].sum() / n) + (1 - DAMPING) / n
+
+    return _power_iteration(step, n)
+
+
+def _eigenvector(symmetric: sparse.csr_matrix) -> np.ndarray:
+    n = symmetric.shape[0]
+
+    def step(v: np.ndarray) -> np.ndarray:
+        # Adding v keeps the iteration from oscillating on bipartite graphs
+        nxt = symmetric @ v + v
+        norm = np.linalg.norm(nxt)
+        return nxt / norm if norm else nxt
+
+    return _power_iteration(step, n)
+
+
+def _closeness(counts: sparse.csr_matrix) -> np.ndarray:
+    n = counts.shape[0]
+    if n < 2:
+        return np.zeros(n)
+    distances = shortest_path(counts, method="D", directed=True, unweighted=True)
+    with np.errstate(divide="ignore"):
+        inverse = np.where(np.isfinite(distances) & (distances > 0), 1.0 / distances, 0.0)
+    return inverse.sum(axis=1) / (n - 1)
+
+
+def _metrics(counts: sparse.csr_matrix) -> dict[str, np.ndarray]:
+    n = counts.shape[0]
+    symmetric = (counts + counts.T).tocsr()
+    partners = np.diff((symmetric > 0).tocsr().indptr)
+    return {
+        "degree": partners / (n - 1) if n > 1 else np.zeros(n),
+        "pagerank": _pagerank(counts),
+        "eigenvector": _eigenvector(symmetric),
+        "closeness": _closeness(counts),
+    }
+
+
+def network(edges: PassEdges, players: dict[int, str], teams: dict[int, str]) -> dict:
+    """Nodes with centrality metrics and aggregated edges of *edges*.
+
+    *players* and *teams* map ids to names.
+    """
+    ids, index = np.unique(np.r_[edges.passer, edges.receiver], return_inverse=True)
+    n = len(ids)
+    if not n:
+        return {"nodes": [], "edges": []}
+    rows, cols = index[: len(edges.passer)], index[len(edges.passer) :]
+
+    def matrix(values: np.ndarray) -> sparse.csr_matrix:
+        # Duplicate (passer, receiver) pairs from several games add up
+        return sparse.coo_matrix((values, (rows, cols)), shape=(n, n)).tocsr()
+
+    counts = matrix(edges.passes.astype(float))
+    sums = {f: matrix(getattr(edges, f)) for f in ("x", "y", "x2", "y2")}
+    starts, ends = matrix(edges.starts.astype(float)), matrix(edges.ends.astype(float))
+    made = np.asarray(counts.sum(axis=1)).ravel()
+    received = np.asarray(counts.sum(axis=0)).ravel()
+    located = np.asarray(starts.sum(axis=1)).ravel()
+    start_x = np.asarray(sums["x"].sum(axis=1)).ravel()
+    start_y = np.asarray(sums["y"].sum(axis=1)).ravel()
+
+    # A player's team is the team of the passes they make or receive
+    team_of = np.zeros(n, dtype=np.int64)
+    team_of[cols] = edges.team
+    team_of[rows] = edges.team
+    metrics = {m: np.zeros(n) for m in METRICS}
+    for team in np.unique(team_of):
+        members = np.flatnonzero(team_of == team)
+        for m, values in _metrics(counts[members][:, members]).items():
+            metrics[m][members] = values
+
+    nodes = [
+        {
+            "player_id": int(ids[i]),
+            "player": players.get(int(ids[i])),
+            "team": teams.get(int(team_of[i])),
+            "passes_made": int(made[i]),
+            "passes_received": int(received[i]),
+            **{m: round(float(metrics[m][i]), 4) for m in METRICS},
+            "x": round(float(start_x[i] / located[i]), 2) if located[i] else None,
+            "y": round(float(start_y[i] / located[i]), 2) if located[i] else None,
+        }
+        for i in range(n)
+    ]
+    coo = counts.tocoo()
+    passer, receiver, passes = coo.row, coo.col, coo.data
+
+    def average(f: str, located: sparse.csr_matrix) -> np.ndarray:
+        # NaN where none of the edge's passes has that end located
+        n = np.asarray(located[passer, receiver]).ravel()
+        total = np.asarray(sums[f][passer, receiver]).ravel()
+        return np.divide(total, n, out=np.full(len(n), np.nan), where=n > 0)
+
+    dx = average("x2", ends) - average("x", starts)
+    dy = average("y2", ends) - average("y", starts)
+    order = np.lexsort((receiver, passer, -passes))
+    return {
+        "nodes": sorted(
+            nodes, key=lambda node: (node["team"] or "", -node["pagerank"], node["player_id"])
+        ),
+        "edges": [
+            {
+                "passer_id": int(ids[passer[k]]),
+                "receiver_id": int(ids[receiver[k]]),
+                "passes": int(passes[k]),
+                "dx": None if np.isnan(dx[k]) else round(float(dx[k]), 2),
+                "dy": None if np.isnan(dy[k]) else round(float(dy[k]), 2),
+            }
+            for k in order
+        ],
+    }
+
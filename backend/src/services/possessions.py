@@ -0,0 +1,133 @@
+"""Possession sequences segmented from ordered event streams.
+
+:func:`segment` splits the events of any number of games into possessions
+with array operations only.  A new possession starts when
+
+* the game or the period changes,
+* the eventing team changes (a takeaway, a recovery of a failed pass, …),
+* a faceoff is won, or
+* the previous event was a shot or a goal (a rebound starts a new one).
+
+Penalties are not puck events and are left out.  Coordinates are in the
+eventing team's attacking direction, so the zone a possession starts in
+follows from the x coordinate of its first event and the blue lines.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Blue lines along the rink (feet from the team's own end boards)
+BLUE_LINES = (75, 125)
+ZONES = ("defensive", "neutral", "offensive")
+
+PASS_EVENTS = ("Play", "Incomplete Play")
+SHOT_EVENTS = ("Shot", "Goal")
+# Events that start / end the possession they belong to
+STARTING_EVENTS = ("Faceoff Win",)
+ENDING_EVENTS = SHOT_EVENTS
+IGNORED_EVENTS = ("Penalty Taken",)
+
+# Input columns of :func:`segment`
+EVENT_COLUMNS = (
+    "game_id", "id", "period", "elapsed_seconds", "team_id", "event", "x_coordinate"
+)
+
+POSSESSION_COLUMNS = (
+    "game_id",
+    "number",
+    "team_id",
+    "period",
+    "start_event_id",
+    "end_event_id",
+    "start_elapsed",
+    "end_elapsed",
+    "duration",
+    "events",
+    "passes",
+    "shots",
+    "entry_zone",
+    "ended_in_shot",
+    "goal",
+)
+
+
+def _changed(values: np.ndarray) -> np.ndarray:
+    return values[1:] != values[:-1]
+
+
+def _count(mask: np.ndarray, first: np.ndarray) -> np.ndarray:
+    # Per-possession sums; reduceat on booleans would OR instead of add
+    return np.add.reduceat(mask.astype(np.int64), first)
+
+
+def segment(events: pd.DataFrame) -> pd.DataFrame:
+    """Return one row per possession (:data:`POSSESSION_COLUMNS`) of *events*.
+
+    *events* has :data:`EVENT_COLUMNS` and is sorted by game, elapsed time
+    and id.  Possessions are numbered from 1 within each game.  A
+    possession lasts until the next one starts in the same period, or until
+    its last event.
+    """
+    events = events[
+        ~events["event"].isin(IGNORED_EVENTS)
+        & events["team_id"].notna()
+        & events["elapsed_seconds"].notna()
+    ]
+    if events.empty:
+        return pd.DataFrame(columns=POSSESSION_COLUMNS)
+
+    game = events["game_id"].to_numpy(np.int64)
+    period = events["period"].to_numpy(np.int64)
+    team = events["team_id"].to_numpy(np.int64)
+    elapsed = events["elapsed_seconds"].to_numpy(np.int64)
+    name = events["event"].to_numpy(object)
+    ids = events["id"].to_numpy(np.int64)
+
+    n = len(events)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = (
+        _changed(game)
+        | _changed(period)
+        | _changed(team)
+        | np.isin(name[1:], STARTING_EVENTS)
+        | np.isin(name[:-1], ENDING_EVENTS)
+    )
+    first = np.flatnonzero(starts)
+    last = np.r_[first[1:] - 1, n - 1]
+
+    # Runs until the next possession if that one continues the same period
+    follows = np.r_[~(_changed(game[first]) | _changed(period[first])), False]
+    end_elapsed = np.where(follows, elapsed[np.minimum(last + 1, n - 1)], elapsed[last])
+
+    # 1-based numbering within each game
+    new_game = np.r_[True, _changed(game[first])]
+    index = np.arange(len(first))
+    number = index - np.maximum.accumulate(np.where(new_game, index, 0)) + 1
+
+    x0 = pd.to_numeric(events["x_coordinate"].to_numpy()[first]).astype(float)
+    zone = np.select(
+        [x0 < BLUE_LINES[0], x0 <= BLUE_LINES[1], x0 > BLUE_LINES[1]], ZONES, default=None
+    )
+    last_name = name[last]
+    return pd.DataFrame(
+        {
+            "game_id": game[first],
+            "number": number,
+            "team_id": team[first],
+            "period": period[first],
+            "start_event_id": ids[first],
+            "end_event_id": ids[last],
+            "start_elapsed": elapsed[first],
+            "end_elapsed": end_elapsed,
+            "duration": end_elapsed - elapsed[first],
+            "events": last - first + 1,
+            "passes": _count(np.isin(name, PASS_EVENTS), first),
+            "shots": _count(np.isin(name, SHOT_EVENTS), first),
+            "entry_zone": zone,
+            "ended_in_shot": np.isin(last_name, SHOT_EVENTS),
+            "goal": last_name == "Goal",
+        },
+        columns=POSSESSION_COLUMNS,
+    )
@@ -0,0 +1,136 @@
+"""In-process cache of serialised endpoint responses.
+
+Entries hold the encoded body bytes of a response, keyed by its ETag (see
+:mod:`src.routes.caching`), which already covers the route, the normalised
+query string and the data versions the response depends on.  A stale entry
+can therefore never be served.  Writers still :func:`invalidate` the scopes
+they changed so memory is released right away instead of waiting for LRU
+eviction or the TTL.
+
+Compressed encodings of a body (see :mod:`src.core.compression`) are kept
+as *variants* of its entry, so hot responses are compressed once and dropped
+together with the plain body.
+
+The cache is bounded by the total size of the stored bodies and variants
+(``RESPONSE_CACHE_MAX_BYTES``; 0 disables it) and expires entries after
+``RESPONSE_CACHE_TTL`` seconds.  :meth:`ResponseCache.stats` reports
+hit/miss counters for sizing it.
+"""
+
+from __future__ import annotations
+
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from ..settings.config import settings
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """An encoded response body and the data scopes it was built from."""
+
+    body: bytes
+    media_type: str
+    scopes: frozenset[str]
+    expires_at: float
+    # Content-Encoding → encoded body
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(map(len, self.variants.values()))
+
+
+class ResponseCache:
+    """Byte-capped LRU of response bodies with a TTL and scope invalidation."""
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._items: OrderedDict[str, CachedBody] = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = self.variant_hits = 0
+
+    def get(self, key: str) -> CachedBody | None:
+        item = self._items.get(key)
+        if item is not None and item.expires_at <= time.monotonic():
+            self._drop(key)
+            item = None
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item
+
+    def put(self, key: str, body: bytes, media_type: str, scopes: frozenset[str]) -> None:
+        # Bodies larger than a quarter of the budget would evict too much
+        if not self.max_bytes or len(body) > self.max_bytes // 4:
+            return
+        if key in self._items:
+            self._drop(key)
+        self._items[key] = CachedBody(
+            body, media_type, scopes, time.monotonic() + self.ttl
+        )
+        self._bytes += len(body)
+        self._evict()
+
+    def variant(self, key: str, encoding: str) -> bytes | None:
+        """The *encoding* of a cached body, if both are present."""
+        item = self._items.get(key)
+        if item is None or item.expires_at <= time.monotonic():
+            return None
+        data = item.variants.get(encoding)
+        if data is not None:
+            self.variant_hits += 1
+        return data
+
+    def put_variant(self, key: str, encoding: str, data: bytes) -> None:
+        """Attach the *encoding* of the body cached under *key* (if any)."""
+        item = self._items.get(key)
+        if item is None or encoding in item.variants:
+            return
+        item.variants[encoding] = data
+        self._bytes += len(data)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._items)))
+            self.evictions += 1
+
+    def invalidate(self, *scopes: str) -> None:
+        """Drop entries built from any of *scopes* (everything without any)."""
+        if not scopes:
+            self._items.clear()
+            self._bytes = 0
+            return
+        changed = set(scopes)
+        for key in [k for k, v in self._items.items() if v.scopes & changed]:
+            self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._items.pop(key).size
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "variant_hits": self.variant_hits,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(settings.response_cache_max_bytes, settings.response_cache_ttl)
+
+
+def invalidate(*scopes: str) -> None:
+    """Forget cached responses built from *scopes* (all without any)."""
+    response_cache.invalidate(*scopes)
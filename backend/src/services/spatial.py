@@ -0,0 +1,164 @@
+"""Spatial grid index over event coordinates.
+
+The rink is split into :data:`CELL_SIZE`-feet cells, and every event stores
+the Z-order (Morton) key of its cell in ``events.spatial_cell``, which is
+indexed.  Interleaving the column and row bits keeps neighbouring cells at
+nearby keys, so a rectangle or circle is covered by a short list of
+contiguous key ranges (:func:`key_ranges`).  A query then scans only those
+ranges of the index and checks the exact shape on the few candidates from
+partly covered cells, instead of scanning every coordinate.  Areas that
+cover much of the rink (:data:`INDEX_MAX_SHARE`) match so many events that
+a plain scan is cheaper, so they skip the index.
+
+Coordinates are in the eventing team's attacking direction (the attacked
+net is at ``x = 189``), so :data:`ZONES` are defined once for both teams.
+"""
+
+from __future__ import annotations
+
+import math
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass
+
+from .density import RINK_LENGTH, RINK_WIDTH
+
+CELL_SIZE = 5
+X_CELLS = math.ceil(RINK_LENGTH / CELL_SIZE)
+Y_CELLS = math.ceil(RINK_WIDTH / CELL_SIZE)
+# Above this share of the rink's cells, scanning the table beats visiting
+# the key ranges (every match costs an index probe plus a row lookup)
+INDEX_MAX_SHARE = 0.25
+
+
+@dataclass(frozen=True)
+class Rect:
+    """Axis-aligned rectangle, bounds inclusive."""
+
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return (self.x_min <= x) & (x <= self.x_max) & (self.y_min <= y) & (y <= self.y_max)
+
+    def overlaps(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> np.ndarray:
+        """Whether the cells ``[x0, x1) × [y0, y1)`` intersect the shape."""
+        return (x0 <= self.x_max) & (x1 > self.x_min) & (y0 <= self.y_max) & (y1 > self.y_min)
+
+
+@dataclass(frozen=True)
+class Circle:
+    """Disc around ``(x, y)``, boundary inclusive."""
+
+    x: float
+    y: float
+    radius: float
+
+    def contains(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return (x - self.x) ** 2 + (y - self.y) ** 2 <= self.radius**2
+
+    def overlaps(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> np.ndarray:
+        # Distance from the centre to the nearest point of each cell
+        dx = np.clip(self.x, x0, x1) - self.x
+        dy = np.clip(self.y, y0, y1) - self.y
+        return dx**2 + dy**2 <= self.radius**2
+
+
+Shape = Rect | Circle
+
+# Named areas in attacking-direction coordinates.  The blue lines are at 75
+# and 125 ft, the goal line at 189 ft and the faceoff circles reach 154 ft.
+ZONES: dict[str, Shape] = {
+    "defensive_zone": Rect(0, 75, 0, RINK_WIDTH),
+    "neutral_zone": Rect(75, 125, 0, RINK_WIDTH),
+    "offensive_zone": Rect(125, RINK_LENGTH, 0, RINK_WIDTH),
+    # Between the faceoff dots, from the top of the circles to the goal line
+    "slot": Rect(154, 189, 20.5, 64.5),
+    "inner_slot": Rect(169, 189, 32.5, 52.5),
+    "high_slot": Rect(154, 169, 27.5, 57.5),
+    "crease": Circle(189, 42.5, 6),
+    # Strip inside the offensive blue line
+    "point": Rect(125, 140, 0, RINK_WIDTH),
+}
+
+
+def zone(name: str) -> Shape:
+    """The shape of zone *name*; raises :class:`ValueError` for unknown names."""
+    try:
+        return ZONES[name]
+    except KeyError:
+        raise ValueError(f"Unknown zone {name!r}: expected one of {', '.join(ZONES)}") from None
+
+
+def _spread(v: np.ndarray) -> np.ndarray:
+    # Insert a zero bit between the bits of 8-bit integers
+    v = (v | (v << 4)) & 0x0F0F
+    v = (v | (v << 2)) & 0x3333
+    return (v | (v << 1)) & 0x5555
+
+
+def morton(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+    """Z-order key of cell column *cx* and row *cy*."""
+    cx = np.asarray(cx, dtype=np.int64)
+    cy = np.asarray(cy, dtype=np.int64)
+    return _spread(cx) | (_spread(cy) << 1)
+
+
+def _cells(values: np.ndarray, count: int) -> np.ndarray:
+    # The far boundary belongs to the last cell
+    return np.clip(np.floor_divide(values, CELL_SIZE), 0, count - 1)
+
+
+def cell_key(x: float | None, y: float | None) -> int | None:
+    """Cell key of one coordinate pair, ``None`` without coordinates."""
+    if x is None or y is None:
+        return None
+    return int(morton(_cells(np.array(x), X_CELLS), _cells(np.array(y), Y_CELLS)))
+
+
+def cell_keys(x: pd.Series, y: pd.Series) -> pd.Series:
+    """Vectorised :func:`cell_key` returning nullable ``Int16``."""
+    xs = pd.to_numeric(x).astype("Float64")
+    ys = pd.to_numeric(y).astype("Float64")
+    missing = (xs.isna() | ys.isna()).to_numpy()
+    keys = morton(
+        _cells(xs.fillna(0).to_numpy(float), X_CELLS),
+        _cells(ys.fillna(0).to_numpy(float), Y_CELLS),
+    )
+    return pd.Series(keys, index=x.index).astype("Int16").mask(missing)
+
+
+def _bounds(cells: np.ndarray, count: int) -> tuple[np.ndarray, np.ndarray]:
+    # Coordinates are clipped into the border cells (the far boundary included),
+    # so those cells reach past the rink
+    lo = np.where(cells == 0, -np.inf, cells * float(CELL_SIZE))
+    hi = np.where(cells == count - 1, np.inf, (cells + 1) * float(CELL_SIZE))
+    return lo, hi
+
+
+def key_ranges(shape: Shape) -> list[tuple[int, int]]:
+    """Inclusive ``(low, high)`` key ranges of the cells *shape* touches."""
+    cx, cy = np.meshgrid(np.arange(X_CELLS), np.arange(Y_CELLS))
+    cx, cy = cx.ravel(), cy.ravel()
+    (x0, x1), (y0, y1) = _bounds(cx, X_CELLS), _bounds(cy, Y_CELLS)
+    hit = shape.overlaps(x0, y0, x1, y1)
+    keys = np.sort(morton(cx[hit], cy[hit]))
+    if not len(keys):
+        return []
+    # Split wherever consecutive keys are not adjacent
+    breaks = np.flatnonzero(np.diff(keys) > 1)
+    lows = np.r_[keys[0], keys[breaks + 1]]
+    highs = np.r_[keys[breaks], keys[-1]]
+    return [(int(lo), int(hi)) for lo, hi in zip(lows, highs)]
+
+
+def coverage(ranges: list[tuple[int, int]]) -> float:
+    """Share of the rink's cells in *ranges* (from :func:`key_ranges`)."""
+    return sum(hi - lo + 1 for lo, hi in ranges) / (X_CELLS * Y_CELLS)
@@ -0,0 +1,202 @@
+"""Expected-goals (xG) model for shots.
+
+A logistic regression over pre-shot features only – where the shot was
+taken from, how, and at which strength:
+
+* distance and angle to the centre of the attacked net,
+* shot type (``Detail 1``), traffic (``Detail 3``) and one-timer
+  (``Detail 4``),
+* skater advantage of the shooting team.
+
+``Detail 2`` (on net / missed / blocked) is the shot's outcome and is left
+out.  Coordinates are in the shooting team's attacking direction, so the
+net is always at the far end of the rink.
+
+The fitted :class:`XGModel` is persisted with joblib at
+``settings.xg_model_path``; :func:`get_model` shares the loaded artifact
+and reloads it when the file changes.  Scoring takes a frame of any number
+of shots and runs the pipeline once.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import joblib
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from ..settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the features change; artifacts of other versions are ignored
+FEATURE_VERSION = 1
+
+SHOT_EVENTS = ("Shot", "Goal")
+# Centre of the attacked net (goal line 11 ft from the end boards)
+NET_X, NET_Y = 189.0, 42.5
+
+# Input columns of :func:`features`
+SHOT_COLUMNS = (
+    "x_coordinate",
+    "y_coordinate",
+    "detail_1",
+    "detail_3",
+    "detail_4",
+    "own_skaters",
+    "opp_skaters",
+)
+
+_NUMERIC = ("distance", "angle", "skater_advantage")
+_FLAGS = ("traffic", "one_timer")
+_CATEGORICAL = ("shot_type",)
+
+# Fewer goals than this leave the coefficients meaningless
+MIN_GOALS = 5
+
+
+@dataclass
+class XGModel:
+    """A fitted xG pipeline and what it was trained on."""
+
+    pipeline: Pipeline
+    shots: int
+    goals: int
+    version: int = FEATURE_VERSION
+
+    def score(self, shots: pd.DataFrame) -> np.ndarray:
+        """Goal probability of every row of *shots* (:data:`SHOT_COLUMNS`)."""
+        if shots.empty:
+            return np.empty(0)
+        return self.pipeline.predict_proba(features(shots))[:, 1]
+
+
+def features(shots: pd.DataFrame) -> pd.DataFrame:
+    """Model features of *shots*; rows without coordinates get NaN distances."""
+    x = pd.to_numeric(shots["x_coordinate"]).to_numpy(float)
+    y = pd.to_numeric(shots["y_coordinate"]).to_numpy(float)
+    dx, dy = NET_X - x, y - NET_Y
+    return pd.DataFrame(
+        {
+            "distance": np.hypot(dx, dy),
+            # 0° straight on, 90° from the goal line, more from behind the net
+            "angle": np.degrees(np.abs(np.arctan2(dy, dx))),
+            "skater_advantage": (
+                pd.to_numeric(shots["own_skaters"]) - pd.to_numeric(shots["opp_skaters"])
+            ).to_numpy(float),
+            "traffic": (shots["detail_3"] == "t").to_numpy(float),
+            "one_timer": (shots["detail_4"] == "t").to_numpy(float),
+            "shot_type": shots["detail_1"].fillna("Unknown").astype(str).to_numpy(),
+        },
+        index=shots.index,
+    )
+
+
+def _usable(shots: pd.DataFrame) -> pd.Series:
+    return shots["x_coordinate"].notna() & shots["y_coordinate"].notna()
+
+
+def train(shots: pd.DataFrame, goals: pd.Series | np.ndarray) -> XGModel | None:
+    """Fit a model on *shots* labelled by *goals*; ``None`` without enough goals."""
+    usable = _usable(shots).to_numpy()
+    y = np.asarray(goals, dtype=bool)[usable]
+    if y.sum() < MIN_GOALS or y.all():
+        return None
+    pipeline = Pipeline(
+        [
+            (
+                "features",
+                ColumnTransformer(
+                    [
+                        ("numeric", StandardScaler(), list(_NUMERIC)),
+                        ("flags", "passthrough", list(_FLAGS)),
+                        (
+                            "shot_type",
+                            OneHotEncoder(handle_unknown="ignore"),
+                            list(_CATEGORICAL),
+                        ),
+                    ]
+                ),
+            ),
+            ("model", LogisticRegression(max_iter=1000)),
+        ]
+    )
+    pipeline.fit(features(shots[usable]), y)
+    return XGModel(pipeline, shots=len(y), goals=int(y.sum()))
+
+
+def score(model: XGModel | None, shots: pd.DataFrame) -> np.ndarray:
+    """xG of every row of *shots*; NaN without a model or coordinates."""
+    result = np.full(len(shots), np.nan)
+    usable = _usable(shots).to_numpy()
+    if model is not None and usable.any():
+        result[usable] = model.score(shots[usable])
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def save(model: XGModel, path: Path | None = None) -> Path:
+    """Write *model* to *path* (default ``settings.xg_model_path``)."""
+    path = Path(path or settings.xg_model_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    joblib.dump(model, tmp)
+    tmp.replace(path)
+    logger.info("Saved xG model (%d shots, %d goals) to %s", model.shots, model.goals, path)
+    return path
+
+
+def load(path: Path | None = None) -> XGModel | None:
+    """Read the model at *path*; ``None`` if missing or of another version."""
+    path = Path(path or settings.xg_model_path)
+    try:
+        model = joblib.load(path)
+    except FileNotFoundError:
+        return None
+    except Exception:  # pragma: no cover - corrupt or incompatible artifact
+        logger.warning("Ignoring unreadable xG model at %s", path, exc_info=True)
+        return None
+    if not isinstance(model, XGModel) or model.version != FEATURE_VERSION:
+        return None
+    return model
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+_model: XGModel | None = None
+_model_key: tuple | None = None
+_lock = threading.Lock()
+
+
+def get_model() -> XGModel | None:
+    """Return the shared model at ``settings.xg_model_path`` (``None`` if absent).
+
+    The artifact is read on first use and again only when the file changed.
+    """
+    global _model, _model_key
+    path = Path(settings.xg_model_path)
+    with _lock:
+        key = (path, _stat(path))
+        if key != _model_key:
+            _model = load(path) if key[1] is not None else None
+            _model_key = key
+        return _model
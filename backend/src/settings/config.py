@@ -1,9 +1,13 @@
-from typing import Any, Union
+from pathlib import Path
+from typing import Any, Literal, Union
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic.networks import PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# ``backend/data`` – default location of the source CSVs
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
 
 class Settings(BaseSettings):
     """Application settings with environment variable support.
@@ -27,6 +31,66 @@ class Settings(BaseSettings):
         alias="DATABASE_URL",
     )
 
+    # Engine profile – ``auto`` picks ``sqlite``/``postgres`` from the URL
+    # scheme; ``default`` uses SQLAlchemy's defaults without any tuning.
+    db_profile: Literal["auto", "sqlite", "postgres", "default"] = Field(
+        "auto", alias="DB_PROFILE"
+    )
+    # Connection pool (PostgreSQL profile)
+    db_pool_size: int = Field(10, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(20, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, gt=0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")
+    db_statement_timeout_ms: int = Field(30_000, ge=0, alias="DB_STATEMENT_TIMEOUT_MS")
+    # SQLite pragmas applied on every new connection (SQLite profile)
+    sqlite_journal_mode: str = Field("WAL", alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field("NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_mmap_size: int = Field(256 * 1024 * 1024, ge=0, alias="SQLITE_MMAP_SIZE")
+    # Negative values are KiB, positive values are pages (SQLite semantics)
+    sqlite_cache_size: int = Field(-64_000, alias="SQLITE_CACHE_SIZE")
+    sqlite_busy_timeout_ms: int = Field(5_000, ge=0, alias="SQLITE_BUSY_TIMEOUT_MS")
+
+    # Seeding – source CSVs and how they are applied on startup.  ``incremental``
+    # only touches the database when a source file changed, ``reset`` drops and
+    # reloads everything, ``skip`` leaves the database untouched.
+    dataset_csv: Path = Field(DATA_DIR / "olympic_womens_dataset.csv", alias="DATASET_CSV")
+    jersey_numbers_csv: Path = Field(
+        DATA_DIR / "womens_hockey_jersey_numbers.csv", alias="JERSEY_NUMBERS_CSV"
+    )
+    seed_mode: Literal["incremental", "reset", "skip"] = Field(
+        "incremental", alias="SEED_MODE"
+    )
+    # Rows per chunk when streaming the dataset CSV into the database
+    seed_chunk_size: int = Field(50_000, gt=0, alias="SEED_CHUNK_SIZE")
+    # Parsed source CSVs are cached here as Feather files; disable to always
+    # parse the CSV text (also the fallback when pyarrow is not installed)
+    dataset_cache: bool = Field(True, alias="DATASET_CACHE")
+    dataset_cache_dir: Path = Field(DATA_DIR / ".cache", alias="DATASET_CACHE_DIR")
+    # Cache files kept; entries of deleted sources are always dropped
+    dataset_cache_max_entries: int = Field(8, alias="DATASET_CACHE_MAX_ENTRIES")
+    # Fitted expected-goals model (joblib), retrained whenever seeding
+    # changes the events
+    xg_model_path: Path = Field(DATA_DIR / ".cache" / "xg_model.joblib", alias="XG_MODEL_PATH")
+
+    # Cache-Control sent with ETag-tagged responses; ``no-cache`` lets clients
+    # store them but revalidate (cheaply, via If-None-Match) on every use
+    http_cache_control: str = Field("no-cache", alias="HTTP_CACHE_CONTROL")
+    # In-process cache of encoded responses; 0 bytes disables it
+    response_cache_max_bytes: int = Field(
+        64 * 1024 * 1024, ge=0, alias="RESPONSE_CACHE_MAX_BYTES"
+    )
+    response_cache_ttl: float = Field(300.0, gt=0, alias="RESPONSE_CACHE_TTL")
+    # In-process cache of per-game derived data (timelines, pass edges)
+    game_cache_max_bytes: int = Field(64 * 1024 * 1024, ge=0, alias="GAME_CACHE_MAX_BYTES")
+
+    # Response compression, negotiated from Accept-Encoding (zstd or gzip);
+    # complete bodies below the minimum size are sent as they are
+    compression: bool = Field(True, alias="COMPRESSION")
+    compression_minimum_size: int = Field(1024, ge=0, alias="COMPRESSION_MINIMUM_SIZE")
+    compression_gzip_level: int = Field(6, ge=1, le=9, alias="COMPRESSION_GZIP_LEVEL")
+    compression_zstd_level: int = Field(3, ge=1, le=22, alias="COMPRESSION_ZSTD_LEVEL")
+
     # CORS settings - comma separated list of origins, defaults to local dev server
     allowed_origins: list[str] = Field(
         default_factory=lambda: [
@@ -0,0 +1,54 @@
+"""Parsing of the dataset's ``M:SS`` game-clock strings.
+
+The clock counts down within a period.  *Elapsed* game time counts up from
+the opening face-off over :data:`PERIOD_SECONDS`-long periods; overtime is
+treated as a full-length period, so elapsed time stays monotonic.
+"""
+
+import re
+import pandas as pd
+
+PERIOD_SECONDS = 20 * 60
+REGULATION_PERIODS = 3
+
+_CLOCK = re.compile(r"^\s*(\d{1,2}):([0-5]\d)\s*$")
+
+
+def parse_clock(clock: str | None) -> int | None:
+    """Return the seconds left on an ``M:SS`` *clock*, or ``None`` if invalid."""
+    match = _CLOCK.match(clock) if clock else None
+    if match is None:
+        return None
+    return int(match[1]) * 60 + int(match[2])
+
+
+def clock_seconds(clock: pd.Series) -> pd.Series:
+    """Vectorised :func:`parse_clock` returning nullable ``Int16``."""
+    parts = clock.astype("string").str.extract(_CLOCK.pattern)
+    minutes = pd.to_numeric(parts[0]).astype("Int16")
+    seconds = pd.to_numeric(parts[1]).astype("Int16")
+    return minutes * 60 + seconds
+
+
+def parse_elapsed(period: int | None, clock: str | None) -> int | None:
+    """Return the game seconds elapsed at *clock* in *period*, or ``None``."""
+    left = parse_clock(clock)
+    if left is None or period is None:
+        return None
+    return (period - 1) * PERIOD_SECONDS + PERIOD_SECONDS - left
+
+
+def elapsed_seconds(period: pd.Series, seconds_left: pd.Series) -> pd.Series:
+    """Vectorised :func:`parse_elapsed` from periods and :func:`clock_seconds`."""
+    period = pd.to_numeric(period).astype("Int32")
+    return period * PERIOD_SECONDS - seconds_left.astype("Int32")
+
+
+def format_elapsed(elapsed: int) -> tuple[int, str]:
+    """Inverse of :func:`parse_elapsed`: ``(period, "M:SS")`` at *elapsed*.
+
+    A period boundary belongs to the period that ends there (``0:00``).
+    """
+    period = max(1, -(-elapsed // PERIOD_SECONDS))
+    left = period * PERIOD_SECONDS - elapsed
+    return period, f"{left // 60}:{left % 60:02d}"
@@ -0,0 +1,38 @@
+"""Shared pytest configuration.
+
+Settings are read from the environment the first time ``src`` is imported, so
+the test database and dataset locations are configured here – before any test
+module imports the application.  The dataset is a handful of complete games
+from ``data/games`` so multi-game code paths are exercised while the suite
+stays fast.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+TMP_DIR = Path(tempfile.mkdtemp(prefix="bigdatacup-tests-"))
+DATASET_CSV = TMP_DIR / "dataset.csv"
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR / 'test.db'}"
+os.environ["DATASET_CSV"] = str(DATASET_CSV)
+os.environ["DATASET_CACHE_DIR"] = str(TMP_DIR / "cache")
+os.environ["XG_MODEL_PATH"] = str(TMP_DIR / "xg_model.joblib")
+
+pd.concat(
+    pd.read_csv(path) for path in sorted((DATA_DIR / "games").glob("*.csv"))[:3]
+).to_csv(DATASET_CSV, index=False)
+
+
+@pytest.fixture(scope="session")
+def seeded_db() -> None:
+    """Reset the test database and seed it from :data:`DATASET_CSV` once."""
+    from src.db.seed import reset_and_seed_db
+
+    reset_and_seed_db()
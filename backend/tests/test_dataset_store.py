@@ -0,0 +1,128 @@
+"""Tests for the shared in-memory dataset store and its columnar cache."""
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+
+from src.services.columnar_cache import cache_path, load_cached
+from src.services.dataset_store import (
+    COLUMN_MAP,
+    FRAME_VERSION,
+    get_store,
+    iter_csv_chunks,
+    parse_csv,
+)
+from src.settings.config import settings
+
+from .conftest import DATASET_CSV
+
+
+def test_store_is_compact_and_indexed_by_game() -> None:
+    store = get_store()
+    raw = pd.read_csv(DATASET_CSV)
+
+    assert len(store) == len(raw)
+    assert list(store.frame.columns) == list(COLUMN_MAP.values())
+    assert store.frame["team"].dtype == "category"
+    assert store.frame["x_coordinate"].dtype == "Int16"
+
+    game_date, home, away = store.games[0]
+    expected = raw[
+        (raw["game_date"] == game_date)
+        & (raw["Home Team"] == home)
+        & (raw["Away Team"] == away)
+    ]
+    assert len(store.game_frame(game_date, home, away)) == len(expected)
+    assert store.game_frame("1900-01-01", home, away).empty
+
+
+def test_store_is_shared_until_the_file_changes(tmp_path, monkeypatch) -> None:
+    assert get_store() is get_store()
+
+    subset = tmp_path / "subset.csv"
+    pd.read_csv(DATASET_CSV).head(10).to_csv(subset, index=False)
+    monkeypatch.setattr(settings, "dataset_csv", subset)
+    assert len(get_store()) == 10
+
+
+def test_columnar_cache_skips_parsing_until_the_source_changes(tmp_path) -> None:
+    source = tmp_path / "source.csv"
+    pd.read_csv(DATASET_CSV).head(50).to_csv(source, index=False)
+    calls = []
+
+    def parse(path):
+        calls.append(path)
+        return parse_csv(path)
+
+    first = load_cached(source, parse, FRAME_VERSION)
+    assert cache_path(source).exists()
+    cached = load_cached(source, parse, FRAME_VERSION)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(cached, first)
+
+    # Touching the file without changing its content keeps the cache valid
+    os.utime(source, ns=(0, 0))
+    load_cached(source, parse, FRAME_VERSION)
+    assert len(calls) == 1
+
+    pd.read_csv(DATASET_CSV).head(20).to_csv(source, index=False)
+    assert len(load_cached(source, parse, FRAME_VERSION)) == 20
+    assert len(calls) == 2
+
+    load_cached(source, parse, "other-version")
+    assert len(calls) == 3
+
+
+def test_csv_chunks_match_the_parsed_frame() -> None:
+    """Seeding's streamed chunks carry the values, dtypes and row hashes of the store."""
+    frame = parse_csv(DATASET_CSV)
+    chunks = list(iter_csv_chunks(DATASET_CSV, 500))
+    assert sum(len(c) for c in chunks) == len(frame)
+    for chunk in chunks:
+        expected = frame.loc[chunk.index]
+        assert (chunk.dtypes.astype(str) == expected.dtypes.astype(str)).all()
+        pd.testing.assert_frame_equal(chunk.astype(object), expected.astype(object))
+        assert (
+            pd.util.hash_pandas_object(chunk, index=False)
+            == pd.util.hash_pandas_object(expected, index=False)
+        ).all()
+
+
+def test_chat_agents_are_rebuilt_when_the_store_reloads(tmp_path, monkeypatch) -> None:
+    from src.services import pandas_service
+
+    monkeypatch.setattr(
+        pandas_service, "create_pandas_dataframe_agent", lambda llm, df, **kwargs: df
+    )
+    source = tmp_path / "source.csv"
+    raw = pd.read_csv(DATASET_CSV)
+    raw.head(30).to_csv(source, index=False)
+    monkeypatch.setattr(settings, "dataset_csv", source)
+    game = dict(zip(("game_date", "home_team", "away_team"), get_store().games[0]))
+
+    first = pandas_service._create_agent_for_game(game)
+    assert pandas_service._create_agent_for_game(game) is first
+    raw.head(40).to_csv(source, index=False)
+    assert len(pandas_service._create_agent_for_game(game)) == 40 > len(first)
+
+
+def test_columnar_cache_prunes_stale_and_excess_entries(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "dataset_cache_dir", tmp_path / "cache")
+    monkeypatch.setattr(settings, "dataset_cache_max_entries", 2)
+    sources = [tmp_path / f"source{i}.csv" for i in range(4)]
+    for source in sources[:2]:
+        pd.read_csv(DATASET_CSV).head(5).to_csv(source, index=False)
+        load_cached(source, parse_csv, FRAME_VERSION)
+
+    # The deleted source's entry goes, the live one stays
+    sources[0].unlink()
+    pd.read_csv(DATASET_CSV).head(5).to_csv(sources[2], index=False)
+    load_cached(sources[2], parse_csv, FRAME_VERSION)
+    assert [cache_path(s).exists() for s in sources[:3]] == [False, True, True]
+    assert not cache_path(sources[0]).with_suffix(".json").exists()
+
+    # Beyond the cap, the oldest entry goes
+    pd.read_csv(DATASET_CSV).head(5).to_csv(sources[3], index=False)
+    load_cached(sources[3], parse_csv, FRAME_VERSION)
+    assert [cache_path(s).exists() for s in sources[1:]] == [False, True, True]
@@ -0,0 +1,364 @@
+"""Integration tests for the event listing and CRUD endpoints."""
+from __future__ import annotations
+
+from typing import Any
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.response_cache import ResponseCache, response_cache
+
+from .conftest import DATASET_CSV
+from .test_games_endpoints import check_box_score, check_possessions
+
+client = TestClient(app)
+
+NEW_EVENT: dict[str, Any] = {
+    "game_date": "2018-02-11",
+    "home_team": "Olympic (Women) - Canada",
+    "away_team": "Olympic (Women) - Olympic Athletes from Russia",
+    "period": 2,
+    "clock": "12:34",
+    "home_team_skaters": 5,
+    "away_team_skaters": 4,
+    "home_team_goals": 1,
+    "away_team_goals": 0,
+    "team": "Olympic (Women) - Canada",
+    "player": "Brand New Player",
+    "event": "Shot",
+    "x_coordinate": 170,
+    "y_coordinate": 40,
+    "detail_1": "Snapshot",
+    "detail_2": "On Net",
+    "detail_3": "f",
+    "detail_4": "t",
+    "player_2": None,
+    "x_coordinate_2": None,
+    "y_coordinate_2": None,
+}
+
+
+def _new_event_game_id() -> int:
+    return next(
+        g["id"]
+        for g in client.get("/games").json()
+        if (g["game_date"], g["home_team"], g["away_team"])
+        == (NEW_EVENT["game_date"], NEW_EVENT["home_team"], NEW_EVENT["away_team"])
+    )
+
+
+def test_list_event_types(seeded_db) -> None:
+    resp = client.get("/events/types")
+    assert resp.status_code == 200
+    assert resp.json() == sorted(pd.read_csv(DATASET_CSV)["Event"].unique())
+
+
+def test_event_crud_round_trip(seeded_db) -> None:
+    created = client.post("/events", json=NEW_EVENT)
+    assert created.status_code == 200
+    body = created.json()
+    assert {k: body[k] for k in NEW_EVENT} == NEW_EVENT
+
+    event_id = body["id"]
+    assert client.get(f"/events/{event_id}").json() == body
+
+    updated = client.put(f"/events/{event_id}", json=NEW_EVENT | {"event": "Goal", "player_2": "Someone Else"})
+    assert updated.status_code == 200
+    assert updated.json()["event"] == "Goal"
+    assert updated.json()["player_2"] == "Someone Else"
+
+    assert client.delete(f"/events/{event_id}").status_code == 204
+    assert client.get(f"/events/{event_id}").status_code == 404
+
+
+def test_bulk_edit_round_trip(seeded_db) -> None:
+    creates = [NEW_EVENT | {"clock": f"1{i}:00", "player": f"Bulk Player {i}"} for i in range(3)]
+    created = client.post("/events/bulk", json={"create": creates})
+    assert created.status_code == 200
+    body = created.json()
+    assert body["applied"] and [i["status"] for i in body["items"]] == ["created"] * 3
+    ids = [i["id"] for i in body["items"]]
+    assert client.get(f"/events/{ids[1]}").json()["player"] == "Bulk Player 1"
+    assert "Bulk Player 2" in {p["name"] for p in client.get("/players").json()}
+
+    edit = {
+        "update": [
+            {"id": ids[0], "event": "Goal", "clock": "5:00"},
+            # Moves the event to the Canada - Finland game (home team is kept)
+            {"id": ids[1], "game_date": "2018-02-13", "away_team": "Olympic (Women) - Finland"},
+        ],
+        "delete": [ids[2]],
+    }
+    # An unknown id rejects the whole edit
+    rejected = client.post("/events/bulk", json=edit | {"delete": [ids[2], 10**9]})
+    assert rejected.status_code == 409
+    assert rejected.json()["items"][-1] == {"op": "delete", "index": 1, "id": 10**9, "status": "not_found"}
+    assert client.get(f"/events/{ids[2]}").status_code == 200
+
+    applied = client.post("/events/bulk", json=edit)
+    assert [i["status"] for i in applied.json()["items"]] == ["updated", "updated", "deleted"]
+    goal = client.get(f"/events/{ids[0]}").json()
+    # Elapsed time is re-derived from the kept period and the new clock
+    assert (goal["event"], goal["elapsed_seconds"]) == ("Goal", 1200 + 900)
+    moved = client.get(f"/events/{ids[1]}").json()
+    assert (moved["game_date"], moved["home_team"], moved["away_team"], moved["clock"]) == (
+        "2018-02-13", NEW_EVENT["home_team"], "Olympic (Women) - Finland", "11:00"
+    )
+    assert len(client.get("/games").json()) == 3
+    assert client.get(f"/events/{ids[2]}").status_code == 404
+
+    assert client.post("/events/bulk", json={"update": [{"id": ids[0], "team": None}]}).status_code == 422
+    client.post("/events/bulk", json={"delete": ids[:2]})
+
+
+def test_blank_player_names_are_rejected_before_writing(seeded_db) -> None:
+    url = f"/games/{_new_event_game_id()}/events"
+    before = client.get(url)
+    event_id = before.json()[0]["id"]
+    for player in ("", "   "):
+        assert client.post("/events", json=NEW_EVENT | {"player": player}).status_code == 422
+        put = client.put(f"/events/{event_id}", json=NEW_EVENT | {"player": player})
+        assert put.status_code == 422
+        for edit in (
+            {"create": [NEW_EVENT, NEW_EVENT | {"player": player}]},
+            {"update": [{"id": event_id, "player": player}]},
+        ):
+            assert client.post("/events/bulk", json=edit).status_code == 422
+    # Nothing was written, so the game's version did not move
+    after = client.get(url, headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 304
+
+
+def test_event_writes_keep_derived_tables_current(seeded_db) -> None:
+    game_id = _new_event_game_id()
+
+    def _check() -> None:
+        box = client.get(f"/games/{game_id}/boxscore").json()
+        events = client.get(f"/games/{game_id}/events").json()
+        check_box_score(box, events)
+        check_possessions(game_id)
+
+    created = client.post("/events", json=NEW_EVENT | {"event": "Goal", "player": "Box Score Player"}).json()
+    player_id = next(
+        p["player_id"]
+        for p in client.get(f"/games/{game_id}/boxscore").json()["players"]
+        if p["player"] == "Box Score Player"
+    )
+    totals = client.get(f"/players/{player_id}/stats").json()["totals"]
+    assert (totals["events"], totals["goals"], totals["shots"]) == (1, 1, 1)
+    _check()
+
+    client.put(f"/events/{created['id']}", json=NEW_EVENT | {"event": "Takeaway", "player": "Box Score Player"})
+    totals = client.get(f"/players/{player_id}/stats").json()["totals"]
+    assert (totals["goals"], totals["takeaways"]) == (0, 1)
+    _check()
+
+    bulk = client.post(
+        "/events/bulk",
+        json={
+            "create": [NEW_EVENT | {"event": "Faceoff Win"}] * 3,
+            "update": [{"id": created["id"], "team": NEW_EVENT["away_team"]}],
+        },
+    ).json()
+    _check()
+    client.post("/events/bulk", json={"delete": [i["id"] for i in bulk["items"] if i["op"] == "create"]})
+    client.delete(f"/events/{created['id']}")
+    assert client.get(f"/players/{player_id}/stats").json()["games"] == []
+    _check()
+
+
+def test_event_changes_invalidate_density_grids(seeded_db) -> None:
+    created = client.post("/events", json=NEW_EVENT).json()
+    game_id = _new_event_game_id()
+    url, params = f"/games/{game_id}/shot-density", {"mode": "grid"}
+    before = client.get(url, params=params).json()["total"]
+
+    client.delete(f"/events/{created['id']}")
+    assert client.get(url, params=params).json()["total"] == before - 1
+
+
+def test_event_changes_move_etags(seeded_db) -> None:
+    created = client.post("/events", json=NEW_EVENT).json()
+    game_id = _new_event_game_id()
+    other_id = next(g["id"] for g in client.get("/games").json() if g["id"] != game_id)
+    url, other_url = f"/games/{game_id}/events", f"/games/{other_id}/events"
+
+    first = client.get(url)
+    tag, other_tag = first.headers["etag"], client.get(other_url).headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+    revalidated = client.get(url, headers={"If-None-Match": tag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == tag
+    assert not revalidated.content
+
+    client.delete(f"/events/{created['id']}")
+    assert client.get(url, headers={"If-None-Match": tag}).status_code == 200
+    # Other games keep their tags
+    assert client.get(other_url, headers={"If-None-Match": other_tag}).status_code == 304
+
+
+def test_response_cache_serves_until_the_game_changes(seeded_db) -> None:
+    created = client.post("/events", json=NEW_EVENT).json()
+    game_id = _new_event_game_id()
+    url = f"/games/{game_id}/events"
+
+    first = client.get(url)
+    hits = response_cache.stats()["hits"]
+    assert client.get(url).content == first.content
+    assert response_cache.stats()["hits"] == hits + 1
+    assert client.get("/health/cache").json()["entries"] >= 1
+
+    client.delete(f"/events/{created['id']}")
+    after = client.get(url).json()
+    assert len(after) == len(first.json()) - 1
+    assert response_cache.stats()["hits"] == hits + 1
+
+
+def test_response_cache_is_byte_capped_lru() -> None:
+    cache = ResponseCache(max_bytes=40, ttl=60)
+    for key in "abcd":
+        cache.put(key, b"x" * 10, "text/plain", frozenset({key}))
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("e", b"x" * 10, "text/plain", frozenset())
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 30
+
+
+def test_aggregate_groups_across_games(seeded_db) -> None:
+    dataset = pd.read_csv(DATASET_CSV)
+    located = dataset[dataset["X Coordinate"].notna() & dataset["Y Coordinate"].notna()]
+    shots_goals = located[located["Event"].isin(["Shot", "Goal"])]
+
+    resp = client.get(
+        "/events/aggregate",
+        params={"event": ["Shot", "Goal"], "group_by": ["event"], "bins": 10},
+    )
+    assert resp.status_code == 200
+    groups = {g["group"]["event"]: g["grid"] for g in resp.json()}
+    expected = shots_goals["Event"].value_counts()
+    assert {k: v["total"] for k, v in groups.items()} == expected.to_dict()
+    assert sum(map(sum, groups["Shot"]["values"])) == expected["Shot"]
+
+    # Strength is taken from the eventing team's side of the game
+    is_home = shots_goals["Team"] == shots_goals["Home Team"]
+    own = shots_goals["Home Team Skaters"].where(is_home, shots_goals["Away Team Skaters"])
+    opp = shots_goals["Away Team Skaters"].where(is_home, shots_goals["Home Team Skaters"])
+    pp = client.get(
+        "/events/aggregate",
+        params={"event": ["Shot", "Goal"], "strength": "powerplay"},
+    ).json()
+    assert sum(g["grid"]["total"] for g in pp) == (own > opp).sum()
+
+
+def test_aggregate_rejects_unknown_strength(seeded_db) -> None:
+    resp = client.get("/events/aggregate", params={"strength": "lots"})
+    assert resp.status_code == 422
+
+
+def test_list_events_keyset_pages(seeded_db) -> None:
+    dataset = pd.read_csv(DATASET_CSV)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 1000} | ({"cursor": cursor} if cursor else {})
+        page = client.get("/events", params=params).json()
+        seen += [e["id"] for e in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(dataset)
+    assert seen == sorted(seen)
+
+
+def test_list_events_filters(seeded_db) -> None:
+    dataset = pd.read_csv(DATASET_CSV)
+    clock = dataset["Clock"].str.split(":", expand=True).astype(int)
+    remaining = clock[0] * 60 + clock[1]
+    expected = dataset[
+        (dataset["Event"] == "Shot")
+        & (dataset["Period"] == 3)
+        & remaining.between(60, 300)
+    ]
+    page = client.get(
+        "/events",
+        params={
+            "event": "Shot",
+            "period": 3,
+            "clock_from": "5:00",
+            "clock_to": "1:00",
+            "limit": 1000,
+        },
+    ).json()
+    assert len(page["items"]) == len(expected)
+    assert {e["event"] for e in page["items"]} == {"Shot"}
+
+
+def test_list_events_rejects_bad_input(seeded_db) -> None:
+    assert client.get("/events", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/events", params={"clock_from": "25"}).status_code == 422
+
+
+def _spatial_ids(params: dict) -> list[int]:
+    ids, cursor = [], None
+    while True:
+        paging = {"limit": 1000} | ({"cursor": cursor} if cursor else {})
+        page = client.get("/events/spatial", params=params | paging).json()
+        ids += [e["id"] for e in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_spatial_queries_match_a_full_scan(seeded_db) -> None:
+    events = pd.concat(
+        pd.DataFrame(client.get(f"/games/{g['id']}/events").json())
+        for g in client.get("/games").json()
+    )
+    x, y = events["x_coordinate"], events["y_coordinate"]
+    cases = [
+        (
+            {"zone": "slot", "event": "Shot"},
+            x.between(154, 189) & y.between(20.5, 64.5) & (events["event"] == "Shot"),
+        ),
+        ({"zone": "offensive_zone"}, x.between(125, 200)),
+        ({"x": 189, "y": 42, "radius": 10}, (x - 189) ** 2 + (y - 42) ** 2 <= 100),
+        ({"x_min": 0, "x_max": 20, "y_min": 0, "y_max": 10}, x.between(0, 20) & y.between(0, 10)),
+        # Rectangles on the rink's far boundaries (clipped into the last cells)
+        ({"x_min": 200, "x_max": 200, "y_min": 0, "y_max": 85}, x == 200),
+        ({"x_min": 0, "x_max": 200, "y_min": 85, "y_max": 85}, y == 85),
+        ({"x": 200, "y": 85, "radius": 15}, (x - 200) ** 2 + (y - 85) ** 2 <= 225),
+    ]
+    for params, expected in cases:
+        ids = _spatial_ids(params)
+        assert ids == sorted(events.loc[expected, "id"]), params
+        assert ids
+
+
+def test_spatial_index_follows_event_writes(seeded_db) -> None:
+    near = {"x": NEW_EVENT["x_coordinate"], "y": NEW_EVENT["y_coordinate"], "radius": 0.5}
+    created = client.post("/events", json=NEW_EVENT).json()
+    assert created["id"] in _spatial_ids(near)
+
+    client.put(f"/events/{created['id']}", json=NEW_EVENT | {"x_coordinate": 20})
+    assert created["id"] not in _spatial_ids(near)
+    assert created["id"] in _spatial_ids(near | {"x": 20})
+
+    # A patch of one coordinate keeps the other
+    client.post("/events/bulk", json={"update": [{"id": created["id"], "y_coordinate": 80}]})
+    assert created["id"] in _spatial_ids({"x": 20, "y": 80, "radius": 0.5})
+    client.delete(f"/events/{created['id']}")
+
+
+def test_spatial_rejects_ambiguous_areas(seeded_db) -> None:
+    for params in (
+        {},
+        {"zone": "slot", "x": 1, "y": 1, "radius": 2},
+        {"zone": "somewhere"},
+        {"x_min": 0, "x_max": 10},
+        {"x_min": 10, "x_max": 0, "y_min": 0, "y_max": 10},
+        {"x": 1, "y": 1},
+        {"x": 1, "y": 1, "radius": 0},
+    ):
+        assert client.get("/events/spatial", params=params).status_code == 422, params
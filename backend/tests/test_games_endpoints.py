@@ -0,0 +1,389 @@
+"""Integration tests for the game endpoints against the seeded test database."""
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src.db import versions
+from src.db.box_scores import STAT_EVENTS
+from src.db.database import SessionLocal
+from src.main import app
+from src.models import Event
+from src.schemas import EventSchema
+from src.services import xg
+from src.utils.clock import PERIOD_SECONDS, REGULATION_PERIODS, parse_elapsed
+
+from .conftest import DATASET_CSV
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def dataset(seeded_db) -> pd.DataFrame:
+    return pd.read_csv(DATASET_CSV)
+
+
+@pytest.fixture(scope="module")
+def game(dataset) -> dict:
+    games = client.get("/games").json()
+    assert len(games) == len(dataset[["game_date", "Home Team", "Away Team"]].drop_duplicates())
+    return games[0]
+
+
+def _game_rows(dataset: pd.DataFrame, game: dict) -> pd.DataFrame:
+    return dataset[
+        (dataset["game_date"] == game["game_date"])
+        & (dataset["Home Team"] == game["home_team"])
+        & (dataset["Away Team"] == game["away_team"])
+    ]
+
+
+def test_game_events(dataset, game) -> None:
+    resp = client.get(f"/games/{game['id']}/events")
+    assert resp.status_code == 200
+    events = resp.json()
+    assert len(events) == len(_game_rows(dataset, game))
+    assert {e["home_team"] for e in events} == {game["home_team"]}
+
+
+def test_game_shot_density(dataset, game) -> None:
+    rows = _game_rows(dataset, game)
+    resp = client.get(f"/games/{game['id']}/shot-density")
+    assert resp.status_code == 200
+    assert len(resp.json()) == (rows["Event"] == "Shot").sum()
+
+
+def test_game_events_time_windows(game) -> None:
+    url = f"/games/{game['id']}/events"
+    events = client.get(url).json()
+    assert all(
+        e["elapsed_seconds"] == parse_elapsed(e["period"], e["clock"]) for e in events
+    )
+
+    # Adjacent half-open windows partition the game
+    edges = [0, 600, 1200, 2400, 4000]
+    windows = [
+        client.get(url, params={"from": lo, "to": hi}).json()
+        for lo, hi in zip(edges, edges[1:])
+    ]
+    assert [e["id"] for w in windows for e in w] == [e["id"] for e in events]
+    assert all(600 <= e["elapsed_seconds"] < 1200 for e in windows[1])
+    assert client.get(url, params={"from": 60, "to": 30}).status_code == 422
+
+
+def test_game_state_matches_a_replay(game) -> None:
+    url = f"/games/{game['id']}/state"
+    events = sorted(
+        client.get(f"/games/{game['id']}/events").json(),
+        key=lambda e: (e["elapsed_seconds"], e["id"]),
+    )
+    for t in (1500, 2999, 3600):
+        played = [e for e in events if e["elapsed_seconds"] <= t]
+        last = played[-1]
+        is_home = [e["team"] == game["home_team"] for e in played]
+        state = client.get(url, params={"t": t}).json()
+
+        assert (state["events"], state["last_event_id"]) == (len(played), last["id"])
+        home_scored = last["event"] == "Goal" and is_home[-1]
+        away_scored = last["event"] == "Goal" and not is_home[-1]
+        assert state["home"]["goals"] == last["home_team_goals"] + home_scored
+        assert state["away"]["goals"] == last["away_team_goals"] + away_scored
+        assert state["away"]["skaters"] == last["away_team_skaters"]
+        assert state["home"]["shots"] == sum(
+            h and e["event"] in ("Shot", "Goal") for e, h in zip(played, is_home)
+        )
+        assert state["away"]["faceoffs"] == sum(
+            not h and e["event"] == "Faceoff Win" for e, h in zip(played, is_home)
+        )
+
+    start = client.get(url, params={"t": 0}).json()
+    assert start["period"] == 1 and start["clock"] == "20:00"
+    end = max(REGULATION_PERIODS, max(e["period"] for e in events)) * PERIOD_SECONDS
+    final = client.get(url, params={"t": end}).json()
+    assert (final["events"], final["clock"]) == (len(events), "0:00")
+    assert client.get(url, params={"t": end + 1}).status_code == 422
+    assert client.get("/games/999999/state", params={"t": 0}).status_code == 404
+
+
+def test_game_state_follows_writes_of_other_workers(game) -> None:
+    """Cached timelines are tied to the game's data version, not to local invalidation."""
+    url, params = f"/games/{game['id']}/state", {"t": 3 * PERIOD_SECONDS}
+    before = client.get(url, params=params).json()
+
+    # A write committed elsewhere bumps the version but never reaches this
+    # process's invalidation hooks
+    with SessionLocal() as session:
+        last = session.get(Event, before["last_event_id"])
+        copy = Event(
+            **{c.name: getattr(last, c.name) for c in Event.__table__.c if c.name != "id"}
+        )
+        copy.source_row_hash = None
+        session.add(copy)
+        versions.bump(session, [versions.game_scope(game["id"])])
+        session.commit()
+        try:
+            assert client.get(url, params=params).json()["events"] == before["events"] + 1
+        finally:
+            session.delete(copy)
+            versions.bump(session, [versions.game_scope(game["id"])])
+            session.commit()
+    assert client.get(url, params=params).json() == before
+
+
+def check_box_score(box: dict, events: list[dict]) -> None:
+    """Assert *box*'s team stat lines equal a replay of the raw *events*."""
+    teams: dict[str, dict[str, float]] = {}
+    for e in events:
+        line = teams.setdefault(e["team"], dict.fromkeys([*STAT_EVENTS, "xg"], 0))
+        for stat, names in STAT_EVENTS.items():
+            line[stat] += names is None or e["event"] in names
+        line["xg"] += e["xg"] or 0.0
+    assert {t["team"] for t in box["teams"]} == set(teams)
+    for t in box["teams"]:
+        assert t["stats"] == pytest.approx(teams[t["team"]])
+
+
+def test_game_box_score(dataset, game) -> None:
+    box = client.get(f"/games/{game['id']}/boxscore").json()
+    events = client.get(f"/games/{game['id']}/events").json()
+    check_box_score(box, events)
+    assert sum(t["stats"]["xg"] for t in box["teams"]) > 0
+
+    rows = _game_rows(dataset, game)
+    shots = rows[rows["Event"].isin(["Shot", "Goal"])].groupby("Player").size()
+    by_player = {p["player"]: p["stats"] for p in box["players"]}
+    assert {name: by_player[name]["shots"] for name in shots.index} == shots.to_dict()
+    assert sum(p["stats"]["events"] for p in box["players"]) == len(rows)
+
+    player = box["players"][0]
+    stats = client.get(f"/players/{player['player_id']}/stats").json()
+    line = next(g for g in stats["games"] if g["game_id"] == game["id"])
+    assert line["stats"] == player["stats"]
+    assert stats["totals"]["events"] == sum(g["stats"]["events"] for g in stats["games"])
+    assert client.get("/players/999999/stats").status_code == 404
+
+
+def check_possessions(game_id: int) -> list[dict]:
+    """Assert the stored possessions of *game_id* split its puck events."""
+    possessions = client.get(f"/games/{game_id}/possessions").json()
+    events = sorted(
+        (e for e in client.get(f"/games/{game_id}/events").json() if e["event"] != "Penalty Taken"),
+        key=lambda e: (e["elapsed_seconds"], e["id"]),
+    )
+    assert [p["number"] for p in possessions] == list(range(1, len(possessions) + 1))
+    assert sum(p["events"] for p in possessions) == len(events)
+
+    i = 0
+    for p in possessions:
+        run = events[i : i + p["events"]]
+        i += p["events"]
+        assert (run[0]["id"], run[-1]["id"]) == (p["start_event_id"], p["end_event_id"])
+        assert {e["team"] for e in run} == {p["team"]}
+        assert {e["period"] for e in run} == {p["period"]}
+        # Faceoff wins only open, shots only close a possession
+        assert all(e["event"] != "Faceoff Win" for e in run[1:])
+        assert all(e["event"] not in ("Shot", "Goal") for e in run[:-1])
+        assert p["shots"] == p["ended_in_shot"] == (run[-1]["event"] in ("Shot", "Goal"))
+        assert p["passes"] == sum(e["event"] in ("Play", "Incomplete Play") for e in run)
+        assert p["duration"] == p["end_elapsed"] - p["start_elapsed"] >= 0
+    return possessions
+
+
+def test_game_possessions(game) -> None:
+    possessions = check_possessions(game["id"])
+    box = client.get(f"/games/{game['id']}/boxscore").json()
+    for team in box["teams"]:
+        own = [p for p in possessions if p["team"] == team["team"]]
+        assert sum(p["shots"] for p in own) == team["stats"]["shots"]
+        assert sum(p["goal"] for p in own) == team["stats"]["goals"]
+        filtered = client.get(f"/games/{game['id']}/possessions", params={"team": team["team"]})
+        assert filtered.json() == own
+    assert {p["entry_zone"] for p in possessions} <= {"defensive", "neutral", "offensive", None}
+    assert client.get("/games/999999/possessions").status_code == 404
+
+
+def test_game_pass_network(dataset, game) -> None:
+    network = client.get(f"/games/{game['id']}/pass-network").json()
+    names = {n["player_id"]: n["player"] for n in network["nodes"]}
+    plays = _game_rows(dataset, game)
+    plays = plays[(plays["Event"] == "Play") & plays["Player 2"].notna()]
+    expected = plays.groupby(["Player", "Player 2"]).size().to_dict()
+    assert {
+        (names[e["passer_id"]], names[e["receiver_id"]]): e["passes"] for e in network["edges"]
+    } == expected
+
+    made = plays["Player"].value_counts().to_dict()
+    assert {n["player"]: n["passes_made"] for n in network["nodes"] if n["passes_made"]} == made
+    for team in {n["team"] for n in network["nodes"]}:
+        nodes = [n for n in network["nodes"] if n["team"] == team]
+        assert sum(n["pagerank"] for n in nodes) == pytest.approx(1, abs=1e-3)
+        assert all(0 <= n[m] <= 1 for n in nodes for m in ("degree", "closeness"))
+        filtered = client.get(f"/games/{game['id']}/pass-network", params={"team": team}).json()
+        assert filtered["nodes"] == nodes
+    assert client.get("/games/999999/pass-network").status_code == 404
+
+
+def test_pass_network_averages_skip_unlocated_passes(game) -> None:
+    url = f"/games/{game['id']}/pass-network"
+    before = client.get(url).json()
+    nodes = {n["player_id"]: n for n in before["nodes"]}
+    edge = before["edges"][0]
+    pair = (edge["passer_id"], edge["receiver_id"])
+    names = tuple(nodes[i]["player"] for i in pair)
+    play = next(
+        e
+        for e in client.get(f"/games/{game['id']}/events").json()
+        if e["event"] == "Play" and (e["player"], e["player_2"]) == names
+    )
+    # The same pass again, without any recorded coordinates
+    unlocated = {k: v for k, v in play.items() if k not in ("id", "elapsed_seconds", "xg")}
+    for field in ("x_coordinate", "y_coordinate", "x_coordinate_2", "y_coordinate_2"):
+        unlocated[field] = None
+    created = client.post("/events", json=unlocated).json()
+    try:
+        after = client.get(url).json()
+        moved = next(e for e in after["edges"] if (e["passer_id"], e["receiver_id"]) == pair)
+        assert moved == edge | {"passes": edge["passes"] + 1}
+        passer = next(n for n in after["nodes"] if n["player_id"] == pair[0])
+        assert (passer["x"], passer["y"]) == (nodes[pair[0]]["x"], nodes[pair[0]]["y"])
+    finally:
+        client.delete(f"/events/{created['id']}")
+    assert client.get(url).json() == before
+
+
+def test_multi_game_pass_network_sums_games(seeded_db) -> None:
+    game_ids = [g["id"] for g in client.get("/games").json()]
+    combined = client.get("/games/pass-network", params={"game_id": game_ids}).json()
+    assert combined["game_ids"] == game_ids
+
+    passes: dict[tuple[int, int], int] = {}
+    for game_id in game_ids:
+        for e in client.get(f"/games/{game_id}/pass-network").json()["edges"]:
+            key = (e["passer_id"], e["receiver_id"])
+            passes[key] = passes.get(key, 0) + e["passes"]
+    assert {(e["passer_id"], e["receiver_id"]): e["passes"] for e in combined["edges"]} == passes
+
+    response = client.get("/games/pass-network", params={"game_id": [game_ids[0], 999999]})
+    assert response.status_code == 404
+
+
+def test_unknown_game_returns_404(seeded_db) -> None:
+    assert client.get("/games/999999/events").status_code == 404
+
+
+def test_shots_carry_the_persisted_models_xg(game) -> None:
+    events = client.get(f"/games/{game['id']}/events").json()
+    shots = pd.DataFrame([e for e in events if e["event"] in ("Shot", "Goal")])
+    assert all(e["xg"] is None for e in events if e["event"] not in ("Shot", "Goal"))
+    assert shots["xg"].between(0, 1, inclusive="neither").all()
+
+    is_home = shots["team"] == shots["home_team"]
+    shots["own_skaters"] = shots["home_team_skaters"].where(is_home, shots["away_team_skaters"])
+    shots["opp_skaters"] = shots["away_team_skaters"].where(is_home, shots["home_team_skaters"])
+    model = xg.load()
+    assert model is not None and model.goals >= xg.MIN_GOALS
+    assert xg.score(model, shots) == pytest.approx(shots["xg"].to_numpy())
+
+    points = client.get(f"/games/{game['id']}/shot-density").json()
+    stored = shots.loc[shots["event"] == "Shot", "xg"]
+    assert sorted(p["xg"] for p in points) == pytest.approx(sorted(stored))
+
+
+def test_game_shot_density_grid(dataset, game) -> None:
+    rows = _game_rows(dataset, game)
+    resp = client.get(
+        f"/games/{game['id']}/shot-density", params={"mode": "grid", "bins": 20}
+    )
+    assert resp.status_code == 200
+    grid = resp.json()
+    assert (grid["x_bins"], grid["y_bins"]) == (20, 8)
+    assert len(grid["values"]) == 8 and len(grid["values"][0]) == 20
+    shots = rows[(rows["Event"] == "Shot") & rows["X Coordinate"].notna()]
+    assert grid["total"] == len(shots)
+    assert sum(map(sum, grid["values"])) == len(shots)
+
+    smoothed = client.get(
+        f"/games/{game['id']}/shot-density",
+        params={"mode": "grid", "cell_size": 10, "sigma": 1.5},
+    ).json()
+    assert (smoothed["x_bins"], smoothed["y_bins"]) == (20, 9)
+    assert smoothed["max"] < grid["max"]
+
+
+def test_export_formats(dataset, game) -> None:
+    rows = _game_rows(dataset, game)
+
+    as_json = client.get(f"/games/{game['id']}/export")
+    assert as_json.status_code == 200
+    assert as_json.json()["game"] == game
+    assert len(as_json.json()["events"]) == len(rows)
+
+    ndjson = client.get(f"/games/{game['id']}/export", params={"format": "ndjson"})
+    lines = ndjson.text.splitlines()
+    assert [json.loads(line) for line in lines] == as_json.json()["events"]
+
+    csv_resp = client.get(f"/games/{game['id']}/export", params={"format": "csv"})
+    assert csv_resp.headers["content-type"].startswith("text/csv")
+    assert len(pd.read_csv(io.StringIO(csv_resp.text))) == len(rows)
+
+    parquet = client.get(f"/games/{game['id']}/export", params={"format": "parquet"})
+    frame = pd.read_parquet(io.BytesIO(parquet.content))
+    assert frame["id"].tolist() == [e["id"] for e in as_json.json()["events"]]
+
+
+def test_bulk_export_streams_a_zip(dataset) -> None:
+    games = client.get("/games").json()
+    resp = client.get(
+        "/games/export", params={"game_id": [g["id"] for g in games], "format": "csv"}
+    )
+    assert resp.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as archive:
+        names = archive.namelist()
+        total = sum(len(pd.read_csv(archive.open(name))) for name in names)
+    assert len(names) == len(games)
+    assert total == len(dataset)
+
+    assert client.get("/games/export", params={"game_id": 999999}).status_code == 404
+
+
+def test_game_events_fast_path_matches_schema(game) -> None:
+    events = client.get(f"/games/{game['id']}/events").json()
+    for event in events[:50]:
+        assert EventSchema.model_validate(event).model_dump() == event
+
+    # The documented response model is unchanged
+    spec = app.openapi()["paths"]["/games/{game_id}/events"]["get"]
+    schema = spec["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"]["$ref"].endswith("/EventSchema")
+
+
+def test_responses_are_compressed_per_accept_encoding(game) -> None:
+    url = f"/games/{game['id']}/events"
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    for encoding in ("zstd", "gzip"):
+        resp = client.get(url, headers={"Accept-Encoding": f"{encoding}, br;q=0.5"})
+        assert resp.headers["content-encoding"] == encoding
+        assert int(resp.headers["content-length"]) < len(plain.content) / 5
+        assert resp.content == plain.content
+        assert resp.headers["etag"] == plain.headers["etag"][:-1] + f'-{encoding}"'
+        revalidated = client.get(
+            url, headers={"Accept-Encoding": encoding, "If-None-Match": resp.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == resp.headers["etag"]
+
+    # Small bodies and streamed exports
+    small = client.get("/events/types", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    export = client.get(
+        f"/games/{game['id']}/export", params={"format": "ndjson"}, headers={"Accept-Encoding": "zstd"}
+    )
+    assert export.headers["content-encoding"] == "zstd"
+    assert len(export.text.splitlines()) == len(plain.json())
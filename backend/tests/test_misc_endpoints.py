@@ -54,3 +54,28 @@ def test_api_test_endpoint() -> None:
     resp = client.get("/api/test")
     assert resp.status_code == 200
     assert resp.json() == {"status": "ok"}
+
+
+def test_liveness_endpoint() -> None:
+    """GET /health/live should always answer while the process runs."""
+    resp = client.get("/health/live")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "alive"}
+
+
+def test_readiness_follows_seeding_state(monkeypatch) -> None:
+    """GET /health/ready should be 503 until seeding has finished."""
+    from src.core.seeding import SeedProgress
+
+    progress = SeedProgress()
+    monkeypatch.setattr("src.routes.misc.seed_progress", progress)
+
+    progress.start()
+    resp = client.get("/health/ready")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "running"
+
+    progress.finish()
+    resp = client.get("/health/ready")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ready"
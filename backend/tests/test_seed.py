@@ -0,0 +1,106 @@
+"""Tests for fingerprinted, incremental database seeding."""
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from src.db.database import SessionLocal
+from src.db.seed import reset_and_seed_db, seed_db
+from src.main import app
+from src.models import Event, Game, SeedMetadata
+from src.settings.config import settings
+
+from .conftest import DATASET_CSV
+
+client = TestClient(app)
+
+
+def _event_count() -> int:
+    with SessionLocal() as session:
+        return session.execute(select(func.count(Event.id))).scalar_one()
+
+
+def _seeded_at() -> dict[str, object]:
+    with SessionLocal() as session:
+        return {m.source: m.seeded_at for m in session.query(SeedMetadata).all()}
+
+
+def test_unchanged_dataset_is_skipped(seeded_db) -> None:
+    """A second start with the same CSV must not touch the events table."""
+    before_count, before_meta = _event_count(), _seeded_at()
+    seed_db("incremental")
+    assert _event_count() == before_count
+    assert _seeded_at() == before_meta
+
+
+def test_changed_dataset_applies_only_the_diff(seeded_db, tmp_path: Path, monkeypatch) -> None:
+    """Removed rows are deleted, new rows inserted, API events are preserved."""
+    csv_path = tmp_path / "dataset.csv"
+    shutil.copy(DATASET_CSV, csv_path)
+    monkeypatch.setattr(settings, "dataset_csv", csv_path)
+    seed_db("incremental")
+
+    manual = client.post(
+        "/events",
+        json={
+            "game_date": "2099-01-01", "home_team": "Home", "away_team": "Away",
+            "period": 1, "clock": "20:00", "home_team_skaters": 5,
+            "away_team_skaters": 5, "home_team_goals": 0, "away_team_goals": 0,
+            "team": "Home", "player": "Someone", "event": "Shot",
+        },
+    )
+    manual_id = manual.json()["id"]
+    # Last CSV row – survives because only the first rows are removed
+    kept_id = manual_id - 1
+
+    df = pd.read_csv(csv_path)
+    added = df.head(5).assign(game_date="2030-01-01")
+    changed = pd.concat([df.iloc[10:], added])
+    changed.to_csv(csv_path, index=False)
+    before = _event_count()
+
+    seed_db("incremental")
+
+    assert _event_count() == before - 10 + 5
+    with SessionLocal() as session:
+        assert session.get(Event, manual_id) is not None
+        assert session.get(Event, kept_id) is not None
+        assert session.execute(
+            select(func.count(Game.id)).where(Game.game_date == "2030-01-01")
+        ).scalar_one() == 1
+
+    # Leave the shared test database as the session fixture created it
+    monkeypatch.undo()
+    reset_and_seed_db()
+
+
+def test_chunked_load_inserts_every_row(seeded_db, monkeypatch) -> None:
+    """Streaming in small chunks loads exactly the rows of the CSV."""
+    monkeypatch.setattr(settings, "seed_chunk_size", 97)
+    reset_and_seed_db()
+    assert _event_count() == len(pd.read_csv(DATASET_CSV))
+
+
+def test_duplicate_rows_across_chunks_match_a_reset(seeded_db, tmp_path: Path, monkeypatch) -> None:
+    """A row repeated in a later chunk is a new event in both seeding modes."""
+    csv_path = tmp_path / "dataset.csv"
+    df = pd.read_csv(DATASET_CSV).head(20)
+    df.to_csv(csv_path, index=False)
+    monkeypatch.setattr(settings, "dataset_csv", csv_path)
+    monkeypatch.setattr(settings, "seed_chunk_size", 1)
+    reset_and_seed_db()
+
+    with_duplicate = pd.concat([df, df.iloc[[3]]])
+    with_duplicate.to_csv(csv_path, index=False)
+    seed_db("incremental")
+    assert _event_count() == len(with_duplicate)
+
+    reset_and_seed_db()
+    assert _event_count() == len(with_duplicate)
+
+    monkeypatch.undo()
+    reset_and_seed_db()